@@ -1,69 +1,64 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.express as px
-import geopandas as gpd
-from shapely.geometry import Polygon
-from shapely import wkt
-import nltk
-from nltk.corpus import stopwords as nltk_stopwords
-import matplotlib.pyplot as plt
-from wordcloud import WordCloud
 from pathlib import Path
+from utils.series_temporais import GRANULARIDADES, escolher_granularidade
+from utils.esquema import relatorio_memoria
+from utils.snapshots import EVENTOS
+from utils.agregados import arquivo_municipios, metricas_disponiveis, taxas_por_uf, taxas_por_municipio
+from utils.carregamento import (PATH_RECLAMACOES, PATH_ESTADOS, load_localidade_geodf, load_series_temporais,
+                                load_indice_categorias, load_serie_temporal, load_ids_canonicos, load_anomalias,
+                                load_tempos_evento, load_curvas_sobrevivencia, load_resultado_busca,
+                                load_denominadores_uf, load_denominadores_municipios, load_topicos,
+                                load_contagem_categorias, load_frequencias_wordcloud, load_agregados_empresa,
+                                load_frases, load_contraste, compactar_mascara, expandir_mascara)
+from utils.aquecimento import iniciar_aquecimento
+from utils.manifesto import manifesto
+from utils.empresas import listar_empresas, pasta_empresa
+from utils.topicos import topicos_desatualizados
+from utils.detalhe import linhas_detalhe, pagina_reclamacoes, texto_completo
+
+# Empresas disponíveis (cada uma tem a própria pasta, ver utils/empresas.py); a escolhida no seletor
+# da barra lateral já está no session_state quando o script roda, a tempo de entrar no título da página
+empresas = listar_empresas() or {"Carrefour": PATH_RECLAMACOES}
+empresa = st.session_state.get("empresa")
+if empresa not in empresas:
+    empresa = next(iter(empresas))
 
 # --- Configurações da página ---
 st.set_page_config(
-    page_title="Dash - Reclamações Carrefour",
+    page_title=f"Dash - Reclamações {empresa}",
     page_icon="🛍️",
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
-# --- Carregar o GeoDataFrame das localidades ---
-@st.cache_data(ttl=3600)
-def load_localidade_geodf(path):
-    df = pd.read_csv(path, sep=',')  # ajuste o separador se necessário
-
-    if 'POLYGON' not in df.columns:
-        st.error(f"Coluna 'POLYGON' não encontrada. Colunas disponíveis: {df.columns.tolist()}")
-        return gpd.GeoDataFrame()
-
-    # Converte string WKT -> objetos shapely (Polygon ou MultiPolygon)
-    def to_geom(s):
-        try:
-            return wkt.loads(s)
-        except Exception as e:
-            st.error(f"Erro convertendo '{s[:50]}...': {e}")
-            return None
-
-    df['geometry'] = df['POLYGON'].apply(to_geom)
-
-    gdf = gpd.GeoDataFrame(df, geometry='geometry', crs="EPSG:4326")
-    return gdf
-
-# --- Função para carregar séries temporais ---
-@st.cache_data(show_spinner=False, ttl=3600)
-def load_series_temporais(path):
-    try:
-        df = pd.read_csv(path, sep=',', index_col=0, parse_dates=['TEMPO'], dayfirst=True)
-        # Otimização: especifique o formato para pd.to_datetime
-        df["TEMPO"] = pd.to_datetime(df['TEMPO'], format='%d-%m-%Y', errors='coerce')
-        return df
-    except FileNotFoundError:
-        st.error(f"Erro: O arquivo de reclamações não foi encontrado em {path}.")
-        return pd.DataFrame() # Retorna um DataFrame vazio para evitar erros posteriores
-    except Exception as e:
-        st.error(f"Erro ao carregar ou processar o arquivo de reclamações: {e}")
-        return pd.DataFrame() # Retorna um DataFrame vazio
-
-
 # --- Carregamento dos dados ---
 # gdf_estados = load_localidade_geodf("..\datasets\gdf_estados.csv")
 # gdf_municipios = load_localidade_geodf("..\datasets\gdf_municipios.csv")
 # df_reclamacoes = load_series_temporais('..\datasets\RECLAMEAQUI_CARREFUOR_CLS.csv')
 
 # --- Carregamento dos dados ---
-df_reclamacoes = load_series_temporais('./datasets/RECLAMEAQUI_CARREFUOR_CLS.csv')
-gdf_estados = load_localidade_geodf("./datasets/gdf_estados.csv")
+# As funções de carga (e o cache delas) ficam em utils/carregamento.py, compartilhadas com pages/mapa.py;
+# o aquecimento pré-calcula as visões padrão em segundo plano, uma vez por processo do servidor
+iniciar_aquecimento()
+
+# Seletor de empresa: só a empresa escolhida é carregada
+if len(empresas) > 1:
+    st.sidebar.header("Selecione a empresa")
+    empresa = st.sidebar.selectbox("Empresa", options=list(empresas), key="empresa")
+path_reclamacoes = empresas[empresa]
+
+try:
+    df_reclamacoes = load_series_temporais(path_reclamacoes)
+    gdf_estados = load_localidade_geodf(PATH_ESTADOS)
+except FileNotFoundError as e:
+    st.error(f"Erro: o arquivo não foi encontrado em {e.filename or path_reclamacoes}.")
+    st.stop()
+except Exception as e:
+    st.error(f"Erro ao carregar ou processar os dados: {e}")
+    st.stop()
 
 # Adicionando botões de navegação
 col1, col2 = st.columns([1,6])
@@ -71,11 +66,12 @@ if col1.button("🏠 Home"):
     st.switch_page("app.py")
 if col2.button("🗺️ Mapa"):
     st.session_state['df_reclamacoes'] = df_reclamacoes
+    st.session_state['path_reclamacoes'] = path_reclamacoes
     st.switch_page("pages/mapa.py")
 
 # --- Título do Dashboard ----
 st.title("✅ Dashboard de Análise de Reclamações")
-st.markdown("Empresa: Carrefour")
+st.markdown(f"Empresa: {empresa}")
 st.markdown("---")
 
 # --- Sidebar com seletores ---
@@ -119,64 +115,161 @@ if estado != "Todos":
 if situacao_selecionada:
     mask &= df_reclamacoes["STATUS"].isin(situacao_selecionada)
 
+# Seletor de categoria (interseção de bitmaps do índice de categorias com a máscara acima)
+st.sidebar.header("Selecione a categoria")
+indice_categorias = load_indice_categorias(path_reclamacoes)
+categorias_selecionadas = st.sidebar.multiselect("Categoria", options=indice_categorias.opcoes())
+
+if categorias_selecionadas:
+    mask = pd.Series(indice_categorias.mascara(categorias_selecionadas, mask), index=df_reclamacoes.index)
+
+# Busca textual nas descrições (use aspas para frases, ex.: "não recebi")
+st.sidebar.header("Buscar nas descrições")
+consulta = st.sidebar.text_input("Termos", placeholder='estorno, entrega, "nota fiscal"...')
+
+if consulta.strip():
+    linhas_busca = load_resultado_busca(path_reclamacoes, consulta.strip())
+    mask_busca = np.zeros(len(df_reclamacoes), dtype=bool)
+    mask_busca[linhas_busca] = True
+    mask &= mask_busca
+    st.sidebar.caption(f"{len(linhas_busca)} reclamações contêm os termos buscados.")
+
 df_filtrado = df_reclamacoes.loc[mask]
 
+# Máscara dos filtros compactada em bytes: chave de cache (renovável) das contagens por categoria e da WordCloud
+mask_bits = compactar_mascara(mask)
+
+# Relatório de memória da tabela carregada
+with st.sidebar.expander("Memória dos dados"):
+    df_memoria = relatorio_memoria(df_reclamacoes)
+    st.caption(f"Total: {df_memoria['MB'].sum():.2f} MB")
+    st.dataframe(df_memoria[['tipo', 'MB', '%']], use_container_width=True)
+
+# Manifesto das fontes: trocar um arquivo invalida apenas os resultados em cache que dependem dele
+with st.sidebar.expander("Fontes de dados"):
+    df_fontes = pd.DataFrame.from_dict(manifesto(), orient='index')
+    if not df_fontes.empty:
+        df_fontes = pd.DataFrame({
+            'arquivo': [Path(p).name for p in df_fontes.index],
+            'linhas': df_fontes['linhas'].astype('Int64'),
+            'MB': (df_fontes['tamanho'] / 1024 ** 2).round(2),
+            'modificado': pd.to_datetime(df_fontes['mtime_ns'], unit='ns').dt.strftime('%d-%m-%Y %H:%M'),
+            'sha256': df_fontes['sha256'].str[:12],
+        })
+        st.dataframe(df_fontes, hide_index=True, use_container_width=True)
+
 # -- Tornando os dados disponíveis para outras páginas --
 st.session_state['gdf_estados'] = gdf_estados
 st.session_state['df_filtrado'] = df_filtrado
 
 # --- Métricas gerais ---
 st.subheader(f"🔢 Reclamações por situação")
+
+# Opcionalmente conta cada grupo de reclamações quase duplicadas (repostadas/editadas) uma única vez
+somente_unicas = st.checkbox("Contar apenas reclamações únicas (desconsiderar quase duplicatas)")
+if somente_unicas:
+    ids_canonicos_filtrados = load_ids_canonicos(path_reclamacoes).loc[df_filtrado.index]
+    df_metricas = df_filtrado.loc[~ids_canonicos_filtrados.duplicated()]
+else:
+    df_metricas = df_filtrado
+
 col1, col2, col3, col4, col5, col6 = st.columns(6)
 
 with col1:
     container = st.container(border=True)
     container.badge("Resolvido", icon="✅", color="green")
-    resolvido = df_filtrado['STATUS'].value_counts().get('Resolvido', 0)
+    resolvido = df_metricas['STATUS'].value_counts().get('Resolvido', 0)
     container.metric("Resolvido", int(resolvido))
 
 with col2:
     container = st.container(border=True)
     container.badge("Respondida", icon="📑", color="blue")
-    respondida = df_filtrado['STATUS'].value_counts().get('Respondida', 0)
+    respondida = df_metricas['STATUS'].value_counts().get('Respondida', 0)
     container.metric("Respondida", int(respondida))
 
 with col3:
     container = st.container(border=True)
     container.badge("Em réplica", icon="🗯️", color="violet")
-    em_replica = df_filtrado['STATUS'].value_counts().get('Em réplica', 0)
+    em_replica = df_metricas['STATUS'].value_counts().get('Em réplica', 0)
     container.metric("Em réplica", int(em_replica))
 
 with col4:
     container = st.container(border=True)
     container.badge("Não Respondida", icon="‼️", color="orange")
-    nao_respondida = df_filtrado['STATUS'].value_counts().get('Não respondida', 0)
+    nao_respondida = df_metricas['STATUS'].value_counts().get('Não respondida', 0)
     container.metric("Não Respondida", int(nao_respondida))
 
 with col5:
     container = st.container(border=True)
     container.badge("Não Resolvido", icon="❌", color="red")
-    nao_resolvido = df_filtrado['STATUS'].value_counts().get('Não resolvido', 0)
+    nao_resolvido = df_metricas['STATUS'].value_counts().get('Não resolvido', 0)
     container.metric("Não Resolvido", int(nao_resolvido))
 
 with col6:
     container = st.container(border=True)
-    total_reclamacoes = df_filtrado['STATUS'].count()
+    total_reclamacoes = df_metricas['STATUS'].count()
     container.badge("Total", icon="📊", color="gray")
     if pd.isna(total_reclamacoes) or total_reclamacoes is None:
         total_reclamacoes = 0 # Define como 0 se for NaN ou None
     container.metric("Total", int(total_reclamacoes)) # Linha 153
 
-# --- Gráficos temporais por reclamações ---
-# Agrupar por DATA e STATUS, contando quantas reclamações existem
-df_grouped = df_filtrado.groupby([df_filtrado['TEMPO'].dt.date, 'STATUS']).size().reset_index(name='quantidade')
+# --- Velocidade do atendimento (histórico de coletas) ---
+st.subheader("⏱️ Tempo até resposta / resolução")
+
+if load_tempos_evento(path_reclamacoes, "Resolução") is None:
+    st.info("Nenhuma coleta registrada. Para acompanhar a evolução dos status, registre cada coleta com: "
+            f"python -m utils.snapshots {path_reclamacoes} --data AAAA-MM-DD")
+else:
+    col1, col2 = st.columns(2)
+    evento = col1.radio("Evento", options=list(EVENTOS), horizontal=True)
+    agrupamento = col2.radio("Curvas por", options=["Trimestre de abertura", "Estado"], horizontal=True)
+    coluna_grupo = 'PERIODO' if agrupamento == "Trimestre de abertura" else 'NOME_UF'
+
+    geral, curvas, resumo = load_curvas_sobrevivencia(
+        path_reclamacoes, evento, coluna_grupo, estado
+    )
+
+    col1, col2, col3 = st.columns(3)
+    for coluna, (rotulo, chave) in zip((col1, col2, col3), (("Mediana", "P50"), ("Percentil 75", "P75"), ("Percentil 90", "P90"))):
+        valor = geral[chave]
+        coluna.metric(f"{rotulo} até {evento.lower()}", "—" if pd.isna(valor) else f"{valor:.1f} dias")
+
+    if not curvas.empty:
+        fig = px.line(
+            curvas,
+            x='DIAS',
+            y='SOBREVIVENCIA',
+            color=coluna_grupo,
+            line_shape='hv',
+            title=f'Proporção de reclamações ainda sem {evento.lower()} (Kaplan-Meier)',
+            labels={'DIAS': 'Dias desde a abertura', 'SOBREVIVENCIA': 'Proporção', 'PERIODO': 'Trimestre', 'NOME_UF': 'Estado'}
+        )
+        st.plotly_chart(fig, use_container_width=True)
+        with st.expander("Percentis por grupo"):
+            st.dataframe(resumo, hide_index=True, use_container_width=True)
 
-df_grouped.columns = ['DATA', 'STATUS', 'quantidade']
-# Converter a coluna DATA para datetime
-df_grouped['DATA'] = pd.to_datetime(df_grouped['DATA'])
+# --- Gráficos temporais por reclamações ---
+# As contagens vêm do motor de séries temporais (somas de prefixo), sem agrupar o DataFrame filtrado
+serie_temporal = load_serie_temporal(
+    path_reclamacoes,
+    tuple(sorted(categorias_selecionadas)),
+    consulta.strip()
+)
 
-# Pivotar o DataFrame: linhas = datas, colunas = status, valores = quantidade
-df_pivot = df_grouped.pivot(index='DATA', columns='STATUS', values='quantidade').fillna(0)
+granularidade_auto = escolher_granularidade(data_inicio, data_fim)
+opcoes_granularidade = [f"Automática ({granularidade_auto})"] + list(GRANULARIDADES)
+granularidade = st.selectbox("Granularidade", options=opcoes_granularidade)
+if granularidade not in GRANULARIDADES:
+    granularidade = granularidade_auto
+
+# Pivot já pronto: linhas = início de cada período, colunas = status, valores = quantidade
+df_pivot = serie_temporal.serie(
+    data_inicio,
+    data_fim,
+    uf=estado,
+    status=situacao_selecionada,
+    granularidade=granularidade
+)
 
 # Configurando o gráfico de linha
 fig = px.line(
@@ -201,43 +294,147 @@ fig.update_layout(
     )
 )
 
+# Marcando as anomalias detectadas (z-score robusto) do estado e situações selecionados. O detector roda
+# sobre as séries completas por UF/situação, então as marcas só valem para a linha sem filtro de
+# categoria ou de busca (com eles, o valor e o z de cada marca não descreveriam a linha exibida)
+anomalias_validas = not categorias_selecionadas and not consulta.strip()
+if anomalias_validas:
+    df_anomalias = load_anomalias(path_reclamacoes)
+    df_anomalias = df_anomalias[
+        (df_anomalias['UF'] == estado) &
+        (df_anomalias['DATA'] >= data_inicio) &
+        (df_anomalias['DATA'] <= data_fim) &
+        (df_anomalias['STATUS'].isin(df_pivot.columns))
+    ]
+
+if anomalias_validas and not df_anomalias.empty and not df_pivot.empty:
+    # Posiciona cada anomalia no período (dia/semana/mês/trimestre) exibido que a contém
+    periodo = df_pivot.index[(df_pivot.index.searchsorted(df_anomalias['DATA'], side='right') - 1).clip(0)]
+    valores = df_pivot.stack().reindex(list(zip(periodo, df_anomalias['STATUS']))).to_numpy()
+    fig.add_scatter(
+        x=periodo,
+        y=valores,
+        mode='markers',
+        name='Anomalia',
+        marker=dict(symbol='x', size=10, color='black'),
+        customdata=df_anomalias[['STATUS', 'DATA', 'VALOR', 'Z']].astype(str).to_numpy(),
+        hovertemplate="Anomalia em %{customdata[0]}<br>Dia: %{customdata[1]}<br>"
+                      "Reclamações no dia: %{customdata[2]}<br>z robusto: %{customdata[3]}<extra></extra>"
+    )
+
 # Configurando o eixo X para exibir datas
 fig.update_xaxes(
-    tickformat='%d/%m',  
+    tickformat=GRANULARIDADES[granularidade][1],
     tickangle=-45
 )
 
 # Exibir o gráfico de linha interativo
 st.plotly_chart(fig, use_container_width=True)
+if not anomalias_validas:
+    st.caption("Anomalias ocultas: elas são detectadas sobre as séries sem filtro de categoria ou de busca.")
 
 
 # **Frequência de reclamações por estado / município.**
 st.subheader("📊 Frequência de reclamações por estado / município")
 
+# Denominadores do nível exibido; taxas sem denominador (ex.: população municipal) saem das opções
+if estado != 'Todos':
+    denominadores = load_denominadores_municipios(str(arquivo_municipios(estado)))
+else:
+    denominadores = load_denominadores_uf(PATH_ESTADOS)
+metricas = metricas_disponiveis(denominadores)
+metrica = st.selectbox("Métrica", options=list(metricas))
+coluna_metrica = metricas[metrica]
+
 if estado != 'Todos':
-    # Filtrar o DataFrame com base no estado selecionado
-    df_estado = df_filtrado[df_filtrado['NOME_UF'] == estado]
-    df_agrupado = df_estado.groupby(['MUNICIPIO']).size().reset_index(name='Qtd_Reclamacoes')
-    df_ordenado = df_agrupado.sort_values(by='Qtd_Reclamacoes', ascending=True)
+    # Contagem e taxas por município do estado selecionado
+    df_agrupado = taxas_por_municipio(df_filtrado, estado, denominadores)
+    df_agrupado = df_agrupado[df_agrupado['Qtd_Reclamacoes'] > 0]
+    df_ordenado = df_agrupado.sort_values(by=coluna_metrica, ascending=True)
     st.write(f"Total de reclamações em {estado}: {df_ordenado['Qtd_Reclamacoes'].sum()}")
-    st.bar_chart(df_ordenado, 
-                 horizontal=True,
-                 x_label='Qtd de Reclamações', 
-                 x='MUNICIPIO', 
-                 y_label='Município', 
-                 y='Qtd_Reclamacoes', 
-                 use_container_width=True)
+    coluna_localidade = 'MUNICIPIO'
+    fig = px.bar(df_ordenado,
+                 x=coluna_metrica,
+                 y='MUNICIPIO',
+                 orientation='h',
+                 custom_data=['MUNICIPIO'],
+                 labels={coluna_metrica: metrica, 'MUNICIPIO': 'Município'})
 
 else:  
-    # Agrupar por NOME_UF e contar as reclamações
-    df_estado = df_filtrado.groupby(['NOME_UF']).size().reset_index(name='Qtd_Reclamacoes')
-    df_ordenado = df_estado.sort_values(by='Qtd_Reclamacoes', ascending=True)
-    st.bar_chart(df_ordenado, 
-                 x_label='Estado', 
-                 x='NOME_UF', 
-                 y_label='Quantidade de Reclamações', 
-                 y='Qtd_Reclamacoes', 
+    # Contagem e taxas por estado
+    df_estado = taxas_por_uf(df_filtrado, denominadores)
+    df_estado = df_estado[df_estado['Qtd_Reclamacoes'] > 0]
+    df_ordenado = df_estado.sort_values(by=coluna_metrica, ascending=True)
+    coluna_localidade = 'NOME_UF'
+    fig = px.bar(df_ordenado,
+                 x='NOME_UF',
+                 y=coluna_metrica,
+                 custom_data=['NOME_UF'],
+                 labels={coluna_metrica: metrica, 'NOME_UF': 'Estado'})
+
+# Clicar numa barra leva as reclamações da localidade para o detalhamento (mais abaixo)
+evento_localidade = st.plotly_chart(fig, use_container_width=True, on_select="rerun",
+                                    selection_mode="points", key="barras_localidade")
+
+
+# **Frequência de reclamações por categoria** (a partir do índice de categorias)
+st.subheader("🏷️ Reclamações por categoria")
+
+nivel_max = int(indice_categorias.nivel.max()) if len(indice_categorias.nomes) else 0
+opcoes_nivel = ['Todos'] + list(range(1, nivel_max + 2))
+nivel = st.selectbox("Nível da hierarquia", options=opcoes_nivel)
+
+df_categorias = load_contagem_categorias(
+    path_reclamacoes,
+    mask_bits,
+    None if nivel == 'Todos' else nivel - 1
+)
+
+if not df_categorias.empty:
+    st.bar_chart(df_categorias.head(20).sort_values(by='Qtd_Reclamacoes', ascending=True),
+                 horizontal=True,
+                 x_label='Qtd de Reclamações',
+                 x='CATEGORIA',
+                 y_label='Categoria',
+                 y='Qtd_Reclamacoes',
                  use_container_width=True)
+else:
+    st.info("Nenhuma categoria encontrada com os filtros selecionados.")
+
+
+# **Tópicos das reclamações** (coluna pequena gerada pelo pipeline offline de tópicos)
+st.subheader("🧩 Tópicos das Reclamações")
+
+df_topicos, df_termos_topicos = load_topicos(path_reclamacoes)
+if df_topicos is None:
+    st.info(f"Os tópicos ainda não foram gerados. Execute: python -m utils.topicos ajustar {path_reclamacoes}")
+else:
+    if topicos_desatualizados(pasta_empresa(path_reclamacoes) / "topicos"):
+        st.caption(f"⚠️ As stopwords mudaram desde o ajuste dos tópicos; reajuste com python -m utils.topicos ajustar {path_reclamacoes}.")
+    df_contagem_topicos = (
+        df_filtrado[['ID']]
+        .merge(df_topicos, on='ID', how='inner')
+        .query('TOPICO >= 0')
+        .groupby('TOPICO').size().reset_index(name='Qtd_Reclamacoes')
+        .merge(df_termos_topicos, on='TOPICO')
+    )
+    if not df_contagem_topicos.empty:
+        # Rótulo montado só com linhas: em frame vazio a soma de colunas str e object falha no pandas 3
+        df_contagem_topicos['Tópico'] = (
+            df_contagem_topicos['TOPICO'].astype(str) + ": "
+            + df_contagem_topicos['TERMOS'].str.split(', ').str[:4].str.join(', ')
+        )
+        st.bar_chart(df_contagem_topicos.sort_values(by='Qtd_Reclamacoes', ascending=True),
+                     horizontal=True,
+                     x_label='Qtd de Reclamações',
+                     x='Tópico',
+                     y_label='Tópico',
+                     y='Qtd_Reclamacoes',
+                     use_container_width=True)
+        with st.expander("Termos de cada tópico"):
+            st.dataframe(df_termos_topicos, hide_index=True, use_container_width=True)
+    else:
+        st.info("Nenhuma reclamação com tópico atribuído para os filtros selecionados.")
 
 
 # **Distribuição do tamanho dos textos** das reclamações (coluna `DESCRIÇÃO`).
@@ -273,11 +470,15 @@ col1.metric("Tamanho Mínimo", f"{tamanho_min} caracteres")
 col2.metric("Tamanho Médio", f"{tamanho_medio} caracteres")
 col3.metric("Tamanho Máximo", f"{tamanho_max} caracteres")
 
-tamanho = st.select_slider(
-    "Filtre pelo intervalo de tamanho do texto:",
-    options=sorted(df_fil['Tamanho_Texto'].unique()),
-    value=(tamanho_min, tamanho_max) # Valor inicial pega o mínimo e máximo
-)
+# Sem reclamações nos filtros não há opções para o slider (ele exige ao menos uma)
+if df_fil.empty:
+    tamanho = (tamanho_min, tamanho_max)
+else:
+    tamanho = st.select_slider(
+        "Filtre pelo intervalo de tamanho do texto:",
+        options=sorted(df_fil['Tamanho_Texto'].unique()),
+        value=(tamanho_min, tamanho_max) # Valor inicial pega o mínimo e máximo
+    )
 
 # Filtrar o DataFrame principal com base na seleção do slider
 mask = (
@@ -314,6 +515,7 @@ if not df_fil.empty:
         x='TEMPO',
         y='Tamanho_Texto',
         color='STATUS', 
+        custom_data=['ID'], # Só o ID vai ao navegador; a descrição fica no detalhamento abaixo
         title='Cada ponto representa uma reclamação individual. Use o filtro para analisar por status',
         labels={'Tamanho_Texto': 'Tamanho do Texto (caracteres)', 'TEMPO': 'Data da Reclamação'},
     )
@@ -330,62 +532,93 @@ if not df_fil.empty:
         tickangle=-45
     )
     
-    st.plotly_chart(fig, use_container_width=True)
+    # Pontos selecionados (clique, caixa ou laço) vão para o detalhamento
+    evento_dispersao = st.plotly_chart(fig, use_container_width=True, on_select="rerun",
+                                       selection_mode=("points", "box", "lasso"), key="dispersao_tamanho")
 else:
+    evento_dispersao = None
     st.warning("Nenhum dado para exibir com os filtros selecionados.")
 
+
+# **Detalhamento**: as reclamações por trás do filtro atual e da barra / pontos selecionados,
+# uma página por vez; o texto completo só é carregado para a reclamação aberta
+st.subheader("🔎 Reclamações em Detalhe")
+
+ids_selecionados = [p['customdata'][0] for p in evento_dispersao.selection.points] if evento_dispersao else []
+localidades_clicadas = [p['customdata'][0] for p in evento_localidade.selection.points]
+filtros_detalhe, ids_detalhe = {}, None
+if ids_selecionados:
+    ids_detalhe = ids_selecionados
+    st.caption(f"{len(ids_selecionados)} reclamações selecionadas na dispersão.")
+elif localidades_clicadas:
+    filtros_detalhe = {coluna_localidade: localidades_clicadas[0]}
+    st.caption(f"Reclamações de {localidades_clicadas[0]} (barra clicada no gráfico de frequência).")
+else:
+    st.caption("Todas as reclamações dos filtros atuais. Clique numa barra do gráfico de frequência "
+               "ou selecione pontos na dispersão para restringir.")
+
+linhas = linhas_detalhe(df_reclamacoes, expandir_mascara(mask_bits, len(df_reclamacoes)),
+                        filtros_detalhe, ids_detalhe)
+
+if len(linhas) == 0:
+    st.info("Nenhuma reclamação para detalhar com os filtros selecionados.")
+else:
+    col1, col2, col3 = st.columns([1, 1, 4])
+    tamanho_pagina = col1.selectbox("Por página", options=[20, 50, 100])
+    n_paginas = -(-len(linhas) // tamanho_pagina)
+    # A chave muda com o recorte: trocar filtros ou seleção volta para a primeira página
+    pagina = col2.number_input("Página", min_value=1, max_value=n_paginas, value=1, step=1,
+                               key=f"pagina_detalhe_{len(linhas)}_{tamanho_pagina}")
+    col3.caption(f"{len(linhas)} reclamações · página {pagina} de {n_paginas}")
+
+    df_pagina = pagina_reclamacoes(df_reclamacoes, linhas, pagina, tamanho_pagina)
+    evento_tabela = st.dataframe(df_pagina.drop(columns='LINHA'), hide_index=True, use_container_width=True,
+                                 on_select="rerun", selection_mode="single-row",
+                                 column_config={'RESUMO': st.column_config.TextColumn('Descrição', width='large')},
+                                 key=f"tabela_detalhe_{len(linhas)}_{pagina}_{tamanho_pagina}")
+
+    if evento_tabela.selection.rows:
+        escolhida = df_pagina.iloc[evento_tabela.selection.rows[0]]
+        with st.container(border=True):
+            st.markdown(f"**Reclamação {escolhida['ID']}** · {escolhida['DATA']} · {escolhida['STATUS']}")
+            st.write(texto_completo(df_reclamacoes, escolhida['LINHA']))
+    else:
+        st.caption("Selecione uma linha da tabela para ler a descrição completa.")
+
 # **WordCloud** com as palavras mais frequentes nos textos das descrições.
 st.subheader("📝 WordCloud - Palavras mais Frequentes nas Descrições")
 
-# -- Utilizando o NLTK para stopwords em português --
-# Aponta para o diretório dentro do repositório
-nltk.data.path.append(str(Path(__file__).parent / "nltk_data"))
-
-novas_stopwords = ["empresa", "comprei", "loja", "não", "pra", "tive", "minha", "nao", "apenas"
-                   , "ter", "bem", "bom", "muito", "pouco", "mais", "menos", "ainda", "já", "agora", "hoje"
-                   , "ontem", "amanhã", "sempre", "nunca", "todo", "toda", "todos", "todas", "algum", "alguma"
-                   , "alguns", "algumas", "cada", "qualquer", "quaisquer", "quem", "onde", "quando", "como", "porque"
-                   , "dia", "dias", "reclame", "aqui", "problema", "já", "pois", "outro", "outra", "Carrefour"
-                   , "lá", "dentro", "toda", "fiz", "R", "vez", "vou", "tudo", "porém", "então", "assim", "havia", "disse"
-                   , "compra", "produto", "produtos", "serviço", "serviços", "cliente", "clientes", "deu", "falou", "sobre"
-                   , "aí", "q", "após", "aí", "ir", "mesma", "passar", "forma", "levar", "comprar", "pedi", "nenhum", "volta"
-                   , "voltar", "fazer", "Além", "fazendo", "favor", "deram", "chegou", "chegar", "ir", "vir", "iria", "quero"
-                   , "queria", "querer", "ser", "caso", "casa", "informar", "informou", "informe", "ano", "reais", "pagar"
-                   , "sendo", "nota", "falta", "faltar", "data", "novamente", "poder", "poderia", "pessoa", "absurdo"
-                   , "momento", "Editado", "Editar", "hora", "falar", "pq", "mal", "colocar", "coloquei", "mal", "mau", "bem"
-                   , "bom", "ficou", "fiquei", "total", "recebi", "recebeu", "nada", "nenhuma", "nenhum", "nada", "tudo"
-                   , "falei", "falaram", "dizer", "dizendo", "dizem", "disseram", "tempo", "coisa", "coisas", "ocorrido"
-                   , "ocorreram", "simples", "simplesmente", "problemas", "problema", "reclamação", "reclamações", "ver"
-                   , "mim", ".", ","]
-
-# Carregar as stopwords do NLTK e adicionar as novas stopwords
-stop_pt = set(nltk_stopwords.words("portuguese")) | set(novas_stopwords)
-
-# Concatenar todas as descrições em uma única string
-textos = ' '.join(df_filtrado['DESCRICAO'].dropna().astype(str).tolist())
-
-texto = " ".join(df_filtrado['DESCRICAO'].astype(str).tolist())
-print(len(texto)) 
-print(texto[:100])
-
-if texto and not texto.isspace():
-    
+# Palavras isoladas ou frases (bigramas/trigramas com NPMI positivo, ver utils/ngramas.py)
+modo_nuvem = st.radio("Nuvem de", options=["Palavras", "Frases"], horizontal=True)
+
+# -- Frequências com as stopwords do léxico compilado (utils/lexico_pt.py: NLTK + novas stopwords) --
+# Calculadas em cache (memória e disco) pela máscara de filtros; a nuvem só desenha o resultado
+if modo_nuvem == "Frases":
+    df_frases = load_frases(path_reclamacoes, mask_bits)
+    frequencias = dict(zip(df_frases['FRASE'], df_frases['FREQUENCIA']))
+else:
+    frequencias = load_frequencias_wordcloud(path_reclamacoes, mask_bits)
+
+if frequencias:
+    # Importado só aqui: o wordcloud (e o matplotlib que ele carrega) pesa na partida de cada processo
+    from wordcloud import WordCloud
+
     try:
        # Gerar a nuvem de palavras
         wordcloud = WordCloud(
             width=800,
             height=400,
             background_color='white',
-            stopwords=stop_pt,
             colormap='viridis', 
             max_words=50
-        ).generate(texto)
+        ).generate_from_frequencies(frequencias)
+
+        # Exibir a WordCloud como imagem (dispensa o matplotlib.pyplot)
+        st.image(wordcloud.to_image())
 
-        # Plotar a WordCloud
-        fig, ax = plt.subplots(figsize=(10, 5))
-        ax.imshow(wordcloud, interpolation='bilinear')
-        ax.axis('off') 
-        st.pyplot(fig)
+        if modo_nuvem == "Frases":
+            with st.expander("Frases principais"):
+                st.dataframe(df_frases, hide_index=True, use_container_width=True)
         
     except Exception as e:
         st.error(f"Ocorreu um erro ao gerar a nuvem de palavras: {e}")
@@ -394,4 +627,82 @@ else:
     st.info("Não há dados de texto suficientes para gerar a nuvem de palavras com os filtros selecionados.")
 
 
+# **Comparação de termos** entre dois grupos dentro dos filtros atuais (log-odds com prior de Dirichlet)
+st.subheader("⚖️ Termos que Distinguem Dois Grupos")
+st.markdown("Palavras (por radical) mais características de cada grupo, entre as reclamações dos filtros atuais. "
+            "O z-score do log-odds ponderado já desconta os termos raros.")
+
+DIMENSOES_CONTRASTE = {"Status": "STATUS", "Estado": "NOME_UF"}
+col1, col2, col3 = st.columns(3)
+dimensao = col1.selectbox("Comparar por", options=list(DIMENSOES_CONTRASTE))
+coluna_contraste = DIMENSOES_CONTRASTE[dimensao]
+valores_contraste = df_filtrado[coluna_contraste].value_counts().index.tolist()
+
+if len(valores_contraste) < 2:
+    st.info("São necessários ao menos dois grupos com reclamações nos filtros selecionados.")
+else:
+    grupo_a = col2.selectbox("Grupo A", options=valores_contraste, index=0)
+    grupo_b = col3.selectbox("Grupo B", options=[v for v in valores_contraste if v != grupo_a], index=0)
+
+    # Máscaras dos grupos (dentro dos filtros) compactadas em bits: chave do cache da comparação
+    mask_filtros = expandir_mascara(mask_bits, len(df_reclamacoes))
+    bits_a = compactar_mascara(mask_filtros & (df_reclamacoes[coluna_contraste] == grupo_a).to_numpy())
+    bits_b = compactar_mascara(mask_filtros & (df_reclamacoes[coluna_contraste] == grupo_b).to_numpy())
+    df_contraste = load_contraste(path_reclamacoes, bits_a, bits_b)
+
+    if df_contraste.empty:
+        st.info("Não há termos suficientes para comparar os grupos selecionados.")
+    else:
+        df_contraste['Grupo'] = df_contraste['GRUPO'].map({'A': grupo_a, 'B': grupo_b})
+        fig = px.bar(
+            df_contraste, x='Z', y='TERMO', color='Grupo', orientation='h',
+            hover_data={'QTD_A': True, 'QTD_B': True, 'DELTA': True, 'GRUPO': False},
+            labels={'Z': 'z-score do log-odds', 'TERMO': '', 'QTD_A': f'Qtd. em {grupo_a}',
+                    'QTD_B': f'Qtd. em {grupo_b}', 'DELTA': 'log-odds'},
+            title=f"{grupo_a} (direita) vs. {grupo_b} (esquerda)",
+        )
+        fig.update_layout(height=150 + 22 * len(df_contraste),
+                          yaxis={'categoryorder': 'array', 'categoryarray': df_contraste['TERMO']})
+        st.plotly_chart(fig, use_container_width=True)
+
+
+# --- Comparação entre empresas ---
+# Lida apenas dos agregados pré-calculados de cada empresa (python -m utils.empresas preparar),
+# sem carregar as tabelas de reclamações das demais empresas
+if len(empresas) > 1:
+    st.subheader("🏢 Comparação entre empresas")
+    empresas_comparadas = st.multiselect("Empresas", options=list(empresas), default=list(empresas)[:4])
+
+    if empresas_comparadas:
+        agregados = {nome: load_agregados_empresa(empresas[nome]) for nome in empresas_comparadas}
+
+        # Distribuição percentual das situações
+        df_status = pd.concat([
+            a['status'][a['status']['STATUS'] != 'Total'].assign(Empresa=nome) for nome, a in agregados.items()
+        ], ignore_index=True)
+        df_status['%'] = 100 * df_status['Qtd_Reclamacoes'] / df_status.groupby('Empresa')['Qtd_Reclamacoes'].transform('sum')
+        fig = px.bar(df_status, x='Empresa', y='%', color='STATUS', text_auto='.1f',
+                     title='Distribuição das situações (%)')
+        st.plotly_chart(fig, use_container_width=True)
+
+        # Volume mensal no período selecionado
+        df_mensal = pd.concat([
+            a['serie_diaria'].assign(Empresa=nome) for nome, a in agregados.items()
+        ], ignore_index=True)
+        df_mensal = df_mensal[(df_mensal['DATA'] >= data_inicio) & (df_mensal['DATA'] <= data_fim)]
+        df_mensal = (df_mensal.groupby(['Empresa', df_mensal['DATA'].dt.to_period('M').dt.to_timestamp()])
+                     ['Qtd_Reclamacoes'].sum().reset_index())
+        fig = px.line(df_mensal, x='DATA', y='Qtd_Reclamacoes', color='Empresa', markers=True,
+                      title='Reclamações por mês')
+        st.plotly_chart(fig, use_container_width=True)
+
+        # Estados com mais reclamações (métrica do seletor acima, quando disponível nos agregados)
+        df_uf = pd.concat([a['por_uf'].assign(Empresa=nome) for nome, a in agregados.items()], ignore_index=True)
+        coluna_uf = coluna_metrica if coluna_metrica in df_uf.columns else 'Qtd_Reclamacoes'
+        estados_top = df_uf.groupby('NOME_UF')[coluna_uf].sum().nlargest(10).index
+        fig = px.bar(df_uf[df_uf['NOME_UF'].isin(estados_top)], x='NOME_UF', y=coluna_uf, color='Empresa',
+                     barmode='group', title=f'Top 10 estados ({coluna_uf})')
+        st.plotly_chart(fig, use_container_width=True)
+
+
 ### Fim do código
\ No newline at end of file
@@ -0,0 +1,50 @@
+# Benchmark de latência de consulta: índice invertido (utils/busca.py) vs. varredura com str.contains.
+# Uso: python -m benchmarks.bench_busca [--repeticoes N] [--multiplicar K]
+import argparse
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from utils.busca import IndiceBusca
+from utils.esquema import ler_reclamacoes
+
+CONSULTAS = ["estorno", "entrega", "cartão", "estorno cartão", '"nota fiscal"', '"não recebi"']
+
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return np.median(tempos) * 1000, np.percentile(tempos, 95) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Latência de consulta: índice invertido vs. str.contains")
+    parser.add_argument("--csv", default="./datasets/RECLAMEAQUI_CARREFUOR_CLS.csv")
+    parser.add_argument("--repeticoes", type=int, default=20)
+    parser.add_argument("--multiplicar", type=int, default=1, help="Replica a tabela K vezes para simular volume")
+    args = parser.parse_args()
+
+    textos = pd.concat([ler_reclamacoes(args.csv)["DESCRICAO"]] * args.multiplicar, ignore_index=True)
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        inicio = time.perf_counter()
+        indice = IndiceBusca.construir(textos.tolist(), diretorio)
+        print(f"{len(textos)} descrições | construção do índice: {time.perf_counter() - inicio:.2f} s\n")
+
+        print(f"{'consulta':<20}{'linhas':>8}{'índice p50':>14}{'índice p95':>14}{'contains p50':>16}")
+        for consulta in CONSULTAS:
+            linhas = len(indice.buscar(consulta))
+            p50, p95 = medir(lambda: indice.buscar(consulta), args.repeticoes)
+            termos = [t.strip('"') for t in consulta.split(" ")] if '"' not in consulta else [consulta.strip('"')]
+            varredura = lambda: np.logical_and.reduce([textos.str.contains(t, case=False, regex=False) for t in termos])
+            c50, _ = medir(varredura, max(1, args.repeticoes // 4))
+            print(f"{consulta:<20}{linhas:>8}{p50:>11.3f} ms{p95:>11.3f} ms{c50:>13.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
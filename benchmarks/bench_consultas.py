@@ -0,0 +1,105 @@
+# Benchmark das agregações do dashboard: pandas em memória vs. DuckDB sobre Parquet particionado.
+# Uso: python -m benchmarks.bench_consultas [--repeticoes N] [--multiplicar K]   (requer pip install duckdb)
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.consultas import ConsultasDuckDB, _literal, converter_para_parquet
+from utils.esquema import ler_reclamacoes
+
+# Filtros típicos da barra lateral: tudo, um estado, um semestre + status
+FILTROS = {
+    "sem filtro": {},
+    "estado": {"estado": "São Paulo"},
+    "período+status": {"inicio": "2022-03-01", "fim": "2022-08-31", "status": ("Resolvido", "Não resolvido")},
+}
+
+
+def medir(funcao, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return np.median(tempos) * 1000
+
+
+def filtrar_pandas(df, inicio=None, fim=None, estado="Todos", status=()):
+    mask = np.ones(len(df), dtype=bool)
+    if inicio is not None:
+        mask &= (df["TEMPO"] >= pd.Timestamp(inicio)).to_numpy()
+    if fim is not None:
+        mask &= (df["TEMPO"] <= pd.Timestamp(fim)).to_numpy()
+    if estado != "Todos":
+        mask &= (df["NOME_UF"] == estado).to_numpy()
+    if status:
+        mask &= df["STATUS"].isin(status).to_numpy()
+    return df.loc[mask]
+
+
+def consultas_pandas(df):
+    return {
+        "status": lambda f: filtrar_pandas(df, **f)["STATUS"].value_counts(),
+        "série diária": lambda f: filtrar_pandas(df, **f).groupby(["TEMPO", "STATUS"], observed=True).size(),
+        "por UF": lambda f: filtrar_pandas(df, **f).groupby("NOME_UF", observed=True).size(),
+        "por município": lambda f: filtrar_pandas(df, **f).groupby(["NOME_UF", "MUNICIPIO"], observed=True).size(),
+        "tamanho texto": lambda f: filtrar_pandas(df, **f)["DESCRICAO"].fillna("").str.len().describe(),
+    }
+
+
+def consultas_duckdb(consultas):
+    return {
+        "status": lambda f: consultas.contagem_status(**f),
+        "série diária": lambda f: consultas.serie_diaria(**f),
+        "por UF": lambda f: consultas.por_uf(**f),
+        "por município": lambda f: consultas.por_municipio(**f),
+        "tamanho texto": lambda f: consultas.estatisticas_tamanho(**f),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Agregações: pandas vs. DuckDB")
+    parser.add_argument("--csv", default="./datasets/RECLAMEAQUI_CARREFUOR_CLS.csv")
+    parser.add_argument("--repeticoes", type=int, default=10)
+    parser.add_argument("--multiplicar", type=int, default=1, help="Replica a tabela K vezes para simular volume")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        # Parquet particionado, replicado K vezes
+        base = converter_para_parquet(args.csv, Path(diretorio) / "base")
+        destino = Path(diretorio) / "reclamacoes"
+        replicador = ConsultasDuckDB(base)
+        replicador.consultar(
+            f"COPY (SELECT r.* FROM reclamacoes r, range({args.multiplicar})) "
+            f"TO {_literal(destino)} (FORMAT parquet, PARTITION_BY (ANO))"
+        )
+
+        inicio = time.perf_counter()
+        df = pd.concat([ler_reclamacoes(args.csv)] * args.multiplicar, ignore_index=True)
+        carga_pandas = time.perf_counter() - inicio
+        memoria = df.memory_usage(deep=True).sum() / 1024 ** 2
+
+        inicio = time.perf_counter()
+        consultas = ConsultasDuckDB(destino)
+        carga_duckdb = time.perf_counter() - inicio
+
+        print(f"{len(df)} reclamações")
+        print(f"pandas: carga {carga_pandas:.2f} s, {memoria:.1f} MB em memória")
+        print(f"duckdb: abertura {carga_duckdb * 1000:.1f} ms, tabela fica no Parquet "
+              f"({sum(p.stat().st_size for p in destino.rglob('*.parquet')) / 1024 ** 2:.1f} MB em disco)\n")
+
+        pandas_, duckdb_ = consultas_pandas(df), consultas_duckdb(consultas)
+        print(f"{'consulta':<16}{'filtro':<18}{'pandas p50':>12}{'duckdb p50':>12}")
+        for nome in pandas_:
+            for rotulo, filtros in FILTROS.items():
+                tempo_pandas = medir(lambda: pandas_[nome](filtros), args.repeticoes)
+                tempo_duckdb = medir(lambda: duckdb_[nome](filtros), args.repeticoes)
+                print(f"{nome:<16}{rotulo:<18}{tempo_pandas:>10.2f}ms{tempo_duckdb:>10.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
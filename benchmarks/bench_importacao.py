@@ -0,0 +1,59 @@
+# Tempo de importação na partida de um processo novo (python -X importtime), por página do dashboard.
+# Uso: python -m benchmarks.bench_importacao [--top N] [--repeticoes N] [--modulos folium wordcloud ...]
+# Cada página conta só os imports de topo do script (os adiados para dentro de seções/funções ficam de fora);
+# --modulos mede também bibliotecas avulsas, para comparar com o custo que foi adiado.
+import argparse
+import ast
+import subprocess
+import sys
+from pathlib import Path
+
+RAIZ = Path(__file__).resolve().parent.parent
+PAGINAS = {"app.py": RAIZ / "app.py", "pages/mapa.py": RAIZ / "pages" / "mapa.py"}
+
+
+def imports_de_topo(arquivo):
+    """Comandos import do nível de módulo do script, na ordem em que aparecem."""
+    arvore = ast.parse(Path(arquivo).read_text(encoding="utf-8"))
+    return [ast.unparse(no) for no in arvore.body if isinstance(no, (ast.Import, ast.ImportFrom))]
+
+
+def medir_importacao(codigo):
+    """[(módulo, próprio µs, acumulado µs, profundidade)] de um interpretador novo executando `codigo`."""
+    saida = subprocess.run([sys.executable, "-X", "importtime", "-c", codigo], cwd=RAIZ,
+                           capture_output=True, text=True, check=True).stderr
+    linhas = []
+    for linha in saida.splitlines():
+        if not linha.startswith("import time:") or "self [us]" in linha:
+            continue
+        proprio, acumulado, nome = linha[len("import time:"):].split("|")
+        linhas.append((nome.strip(), int(proprio), int(acumulado), (len(nome) - len(nome.lstrip())) // 2))
+    return linhas
+
+
+def relatorio(rotulo, codigo, top, repeticoes):
+    medicoes = [medir_importacao(codigo) for _ in range(repeticoes)]
+    # Execução de tempo total mediano (soma dos módulos de primeiro nível)
+    total, linhas = sorted(((sum(a for _, _, a, p in m if p == 0), m) for m in medicoes),
+                           key=lambda t: t[0])[len(medicoes) // 2]
+    print(f"\n{rotulo}: {total / 1000:.0f} ms (mediana de {repeticoes}), {len(linhas)} módulos")
+    for nome, _, acumulado, profundidade in sorted(linhas, key=lambda l: -l[2])[:top]:
+        print(f"  {acumulado / 1000:>8.1f} ms  {'  ' * profundidade}{nome}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tempo de importação das páginas do dashboard")
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--repeticoes", type=int, default=3)
+    parser.add_argument("--modulos", nargs="*", default=["folium", "streamlit_folium", "wordcloud",
+                                                          "matplotlib.pyplot", "scipy.stats", "geopandas"])
+    args = parser.parse_args()
+
+    for rotulo, arquivo in PAGINAS.items():
+        relatorio(rotulo, "\n".join(imports_de_topo(arquivo)), args.top, args.repeticoes)
+    for modulo in args.modulos:
+        relatorio(modulo, f"import {modulo}", 3, args.repeticoes)
+
+
+if __name__ == "__main__":
+    main()
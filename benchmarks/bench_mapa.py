@@ -0,0 +1,85 @@
+# Benchmark do mapa: tempo de montagem no servidor e tamanho do payload, folium (GeoJSON e TopoJSON) vs. Plotly.
+# Uso: python -m benchmarks.bench_mapa [--estados "São Paulo" "Bahia"] [--repeticoes N]
+# Geometrias e agregados vêm do cache (como num rerun do pages/mapa.py); mede-se só o que é refeito a cada filtro.
+import argparse
+import time
+
+import folium
+import numpy as np
+
+from utils import carregamento as cg
+from utils.agregados import METRICAS
+from utils.classificacao import ESQUEMAS
+from utils.mapa_plotly import figura_metrica
+from utils.topologia import com_propriedades
+
+
+def medir(funcao, repeticoes):
+    tempos, resultado = [], None
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        resultado = funcao()
+        tempos.append(time.perf_counter() - inicio)
+    return np.median(tempos) * 1000, resultado
+
+
+def preparar(path, estado, coluna_metrica):
+    """GeoDataFrame com as métricas (na ordem da geometria), faixas e caminho da geometria da visão."""
+    geometria = cg.PATH_ESTADOS if estado == 'Todos' else str(cg.arquivo_municipios(estado))
+    chave, chave_agregado = ('NM_UF', 'NOME_UF') if estado == 'Todos' else ('NM_MUN', 'MUNICIPIO')
+    gdf = cg.load_localidade_geodf(geometria)
+    if estado != 'Todos':
+        gdf = gdf[gdf['NM_UF'] == estado]
+    agregado = cg.load_agregado_mapa(path, 'Todos', estado)
+    agregado = agregado[agregado['Qtd_Reclamacoes'] > 0][[chave_agregado] + list(METRICAS.values())]
+    gdf = gdf.merge(agregado, left_on=chave, right_on=chave_agregado, how='left')
+    gdf = gdf[[chave, 'AREA_KM2'] + list(METRICAS.values()) + ['geometry']]
+    faixas = cg.load_faixas_mapa(path, 'Todos', estado, coluna_metrica, next(iter(ESQUEMAS.values())))
+    return gdf, chave, faixas, geometria
+
+
+def folium_html(gdf, chave, faixas, coluna_metrica, geo_data, topojson=None):
+    mapa = folium.Map(location=[-15, -50], zoom_start=5)
+    choropleth = folium.Choropleth(
+        geo_data=geo_data, topojson=topojson, data=gdf, columns=[chave, coluna_metrica],
+        key_on=f'feature.properties.{chave}', fill_color='YlOrRd', nan_fill_color='grey', bins=faixas,
+        highlight=True,
+    ).add_to(mapa)
+    folium.features.GeoJsonTooltip(fields=[chave, 'AREA_KM2'] + list(METRICAS.values())).add_to(choropleth.geojson)
+    return mapa.get_root().render()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mapa: folium vs. Plotly")
+    parser.add_argument("--csv", default=cg.PATH_RECLAMACOES)
+    parser.add_argument("--estados", nargs="*", default=['Todos', 'São Paulo', 'Minas Gerais', 'Bahia'])
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+    coluna_metrica = next(iter(METRICAS.values()))
+
+    print(f"{'visão':<16}{'modo':<18}{'montagem p50':>14}{'payload':>12}")
+    for estado in args.estados:
+        gdf, chave, faixas, geometria = preparar(args.csv, estado, coluna_metrica)
+        topo = cg.load_topologia(geometria, estado)
+        geojson = cg.load_geojson_mapa(geometria, estado)
+        propriedades = gdf.drop(columns='geometry').astype(object)
+        propriedades = propriedades.where(propriedades.notna(), None).to_dict('records')
+
+        modos = {
+            "folium GeoJSON": lambda: folium_html(
+                gdf, chave, faixas, coluna_metrica,
+                gdf.assign(geometry=gdf.geometry.simplify(0.01, preserve_topology=True))),
+            "folium TopoJSON": lambda: folium_html(
+                gdf, chave, faixas, coluna_metrica,
+                com_propriedades(topo, 'localidades', propriedades), 'objects.localidades'),
+            "plotly": lambda: figura_metrica(
+                geojson, gdf[chave], gdf[coluna_metrica], faixas, gdf[list(METRICAS.values())].round(2),
+                (-15, -50), 4).to_json(),
+        }
+        for modo, funcao in modos.items():
+            tempo, payload = medir(funcao, args.repeticoes)
+            print(f"{estado:<16}{modo:<18}{tempo:>12.1f}ms{len(payload.encode()) / 1024:>10.0f}KB")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,12 @@
+import numpy as np
 import streamlit as st
-import pandas as pd
-import geopandas as gpd
-from shapely.geometry import Polygon
-from shapely import wkt
-from shapely.geometry import Polygon, MultiPolygon
-import folium
-from streamlit_folium import st_folium
-from pathlib import Path
-from folium.plugins import StripePattern
+from utils.agregados import METRICAS, arquivo_municipios, metricas_disponiveis
+from utils.classificacao import ESQUEMAS
+from utils.carregamento import (PATH_RECLAMACOES, PATH_ESTADOS, load_localidade_geodf, load_agregado_mapa,
+                                load_faixas_mapa, load_hotspots, load_topologia, load_geojson_mapa,
+                                load_denominadores_uf, load_denominadores_municipios)
+from utils.aquecimento import iniciar_aquecimento
+from utils.detalhe import linhas_detalhe, pagina_reclamacoes, texto_completo
 
 # Adicionando botões de navegação
 col1, col2 = st.columns([1,6])
@@ -24,28 +23,46 @@ st.title("🗺️ Mapa de calor - Reclamações por Estado / Município")
 # df_filtrado = st.session_state['df_filtrado']
 df_reclamacoes = st.session_state['df_reclamacoes']
 gdf_estados = st.session_state.get('gdf_estados')
+# CSV da empresa selecionada no app.py (chave dos agregados do mapa)
+path_reclamacoes = st.session_state.get('path_reclamacoes', PATH_RECLAMACOES)
 
-# --- Função para carregar o GeoDataFrame das localidades ---
-@st.cache_data(ttl=3600)
-def load_localidade_geodf(path):
-    df = pd.read_csv(path, sep=',') 
+# Funções de carga compartilhadas com o app.py (utils/carregamento.py); agregados e faixas de cor
+# são indexados pelo caminho do CSV, e as visões padrão já foram aquecidas em segundo plano
+iniciar_aquecimento()
 
-    if 'POLYGON' not in df.columns:
-        st.error(f"Coluna 'POLYGON' não encontrada. Colunas disponíveis: {df.columns.tolist()}")
-        return gpd.GeoDataFrame()
+# Cores das classes de hot spots / clusters
+CORES_HOTSPOTS = {
+    "Hot spot": "#d7191c", "Cold spot": "#2c7bb6",
+    "Alto-Alto": "#d7191c", "Baixo-Baixo": "#2c7bb6", "Alto-Baixo": "#fdae61", "Baixo-Alto": "#abd9e9",
+    "Não significativo": "#eeeeee",
+}
 
-    # Converte string WKT -> objetos shapely (Polygon ou MultiPolygon)
-    def to_geom(s):
-        try:
-            return wkt.loads(s)
-        except Exception as e:
-            st.error(f"Erro convertendo '{s[:50]}...': {e}")
-            return None
+# Colunas mostradas ao passar o mouse no modo Plotly
+ROTULOS_METRICAS = {'AREA_KM2': 'Área (Km²)', 'Qtd_Reclamacoes': 'N° de Reclamações',
+                    'Reclamacoes_km2': 'Reclamações por km²', 'Reclamacoes_100k': 'Reclamações por 100 mil hab.'}
+ROTULOS_HOTSPOTS = {'Qtd_Reclamacoes': 'N° de Reclamações', 'GI_Z': 'Gi* (z)', 'GI_P_SIM': 'p (Gi*, permutação)',
+                    'LISA_I': 'Moran Local (I)', 'LISA_P_SIM': 'p (Moran, permutação)'}
 
-    df['geometry'] = df['POLYGON'].apply(to_geom)
+# Objeto das feições dentro do TopoJSON de utils/carregamento.load_topologia
+OBJETO_TOPOJSON = 'objects.localidades'
 
-    gdf = gpd.GeoDataFrame(df, geometry='geometry', crs="EPSG:4326")
-    return gdf
+
+def geometria_mapa(gdf, path_geometria, estado, compacto):
+    """geo_data do mapa: TopoJSON em cache com as colunas de `gdf` como propriedades, ou o GeoDataFrame simplificado.
+
+    `gdf` precisa estar na ordem das feições de load_topologia (a do arquivo de geometria).
+    """
+    if not compacto:
+        gdf = gdf.copy()
+        gdf['geometry'] = gdf['geometry'].simplify(0.01, preserve_topology=True)
+        return gdf
+    propriedades = gdf.drop(columns='geometry')
+    propriedades = propriedades.astype(object).where(propriedades.notna(), None).to_dict('records')
+    return com_propriedades(load_topologia(path_geometria, estado), OBJETO_TOPOJSON.split('.')[-1], propriedades)
+
+
+def hover_plotly(gdf, rotulos):
+    return gdf[list(rotulos)].round(2).rename(columns=rotulos)
 
 # --- Sidebar com seletores ---
 st.sidebar.header("Filtros 🔍")
@@ -62,6 +79,38 @@ opcoes_anos = sorted(df_reclamacoes['ANO'].unique())
 todas_opcoes = ['Todos'] + opcoes_anos
 ano = st.sidebar.selectbox("Ano", options=todas_opcoes)
 
+# Seletor de métrica (sem as taxas cujo denominador não existe no nível exibido, ex.: população municipal)
+st.sidebar.header("Selecione a métrica")
+if estado != 'Todos' and arquivo_municipios(estado) is not None:
+    metricas = metricas_disponiveis(load_denominadores_municipios(str(arquivo_municipios(estado))))
+else:
+    metricas = metricas_disponiveis(load_denominadores_uf(PATH_ESTADOS))
+metrica = st.sidebar.selectbox("Métrica", options=list(metricas))
+coluna_metrica = metricas[metrica]
+
+# Seletor de camada (hot spots só fazem sentido na visão por município)
+camada = "Reclamações"
+if estado != 'Todos':
+    camada = st.sidebar.selectbox("Camada", options=["Reclamações", "Hot spots (Gi*)", "Clusters (Moran Local)"])
+
+# Seletor do esquema de classificação das cores
+classificacao = st.sidebar.selectbox("Classificação das faixas", options=list(ESQUEMAS))
+faixas = load_faixas_mapa(path_reclamacoes, ano, estado, coluna_metrica, ESQUEMAS[classificacao])
+
+# Renderização: folium (Leaflet) ou Plotly (figura com a geometria em cache, só as cores mudam)
+plotly = st.sidebar.radio("Renderização do mapa", options=["Folium", "Plotly"], horizontal=True) == "Plotly"
+
+# Geometria compacta: divisas compartilhadas enviadas uma única vez, em coordenadas inteiras
+compacto = not plotly and st.sidebar.checkbox("Geometria compacta (TopoJSON)", value=True)
+
+# Só a biblioteca do modo escolhido é importada (folium e streamlit_folium pesam na partida do processo)
+if plotly:
+    from utils.mapa_plotly import figura_metrica, figura_categorias
+else:
+    import folium
+    from streamlit_folium import st_folium
+    from utils.topologia import com_propriedades
+
 # Filtrar o DataFrame com base no ano selecionado
 if ano != 'Todos':
     df_mapa = df_reclamacoes[df_reclamacoes['ANO'] == ano]
@@ -81,24 +130,15 @@ if df_mapa.empty:
 if estado == 'Todos':
     gdf_mapa = gdf_estados.copy()
 else:
-    if estado in ["Acre", "Amazonas", "Roraima", "Rondônia", "Tocantins", "Amapá", "Pará"]:
-        gdf_municipios_norte = load_localidade_geodf("./datasets/gdf_municipios_norte.csv")
-        gdf_mapa = gdf_municipios_norte.copy()
-    elif estado in ["Alagoas", "Bahia", "Ceará", "Maranhão", "Paraíba", "Pernambuco", "Piauí", "Rio Grande do Norte", "Sergipe"]:
-        gdf_municipios_nordeste = load_localidade_geodf("./datasets/gdf_municipios_nordeste.csv")
-        gdf_mapa = gdf_municipios_nordeste.copy()
-    elif estado in ["Distrito Federal", "Goiás", "Mato Grosso", "Mato Grosso do Sul"]:
-        gdf_municipios_centro_oeste = load_localidade_geodf("./datasets/gdf_municipios_centro_oeste.csv")
-        gdf_mapa = gdf_municipios_centro_oeste.copy()
-    elif estado in ["Espírito Santo", "Minas Gerais", "Rio de Janeiro", "São Paulo"]:
-        gdf_municipios_sudeste = load_localidade_geodf("./datasets/gdf_municipios_sudeste.csv")
-        gdf_mapa = gdf_municipios_sudeste.copy()
-    elif estado in ["Paraná", "Rio Grande do Sul", "Santa Catarina"]:
-        gdf_municipios_sul = load_localidade_geodf("./datasets/gdf_municipios_sul.csv")
-        gdf_mapa = gdf_municipios_sul.copy()
-    else:
+    path_municipios = arquivo_municipios(estado)
+    if path_municipios is None:
         st.error("Estado selecionado não pertence a nenhuma região reconhecida.")
         st.stop()
+    try:
+        gdf_mapa = load_localidade_geodf(str(path_municipios)).copy()
+    except Exception as e:
+        st.error(f"Erro ao carregar os municípios de {estado}: {e}")
+        st.stop()
 
 # Verifica se o DataFrame df_mapa está vazio
 if gdf_mapa.empty:
@@ -112,101 +152,199 @@ if estado != 'Todos':
     gdf_municipios = gdf_mapa[gdf_mapa["NM_UF"] == estado]
 
     # Centralizar o mapa na área de interesse
-    mapa = folium.Map(location=[gdf_municipios.geometry.centroid.y.mean(), gdf_municipios.geometry.centroid.x.mean()], zoom_start=6.3)
+    centro, zoom = [gdf_municipios.geometry.centroid.y.mean(), gdf_municipios.geometry.centroid.x.mean()], 6.3
 
-    # Agrupando informações dos estados
-    df_mapa = df_mapa.groupby(['MUNICIPIO']).size().reset_index(name='Qtd_Reclamacoes')
-
-    # Substituindo valores nulos
-    df_mapa['Qtd_Reclamacoes'] = df_mapa['Qtd_Reclamacoes'].fillna(0).astype(int)
+    # Contagens e taxas por município (agregado em cache)
+    df_mapa = load_agregado_mapa(path_reclamacoes, ano, estado)
+    df_mapa = df_mapa[df_mapa['Qtd_Reclamacoes'] > 0][['MUNICIPIO'] + list(METRICAS.values())]
 
     # Unificando com os dados de localização de cada estado
     gdf_final = gdf_municipios.merge(df_mapa, left_on='NM_MUN', right_on='MUNICIPIO', how='left')
 
     # Separando as colunas necessárias
-    cols = ['MUNICIPIO', 'NM_MUN', 'AREA_KM2', 'Qtd_Reclamacoes', 'geometry']
+    cols = ['MUNICIPIO', 'NM_MUN', 'AREA_KM2'] + list(METRICAS.values()) + ['geometry']
     gdf_final = gdf_final[cols]
 
-    # Simplificando a geometria para melhorar o desempenho do mapa
-    gdf_final['geometry'] = gdf_final['geometry'].simplify(0.01, preserve_topology=True)
-
-    # Adicionando as informações no mapa
-    choropleth = folium.Choropleth(
-        geo_data=gdf_final,
-        name='choropleth',
-        data=gdf_final,
-        columns=['MUNICIPIO', 'Qtd_Reclamacoes'],
-        key_on='feature.properties.NM_MUN', 
-        fill_color='YlOrRd', 
-        nan_fill_color='grey',
-        nan_fill_opacity=0.4,
-        fill_opacity=0.7,
-        line_opacity=0.2,
-        legend_name='Quantidade de Reclamações',
-        highlight=True, 
-    )
-
-    choropleth.add_to(mapa)
-
-    # --- Adicionar Tooltips Interativos (Informação no Hover) ---
-    tooltip = folium.features.GeoJsonTooltip(
-        fields=['NM_MUN', 'AREA_KM2', 'Qtd_Reclamacoes'],
-        aliases=['Município:', 'Área (Km²):', 'N° de Reclamações:'],
-        style="background-color: white; color: #333333; font-family: arial; font-size: 12px; padding: 10px;",
-        sticky=True
-    )
-
-    tooltip.add_to(choropleth.geojson)
+    if camada == "Reclamações":
+        if plotly:
+            # Mesma geometria em cache; a cada filtro só mudam as faixas (z) e o hover
+            fig = figura_metrica(load_geojson_mapa(str(path_municipios), estado), gdf_final['NM_MUN'],
+                                 gdf_final[coluna_metrica], faixas, hover_plotly(gdf_final, ROTULOS_METRICAS),
+                                 centro, zoom - 1, metrica)
+        else:
+            mapa = folium.Map(location=centro, zoom_start=zoom)
+
+            # Adicionando as informações no mapa
+            choropleth = folium.Choropleth(
+                geo_data=geometria_mapa(gdf_final, str(path_municipios), estado, compacto),
+                topojson=OBJETO_TOPOJSON if compacto else None,
+                name='choropleth',
+                data=gdf_final,
+                columns=['MUNICIPIO', coluna_metrica],
+                key_on='feature.properties.NM_MUN', 
+                fill_color='YlOrRd', 
+                nan_fill_color='grey',
+                nan_fill_opacity=0.4,
+                fill_opacity=0.7,
+                line_opacity=0.2,
+                legend_name=metrica,
+                bins=faixas,
+                highlight=True, 
+            )
+
+            choropleth.add_to(mapa)
+
+            # --- Adicionar Tooltips Interativos (Informação no Hover) ---
+            tooltip = folium.features.GeoJsonTooltip(
+                fields=['NM_MUN', 'AREA_KM2', 'Qtd_Reclamacoes', 'Reclamacoes_km2', 'Reclamacoes_100k'],
+                aliases=['Município:', 'Área (Km²):', 'N° de Reclamações:', 'Reclamações por km²:', 'Reclamações por 100 mil hab.:'],
+                style="background-color: white; color: #333333; font-family: arial; font-size: 12px; padding: 10px;",
+                sticky=True
+            )
+
+            tooltip.add_to(choropleth.geojson)
 
-else:
+    else:
+        # Camada de hot spots / clusters: cor pela classe estatisticamente significativa
+        coluna_classe = 'CLASSE_GI' if camada.startswith("Hot spots") else 'CLASSE_LISA'
+        with st.spinner("Calculando hot spots..."):
+            df_hotspots = load_hotspots(path_reclamacoes, ano, estado, coluna_metrica)
+        gdf_hotspots = gdf_final.merge(df_hotspots, on='NM_MUN', how='left')
+        gdf_hotspots[coluna_classe] = gdf_hotspots[coluna_classe].fillna("Não significativo")
+        gdf_hotspots[['Qtd_Reclamacoes', 'GI_Z', 'GI_P_SIM', 'LISA_I', 'LISA_P_SIM']] = (
+            gdf_hotspots[['Qtd_Reclamacoes', 'GI_Z', 'GI_P_SIM', 'LISA_I', 'LISA_P_SIM']].fillna(0).round(3)
+        )
+
+        if plotly:
+            fig = figura_categorias(load_geojson_mapa(str(path_municipios), estado), gdf_hotspots['NM_MUN'],
+                                    gdf_hotspots[coluna_classe], CORES_HOTSPOTS,
+                                    hover_plotly(gdf_hotspots, ROTULOS_HOTSPOTS), centro, zoom - 1, camada)
+        else:
+            mapa = folium.Map(location=centro, zoom_start=zoom)
+            geo_hotspots = geometria_mapa(
+                gdf_hotspots[['NM_MUN', 'Qtd_Reclamacoes', 'GI_Z', 'GI_P_SIM', 'LISA_I', 'LISA_P_SIM', coluna_classe, 'geometry']],
+                str(path_municipios), estado, compacto,
+            )
+            camada_hotspots = folium.TopoJson if compacto else folium.GeoJson
+            argumentos = {'object_path': OBJETO_TOPOJSON} if compacto else {}
+            camada_hotspots(
+                geo_hotspots,
+                name='hotspots',
+                style_function=lambda feature: {
+                    'fillColor': CORES_HOTSPOTS[feature['properties'][coluna_classe]],
+                    'color': '#555555',
+                    'weight': 0.3,
+                    'fillOpacity': 0.75,
+                },
+                tooltip=folium.features.GeoJsonTooltip(
+                    fields=['NM_MUN', 'Qtd_Reclamacoes', coluna_classe, 'GI_Z', 'GI_P_SIM', 'LISA_I', 'LISA_P_SIM'],
+                    aliases=['Município:', 'N° de Reclamações:', 'Classe:', 'Gi* (z):', 'p (Gi*, permutação):',
+                             'Moran Local (I):', 'p (Moran, permutação):'],
+                    style="background-color: white; color: #333333; font-family: arial; font-size: 12px; padding: 10px;",
+                    sticky=True
+                ),
+                **argumentos,
+            ).add_to(mapa)
+
+        st.caption(
+            f"Classes com significância de 5% (999 permutações condicionais) sobre a métrica '{metrica}': "
+            + ", ".join(f"{classe}: {df_hotspots[coluna_classe].eq(classe).sum()}"
+                        for classe in df_hotspots[coluna_classe].unique())
+        )
 
-    # Agrupando informações dos estados
-    df_mapa = df_mapa.groupby(['NOME_UF']).size().reset_index(name='Qtd_Reclamacoes')
+else:
 
-    # Substituindo valores nulos
-    df_mapa['Qtd_Reclamacoes'] = df_mapa['Qtd_Reclamacoes'].fillna(0).astype(int)
+    # Contagens e taxas por estado (agregado em cache)
+    df_mapa = load_agregado_mapa(path_reclamacoes, ano, estado)
+    df_mapa = df_mapa[df_mapa['Qtd_Reclamacoes'] > 0][['NOME_UF'] + list(METRICAS.values())]
 
     # Unificando com os dados de localização de cada estado
     gdf_final = gdf_estados.merge(df_mapa, left_on='NM_UF', right_on='NOME_UF', how='left')
 
     # Separando as colunas necessárias
-    cols = ['NOME_UF', 'NM_UF', 'AREA_KM2', 'Qtd_Reclamacoes', 'geometry']
+    cols = ['NOME_UF', 'NM_UF', 'AREA_KM2'] + list(METRICAS.values()) + ['geometry']
     gdf_final = gdf_final[cols]
 
     # Centralizar o mapa na área de interesse
-    mapa = folium.Map(location=[gdf_final.geometry.centroid.y.mean(), gdf_final.geometry.centroid.x.mean()], zoom_start=4.3)
-
-    # Simplificando a geometria para melhorar o desempenho do mapa
-    gdf_final['geometry'] = gdf_final['geometry'].simplify(0.01, preserve_topology=True)
-
-    # Adicionando as informações no mapa
-    choropleth = folium.Choropleth(
-        geo_data=gdf_final,
-        name='choropleth',
-        data=gdf_final,
-        columns=['NOME_UF', 'Qtd_Reclamacoes'],
-        key_on='feature.properties.NM_UF', # Chave no GeoJSON para conectar os dados
-        fill_color='YlOrRd', # Nome do colormap (escala de cores)
-        nan_fill_color='grey',
-        nan_fill_opacity=0.4,
-        fill_opacity=0.7,
-        line_opacity=0.2,
-        legend_name='Quantidade de Reclamações',
-        bins=[1, 20, 40, 80, 160, 320, 660],
-        highlight=True, # Destaca a área ao passar o mouse
-    )
-
-    choropleth.add_to(mapa)
-
-    # --- Adicionar Tooltips Interativos (Informação no Hover) ---
-    tooltip = folium.features.GeoJsonTooltip(
-        fields=['NM_UF', 'AREA_KM2', 'Qtd_Reclamacoes'],
-        aliases=['Estado:', 'Área (Km²):', 'N° de Reclamações:'],
-        style="background-color: white; color: #333333; font-family: arial; font-size: 12px; padding: 10px;",
-        sticky=True
-    )
-
-    tooltip.add_to(choropleth.geojson)
-
-    
-st_folium(mapa, width=1100, height=800, returned_objects=[])
\ No newline at end of file
+    centro, zoom = [gdf_final.geometry.centroid.y.mean(), gdf_final.geometry.centroid.x.mean()], 4.3
+
+    if plotly:
+        fig = figura_metrica(load_geojson_mapa(PATH_ESTADOS, estado), gdf_final['NM_UF'], gdf_final[coluna_metrica],
+                             faixas, hover_plotly(gdf_final, ROTULOS_METRICAS), centro, zoom - 1, metrica)
+    else:
+        mapa = folium.Map(location=centro, zoom_start=zoom)
+
+        # Adicionando as informações no mapa
+        choropleth = folium.Choropleth(
+            geo_data=geometria_mapa(gdf_final, PATH_ESTADOS, estado, compacto),
+            topojson=OBJETO_TOPOJSON if compacto else None,
+            name='choropleth',
+            data=gdf_final,
+            columns=['NOME_UF', coluna_metrica],
+            key_on='feature.properties.NM_UF', # Chave no GeoJSON para conectar os dados
+            fill_color='YlOrRd', # Nome do colormap (escala de cores)
+            nan_fill_color='grey',
+            nan_fill_opacity=0.4,
+            fill_opacity=0.7,
+            line_opacity=0.2,
+            legend_name=metrica,
+            bins=faixas,
+            highlight=True, # Destaca a área ao passar o mouse
+        )
+
+        choropleth.add_to(mapa)
+
+        # --- Adicionar Tooltips Interativos (Informação no Hover) ---
+        tooltip = folium.features.GeoJsonTooltip(
+            fields=['NM_UF', 'AREA_KM2', 'Qtd_Reclamacoes', 'Reclamacoes_km2', 'Reclamacoes_100k'],
+            aliases=['Estado:', 'Área (Km²):', 'N° de Reclamações:', 'Reclamações por km²:', 'Reclamações por 100 mil hab.:'],
+            style="background-color: white; color: #333333; font-family: arial; font-size: 12px; padding: 10px;",
+            sticky=True
+        )
+
+        tooltip.add_to(choropleth.geojson)
+
+# Clique numa região: Plotly devolve a `location` do ponto (NM_UF / NM_MUN); o folium, as propriedades
+# da última feição clicada (só esse objeto volta do navegador, então mover o mapa não dispara rerun)
+if plotly:
+    evento_mapa = st.plotly_chart(fig, use_container_width=True, on_select="rerun", selection_mode="points",
+                                  key=f"mapa_plotly_{estado}")
+    regioes_clicadas = [p.get('location') for p in evento_mapa.selection.points if p.get('location')]
+else:
+    retorno = st_folium(mapa, width=1100, height=800, returned_objects=["last_active_drawing"],
+                        key=f"mapa_folium_{estado}")
+    feicao = (retorno or {}).get("last_active_drawing") or {}
+    propriedades = feicao.get("properties") or {}
+    regiao = propriedades.get('NM_MUN' if estado != 'Todos' else 'NM_UF')
+    regioes_clicadas = [regiao] if regiao else []
+
+# **Detalhamento** das reclamações da região clicada no ano selecionado (mesmo recorte do app.py)
+st.subheader("🔎 Reclamações da região selecionada")
+if not regioes_clicadas:
+    st.caption("Clique num estado ou município do mapa para listar as reclamações dele.")
+else:
+    regiao = regioes_clicadas[0]
+    filtros_regiao = {'NOME_UF': regiao} if estado == 'Todos' else {'NOME_UF': estado, 'MUNICIPIO': regiao}
+    mask_ano = (df_reclamacoes['ANO'] == ano).to_numpy() if ano != 'Todos' else np.ones(len(df_reclamacoes), dtype=bool)
+    linhas = linhas_detalhe(df_reclamacoes, mask_ano, filtros_regiao)
+    if len(linhas) == 0:
+        st.info(f"Nenhuma reclamação de {regiao} no período selecionado.")
+    else:
+        col1, col2, col3 = st.columns([1, 1, 4])
+        tamanho_pagina = col1.selectbox("Por página", options=[20, 50, 100])
+        n_paginas = -(-len(linhas) // tamanho_pagina)
+        # A chave muda com o recorte: trocar de região volta para a primeira página
+        pagina = col2.number_input("Página", min_value=1, max_value=n_paginas, value=1, step=1,
+                                   key=f"pagina_mapa_{regiao}_{ano}_{tamanho_pagina}")
+        col3.caption(f"{regiao}: {len(linhas)} reclamações · página {pagina} de {n_paginas}")
+
+        df_pagina = pagina_reclamacoes(df_reclamacoes, linhas, pagina, tamanho_pagina)
+        evento_tabela = st.dataframe(df_pagina.drop(columns='LINHA'), hide_index=True, use_container_width=True,
+                                     on_select="rerun", selection_mode="single-row",
+                                     column_config={'RESUMO': st.column_config.TextColumn('Descrição', width='large')},
+                                     key=f"tabela_mapa_{regiao}_{ano}_{pagina}_{tamanho_pagina}")
+        if evento_tabela.selection.rows:
+            escolhida = df_pagina.iloc[evento_tabela.selection.rows[0]]
+            with st.container(border=True):
+                st.markdown(f"**Reclamação {escolhida['ID']}** · {escolhida['DATA']} · {escolhida['STATUS']}")
+                st.write(texto_completo(df_reclamacoes, escolhida['LINHA']))
\ No newline at end of file
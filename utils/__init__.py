@@ -0,0 +1 @@
+# Módulos auxiliares do dashboard (camada de dados, índices e análises).
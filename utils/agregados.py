@@ -0,0 +1,125 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# --- Camada de agregados geográficos ---
+# Contagens por UF / município e taxas normalizadas (por km² e por 100 mil habitantes),
+# calculadas de forma vetorizada a partir de uma tabela de denominadores sem geometria.
+
+PASTA_DATASETS = Path("./datasets")
+
+# Arquivo de geometrias municipais de cada região
+REGIOES = {
+    "norte": ["Acre", "Amazonas", "Roraima", "Rondônia", "Tocantins", "Amapá", "Pará"],
+    "nordeste": ["Alagoas", "Bahia", "Ceará", "Maranhão", "Paraíba", "Pernambuco", "Piauí", "Rio Grande do Norte", "Sergipe"],
+    "centro_oeste": ["Distrito Federal", "Goiás", "Mato Grosso", "Mato Grosso do Sul"],
+    "sudeste": ["Espírito Santo", "Minas Gerais", "Rio de Janeiro", "São Paulo"],
+    "sul": ["Paraná", "Rio Grande do Sul", "Santa Catarina"],
+}
+
+# Rótulo exibido -> coluna calculada
+METRICAS = {
+    "Quantidade de reclamações": "Qtd_Reclamacoes",
+    "Reclamações por km²": "Reclamacoes_km2",
+    "Reclamações por 100 mil hab.": "Reclamacoes_100k",
+}
+
+# Taxa -> coluna do denominador
+DENOMINADORES = {"Reclamacoes_km2": "AREA_KM2", "Reclamacoes_100k": "POPULACAO"}
+
+
+def arquivo_municipios(estado, pasta=PASTA_DATASETS):
+    """Caminho do gdf_municipios_<regiao>.csv que contém o estado (ou None)."""
+    for regiao, estados in REGIOES.items():
+        if estado in estados:
+            return Path(pasta) / f"gdf_municipios_{regiao}.csv"
+    return None
+
+
+# --- Denominadores (área e população), lidos sem a coluna de geometria ---
+def ler_denominadores_uf(path_estados, path_populacao=PASTA_DATASETS / "populacao_uf.csv"):
+    """NM_UF, AREA_KM2, POPULACAO por estado (população: Censo IBGE 2022, arquivo local)."""
+    areas = pd.read_csv(path_estados, usecols=["NM_UF", "AREA_KM2"])
+    if Path(path_populacao).exists():
+        populacao = pd.read_csv(path_populacao, usecols=["NM_UF", "POPULACAO"])
+        areas = areas.merge(populacao, on="NM_UF", how="left")
+    else:
+        areas["POPULACAO"] = np.nan
+    return areas
+
+
+def ler_denominadores_municipios(paths_municipios, path_populacao=PASTA_DATASETS / "populacao_municipios.csv"):
+    """NM_UF, NM_MUN, AREA_KM2, POPULACAO por município.
+
+    A população municipal vem de um CSV opcional (NM_UF, NM_MUN, POPULACAO); sem ele, a taxa
+    por habitante fica indisponível (NaN) e apenas a taxa por km² é calculada.
+    """
+    partes = [pd.read_csv(p, usecols=["NM_UF", "NM_MUN", "AREA_KM2"]) for p in paths_municipios if Path(p).exists()]
+    if partes:
+        areas = pd.concat(partes, ignore_index=True)
+    else:
+        areas = pd.DataFrame({"NM_UF": pd.Series(dtype=object), "NM_MUN": pd.Series(dtype=object),
+                              "AREA_KM2": pd.Series(dtype=float)})
+    if Path(path_populacao).exists():
+        populacao = pd.read_csv(path_populacao, usecols=["NM_UF", "NM_MUN", "POPULACAO"])
+        areas = areas.merge(populacao, on=["NM_UF", "NM_MUN"], how="left")
+    else:
+        areas["POPULACAO"] = np.nan
+    return areas
+
+
+# --- Agregados ---
+def contagem_por_uf(df):
+    return df.groupby(["NOME_UF"], observed=True).size().reset_index(name="Qtd_Reclamacoes")
+
+
+def contagem_por_municipio(df, estado):
+    df_estado = df[df["NOME_UF"] == estado]
+    return df_estado.groupby(["MUNICIPIO"], observed=True).size().reset_index(name="Qtd_Reclamacoes")
+
+
+def adicionar_taxas(agregado, denominadores):
+    """Acrescenta Reclamacoes_km2 e Reclamacoes_100k (vetorizado; denominador ausente/zero -> NaN).
+
+    `denominadores` deve estar alinhado ao agregado (mesma ordem de linhas) ou já mesclado nele.
+    """
+    qtd = agregado["Qtd_Reclamacoes"].to_numpy(dtype=float)
+    area = np.asarray(denominadores["AREA_KM2"], dtype=float)
+    populacao = np.asarray(denominadores["POPULACAO"], dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        agregado["Reclamacoes_km2"] = np.where(area > 0, qtd / area, np.nan)
+        agregado["Reclamacoes_100k"] = np.where(populacao > 0, qtd / populacao * 1e5, np.nan)
+    return agregado
+
+
+def taxas_por_uf(df, denominadores_uf):
+    """Contagem e taxas por estado com reclamação; estado sem denominador fica com taxas NaN."""
+    return taxas_de_contagem_uf(contagem_por_uf(df), denominadores_uf)
+
+
+def taxas_por_municipio(df, estado, denominadores_municipios):
+    """Contagem e taxas dos municípios do estado com reclamação; município cuja grafia não casa com
+    NM_MUN continua na contagem, com taxas NaN."""
+    return taxas_de_contagem_municipio(contagem_por_municipio(df, estado), estado, denominadores_municipios)
+
+
+def taxas_de_contagem_uf(contagem, denominadores_uf):
+    """Como taxas_por_uf, a partir de uma contagem já agregada (NOME_UF, Qtd_Reclamacoes)."""
+    agregado = contagem.merge(denominadores_uf, left_on="NOME_UF", right_on="NM_UF", how="left")
+    agregado["NM_UF"] = agregado["NOME_UF"]
+    return adicionar_taxas(agregado, agregado)
+
+
+def taxas_de_contagem_municipio(contagem, estado, denominadores_municipios):
+    """Como taxas_por_municipio, a partir de uma contagem já agregada (MUNICIPIO, Qtd_Reclamacoes)."""
+    denominadores = denominadores_municipios[denominadores_municipios["NM_UF"] == estado]
+    agregado = contagem.merge(denominadores, left_on="MUNICIPIO", right_on="NM_MUN", how="left")
+    agregado["NM_UF"], agregado["NM_MUN"] = estado, agregado["MUNICIPIO"]
+    return adicionar_taxas(agregado, agregado)
+
+
+def metricas_disponiveis(denominadores):
+    """METRICAS sem as taxas cujo denominador falta por completo (ex.: população municipal não fornecida)."""
+    ausentes = {taxa for taxa, coluna in DENOMINADORES.items() if denominadores[coluna].isna().all()}
+    return {rotulo: coluna for rotulo, coluna in METRICAS.items() if coluna not in ausentes}
@@ -0,0 +1,188 @@
+import hashlib
+import json
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.artefatos import pasta_atual, publicar
+
+try:
+    import fcntl
+except ImportError:  # Windows: só a trava entre threads
+    fcntl = None
+
+# --- Detecção de anomalias nas séries diárias por (UF, STATUS) ---
+# Z-score robusto em janela móvel: z = (x - mediana) / escala, com escala = 1,4826 * MAD
+# (limitada por baixo por sqrt(mediana), já que as contagens diárias são pequenas e esparsas).
+# O estado do detector (últimos `janela` dias de cada série) é salvo em disco, de modo que
+# cada nova carga processa apenas os dias ainda não vistos.
+# O estado guarda a versão do CSV (manifesto) e um hash das contagens já processadas: se o CSV mudou
+# e os dias antigos não batem mais (reclamações corrigidas ou removidas), o histórico é refeito do zero.
+# Os três arquivos do estado são publicados juntos numa pasta versionada (utils/artefatos.py), e a
+# leitura-atualização-gravação é serializada entre threads e processos por uma trava em arquivo.
+
+DIRETORIO_PADRAO = Path(__file__).resolve().parent.parent / "datasets" / "anomalias"
+UF_TODOS = "Todos"
+
+_trava = threading.Lock()
+
+
+@contextmanager
+def _travado(diretorio):
+    """Exclusão mútua entre threads (trava do módulo) e entre processos (flock em <diretorio>/.trava)."""
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    with _trava, open(diretorio / ".trava", "a") as arquivo:
+        if fcntl is not None:
+            fcntl.flock(arquivo, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(arquivo, fcntl.LOCK_UN)
+
+
+def _hash_contagens(diario):
+    return hashlib.sha256(np.ascontiguousarray(diario.to_numpy(dtype=np.float32)).tobytes()).hexdigest()
+
+
+class DetectorAnomalias:
+    """Detector incremental para várias séries diárias ao mesmo tempo (uma coluna por série)."""
+
+    def __init__(self, series, janela=28, limiar=3.5, minimo=3, min_historico=7):
+        self.series = list(series)  # [(UF, STATUS), ...]
+        self.janela = janela
+        self.limiar = limiar
+        self.minimo = minimo
+        self.min_historico = min_historico
+        self.buffer = np.zeros((janela, len(self.series)), dtype=np.float32)
+        self.preenchidos = 0
+        self.ultima_data = None
+        self.fonte = None  # versão do CSV (manifesto) da última atualização
+        self.historico = None  # hash das contagens diárias processadas até ultima_data
+        self.anomalias = pd.DataFrame(columns=["DATA", "UF", "STATUS", "VALOR", "MEDIANA", "Z"])
+
+    def _completo(self, diario):
+        return diario.reindex(columns=pd.MultiIndex.from_tuples(self.series), fill_value=0).sort_index()
+
+    def historico_confere(self, diario):
+        """True se as contagens de `diario` até `ultima_data` são as mesmas já processadas."""
+        if self.ultima_data is None:
+            return True
+        anteriores = self._completo(diario)
+        anteriores = anteriores[anteriores.index <= self.ultima_data]
+        return _hash_contagens(anteriores) == self.historico
+
+    def atualizar(self, diario):
+        """Processa os dias de `diario` (índice = data, colunas = self.series) posteriores ao último visto."""
+        diario = self._completo(diario)
+        completo = diario
+        if self.ultima_data is not None:
+            diario = diario[diario.index > self.ultima_data]
+        if diario.empty:
+            return self.anomalias.iloc[0:0]
+
+        # Completa dias sem reclamação para não distorcer a janela
+        dias = pd.date_range(diario.index.min(), diario.index.max(), freq="D")
+        if self.ultima_data is not None:
+            dias = pd.date_range(self.ultima_data + pd.Timedelta(days=1), diario.index.max(), freq="D")
+        valores = diario.reindex(dias, fill_value=0).to_numpy(dtype=np.float32)
+
+        novas = []
+        for data, linha in zip(dias, valores):
+            if self.preenchidos >= self.min_historico:
+                historico = self.buffer[-min(self.preenchidos, self.janela):]
+                mediana = np.median(historico, axis=0)
+                mad = np.median(np.abs(historico - mediana), axis=0)
+                escala = np.maximum(1.4826 * mad, np.sqrt(np.maximum(mediana, 1.0)))
+                z = (linha - mediana) / escala
+                marcadas = np.flatnonzero((np.abs(z) >= self.limiar) & (linha >= self.minimo))
+                for s in marcadas:
+                    uf, status = self.series[s]
+                    novas.append((data, uf, status, int(linha[s]), float(mediana[s]), round(float(z[s]), 2)))
+            # Janela deslizante: descarta o dia mais antigo e acrescenta o atual
+            self.buffer = np.roll(self.buffer, -1, axis=0)
+            self.buffer[-1] = linha
+            self.preenchidos += 1
+        self.ultima_data = dias[-1]
+        self.historico = _hash_contagens(completo[completo.index <= self.ultima_data])
+
+        novas = pd.DataFrame(novas, columns=self.anomalias.columns)
+        if not novas.empty:
+            self.anomalias = pd.concat([self.anomalias, novas], ignore_index=True) if len(self.anomalias) else novas
+        return novas
+
+    # --- Persistência do estado ---
+    def salvar(self, diretorio=DIRETORIO_PADRAO):
+        meta = {
+            "series": self.series, "janela": self.janela, "limiar": self.limiar, "minimo": self.minimo,
+            "min_historico": self.min_historico, "preenchidos": self.preenchidos,
+            "ultima_data": None if self.ultima_data is None else self.ultima_data.strftime("%Y-%m-%d"),
+            "fonte": self.fonte, "historico": self.historico,
+        }
+
+        def escrever(pasta):
+            np.save(pasta / "buffer.npy", self.buffer)
+            self.anomalias.to_csv(pasta / "anomalias.csv", index=False)
+            (pasta / "estado.json").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+        publicar(diretorio, escrever)
+
+    @classmethod
+    def carregar(cls, diretorio=DIRETORIO_PADRAO):
+        pasta = pasta_atual(diretorio)
+        if pasta is None:
+            raise FileNotFoundError(Path(diretorio) / "ATUAL")
+        meta = json.loads((pasta / "estado.json").read_text(encoding="utf-8"))
+        detector = cls([tuple(s) for s in meta["series"]], meta["janela"], meta["limiar"], meta["minimo"], meta["min_historico"])
+        detector.buffer = np.load(pasta / "buffer.npy")
+        if detector.buffer.shape != (detector.janela, len(detector.series)):
+            raise FileNotFoundError(pasta / "buffer.npy")
+        detector.preenchidos = meta["preenchidos"]
+        detector.ultima_data = None if meta["ultima_data"] is None else pd.Timestamp(meta["ultima_data"])
+        detector.fonte, detector.historico = meta.get("fonte"), meta.get("historico")
+        anomalias = pd.read_csv(pasta / "anomalias.csv", parse_dates=["DATA"])
+        if not anomalias.empty:
+            detector.anomalias = anomalias
+        return detector
+
+
+def diario_por_serie(serie_temporal):
+    """Contagens diárias (índice = data, colunas = (UF, STATUS)) a partir do motor de séries temporais,
+    incluindo o total nacional como UF "Todos"."""
+    diario = np.diff(serie_temporal.acumulado, axis=0)
+    datas = pd.date_range(serie_temporal.inicio, periods=serie_temporal.n_dias, freq="D")
+    n_uf, n_status = len(serie_temporal.ufs), len(serie_temporal.status)
+    colunas = pd.MultiIndex.from_product([serie_temporal.ufs, serie_temporal.status])
+    df = pd.DataFrame(diario.reshape(len(datas), n_uf * n_status), index=datas, columns=colunas)
+    total = pd.DataFrame(diario.sum(axis=1), index=datas,
+                         columns=pd.MultiIndex.from_product([[UF_TODOS], serie_temporal.status]))
+    return pd.concat([df, total], axis=1)
+
+
+def atualizar_anomalias(serie_temporal, diretorio=DIRETORIO_PADRAO, fonte=None):
+    """Carrega o detector salvo, processa só os dias novos e salva o estado. Retorna a tabela de anomalias.
+
+    `fonte`: versão do CSV de origem (utils/manifesto.versao_arquivo). Se mudou desde a última
+    atualização e as contagens dos dias já processados não conferem, o detector recomeça do zero.
+    """
+    diario = diario_por_serie(serie_temporal)
+    series = list(diario.columns)
+    with _travado(diretorio):
+        try:
+            detector = DetectorAnomalias.carregar(diretorio)
+            # Séries novas (UF/status que não existiam) exigem recomeçar o histórico
+            if set(series) - set(detector.series):
+                raise FileNotFoundError
+            # CSV alterado: basta conferir os dias antigos quando só foram acrescentadas linhas novas
+            if detector.fonte != fonte and not detector.historico_confere(diario):
+                raise FileNotFoundError
+        except (FileNotFoundError, json.JSONDecodeError, ValueError, KeyError):
+            detector = DetectorAnomalias(series)
+        detector.fonte = fonte
+        detector.atualizar(diario)
+        detector.salvar(diretorio)
+    return detector.anomalias
@@ -0,0 +1,131 @@
+import argparse
+import logging
+import threading
+import time
+from pathlib import Path
+
+import streamlit as st
+
+from utils.agregados import METRICAS, PASTA_DATASETS, REGIOES
+from utils.classificacao import ESQUEMAS
+from utils import carregamento as cg
+from utils.empresas import listar_empresas
+
+# --- Aquecimento do cache para os estados de filtro mais comuns ---
+# Carrega a tabela e as geometrias e pré-calcula as visões padrão (período completo, cada estado e,
+# no mapa, cada ano) de cada empresa de utils/empresas.listar_empresas, para que a primeira sessão
+# não pague a carga a frio. Em seguida, a mesma thread
+# renova as entradas usadas antes que o período do cache vire (ver utils/carregamento.py).
+#
+#   python -m utils.aquecimento            # executa o aquecimento fora do servidor e mostra os tempos
+#   python -m utils.aquecimento --csv <csv>  # só uma empresa
+#
+# O aquecimento é só uma otimização: uma visão que falha é registrada no log (com o traceback) e as
+# demais seguem; a sessão que precisar dela carrega normalmente (e mostra o erro, se persistir).
+
+logger = logging.getLogger(__name__)
+
+
+def visoes_padrao(path=cg.PATH_RECLAMACOES):
+    """Gera (descrição, função) para cada visão padrão do app.py e do pages/mapa.py."""
+    df = cg.load_series_temporais(path)
+    yield "geometrias dos estados", lambda: cg.load_localidade_geodf(cg.PATH_ESTADOS)
+    for regiao in REGIOES:
+        arquivo = PASTA_DATASETS / f"gdf_municipios_{regiao}.csv"
+        if arquivo.exists():
+            yield f"geometrias ({regiao})", lambda arquivo=arquivo: cg.load_localidade_geodf(str(arquivo))
+
+    if df.empty:
+        return
+
+    yield "série temporal", lambda: cg.load_serie_temporal(path)
+    yield "índice de categorias", lambda: cg.load_indice_categorias(path)
+    yield "anomalias", lambda: cg.load_anomalias(path)
+    yield "tópicos", lambda: cg.load_topicos(path)
+    if Path(cg.PATH_ESTADOS).exists():
+        yield "denominadores por UF", lambda: cg.load_denominadores_uf(cg.PATH_ESTADOS)
+
+    # Mesma máscara de período completo da barra lateral (datas inválidas ficam de fora)
+    periodo = ((df['TEMPO'] >= df['TEMPO'].min()) & (df['TEMPO'] <= df['TEMPO'].max())).to_numpy()
+    yield "categorias (período completo)", lambda: cg.load_contagem_categorias(path, cg.compactar_mascara(periodo), None)
+    for estado in sorted(df['NOME_UF'].dropna().unique()):
+        mask = periodo & (df['NOME_UF'] == estado).to_numpy()
+        yield f"categorias ({estado})", lambda mask=mask: cg.load_contagem_categorias(path, cg.compactar_mascara(mask), None)
+
+    # Mapa: visão padrão de métrica e classificação, por ano (todos os estados) e por estado (todos os anos)
+    if not Path(cg.PATH_ESTADOS).exists():
+        return
+    coluna_metrica = next(iter(METRICAS.values()))
+    esquema = next(iter(ESQUEMAS.values()))
+    combinacoes = [(ano, 'Todos') for ano in ['Todos'] + sorted(df['ANO'].unique())]
+    combinacoes += [('Todos', estado) for estado in sorted(df['NOME_UF'].dropna().unique())
+                    if cg.arquivo_municipios(estado) is not None and cg.arquivo_municipios(estado).exists()]
+    for ano, estado in combinacoes:
+        yield f"mapa ({ano}, {estado})", lambda ano=ano, estado=estado: cg.load_faixas_mapa(
+            path, ano, estado, coluna_metrica, esquema)
+    for estado in ['Todos'] + [estado for _, estado in combinacoes if estado != 'Todos']:
+        geometria = cg.PATH_ESTADOS if estado == 'Todos' else str(cg.arquivo_municipios(estado))
+        yield f"topologia ({estado})", lambda geometria=geometria, estado=estado: cg.load_topologia(geometria, estado)
+
+
+def aquecer(path=cg.PATH_RECLAMACOES, relatar=None):
+    """Executa todas as visões padrão; devolve [(descrição, segundos)] das que deram certo."""
+    tempos = []
+    try:
+        for descricao, funcao in visoes_padrao(path):
+            inicio = time.perf_counter()
+            try:
+                funcao()
+            except Exception:
+                logger.exception("Falha ao aquecer a visão %r", descricao)
+                continue
+            tempos.append((descricao, time.perf_counter() - inicio))
+            if relatar is not None:
+                relatar(*tempos[-1])
+    except Exception:
+        # Falha ao montar a lista de visões (ex.: tabela de reclamações ilegível)
+        logger.exception("Falha ao listar as visões padrão de %s", path)
+    return tempos
+
+
+def empresas_aquecidas():
+    """CSVs de todas as empresas (a padrão, se nenhuma estiver cadastrada)."""
+    return list((listar_empresas() or {None: cg.PATH_RECLAMACOES}).values())
+
+
+def _aquecer_e_renovar(paths):
+    for path in paths:
+        aquecer(path)
+    while True:
+        proxima = cg.geracao_atual() + 1
+        time.sleep(max(0.0, proxima * cg.PERIODO_CACHE - cg.ANTECEDENCIA - time.time()))
+        try:
+            cg.renovar(proxima)
+        except Exception:
+            logger.exception("Falha ao renovar o cache para a geração %d", proxima)
+        time.sleep(max(0.0, proxima * cg.PERIODO_CACHE - time.time()))
+
+
+# cache_resource: uma única thread de aquecimento/renovação por processo do servidor
+@st.cache_resource(show_spinner=False)
+def iniciar_aquecimento():
+    thread = threading.Thread(target=_aquecer_e_renovar, args=(empresas_aquecidas(),), name="aquecimento-cache",
+                              daemon=True)
+    thread.start()
+    return thread
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Aquece o cache das visões padrão do dashboard.")
+    parser.add_argument("--csv", help="Aquece só esta empresa (padrão: todas)")
+    args = parser.parse_args()
+
+    inicio = time.perf_counter()
+    for path in [args.csv] if args.csv else empresas_aquecidas():
+        print(path)
+        aquecer(path, relatar=lambda descricao, segundos: print(f"{segundos * 1000:9.1f} ms  {descricao}"))
+    print(f"{(time.perf_counter() - inicio) * 1000:9.1f} ms  total")
+
+
+if __name__ == "__main__":
+    main()
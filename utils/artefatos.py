@@ -0,0 +1,57 @@
+import os
+import shutil
+import threading
+import uuid
+from pathlib import Path
+
+# --- Publicação atômica de artefatos em pasta (índice de busca, matriz de frases) ---
+# Os arrays desses artefatos são abertos com mmap por várias sessões (e réplicas) ao mesmo tempo:
+# regravar os arquivos no lugar pode derrubar um leitor (SIGBUS) ou entregar um índice pela metade.
+# Cada construção grava numa pasta temporária irmã, que é renomeada para uma subpasta versionada;
+# o arquivo ATUAL (trocado com os.replace) aponta para a versão em uso. Quem já abriu uma versão
+# continua lendo os arquivos dela; a versão anterior é mantida e as mais antigas são removidas.
+#
+#   <diretorio>/ATUAL              -> "v-<id>"
+#   <diretorio>/v-<id>/...         arquivos do artefato
+
+PONTEIRO = "ATUAL"
+VERSOES_MANTIDAS = 2
+
+
+def pasta_atual(diretorio):
+    """Subpasta da versão em uso (None se o artefato ainda não foi publicado)."""
+    diretorio = Path(diretorio)
+    try:
+        nome = (diretorio / PONTEIRO).read_text(encoding="utf-8").strip()
+    except OSError:
+        return None
+    pasta = diretorio / nome
+    return pasta if nome and pasta.is_dir() else None
+
+
+def publicar(diretorio, escrever):
+    """Grava o artefato via `escrever(pasta)` numa pasta nova e a torna a versão atual; devolve a pasta."""
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    temporaria = diretorio / f".tmp-{os.getpid()}-{threading.get_ident()}-{uuid.uuid4().hex[:8]}"
+    temporaria.mkdir()
+    try:
+        escrever(temporaria)
+        versao = diretorio / f"v-{uuid.uuid4().hex[:12]}"
+        os.replace(temporaria, versao)
+    except BaseException:
+        shutil.rmtree(temporaria, ignore_errors=True)
+        raise
+    ponteiro_tmp = diretorio / f".{PONTEIRO}.{os.getpid()}.{threading.get_ident()}.tmp"
+    ponteiro_tmp.write_text(versao.name, encoding="utf-8")
+    os.replace(ponteiro_tmp, diretorio / PONTEIRO)
+    _limpar(diretorio, versao)
+    return versao
+
+
+def _limpar(diretorio, atual):
+    # Mantém a versão atual e a anterior (leitores que ainda a usam); remove as demais, se possível
+    versoes = sorted((p for p in diretorio.glob("v-*") if p.is_dir() and p != atual),
+                     key=lambda p: p.stat().st_mtime, reverse=True)
+    for antiga in versoes[VERSOES_MANTIDAS - 1:]:
+        shutil.rmtree(antiga, ignore_errors=True)
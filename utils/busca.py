@@ -0,0 +1,155 @@
+import json
+import shlex
+from pathlib import Path
+
+import numpy as np
+
+from utils.artefatos import pasta_atual, publicar
+from utils.manifesto import versao_arquivo
+from utils.texto import Radicalizador
+
+# --- Índice invertido posicional em disco para busca nas descrições ---
+# Termos = radicais (Snowball, português) sem acentos. Estrutura em arrays .npy abertos com mmap:
+#   termo_ptr[t]:termo_ptr[t+1]  -> faixa de `docs` (linhas da tabela, ordenadas) do termo t
+#   pos_ptr[p]:pos_ptr[p+1]      -> faixa de `posicoes` (posição do token) da postagem p
+# Cada construção é publicada numa subpasta nova (utils/artefatos.py): sessões com o índice anterior
+# aberto via mmap não veem os arquivos mudarem.
+VERSAO_INDICE = 1
+ARRAYS = ("termo_ptr", "docs", "pos_ptr", "posicoes")
+
+
+def _assinatura_fonte(path):
+    # Versão do conteúdo (manifesto): tocar o CSV sem mudá-lo não refaz o artefato
+    return {"arquivo": str(path), "sha256": versao_arquivo(path)}
+
+
+class IndiceBusca:
+    """Índice invertido posicional; as consultas retornam arrays ordenados de números de linha."""
+
+    def __init__(self, diretorio):
+        """Abre a versão publicada em `diretorio` (a pasta de um artefato de utils/artefatos.publicar)."""
+        self.diretorio = Path(diretorio)
+        self.meta = json.loads((self.diretorio / "meta.json").read_text(encoding="utf-8"))
+        termos = json.loads((self.diretorio / "termos.json").read_text(encoding="utf-8"))
+        self.termos = {termo: i for i, termo in enumerate(termos)}
+        for nome in ARRAYS:
+            setattr(self, nome, np.load(self.diretorio / f"{nome}.npy", mmap_mode="r"))
+        self.n_docs = self.meta["n_docs"]
+        self._radical = Radicalizador()
+
+    # --- Construção ---
+    @staticmethod
+    def construir(textos, diretorio, fonte=None):
+        radical = Radicalizador()
+        vocabulario = {}
+        termo_ids, doc_ids, posicoes = [], [], []
+        n_docs = 0
+        for doc, texto in enumerate(textos):
+            n_docs += 1
+            ids = [vocabulario.setdefault(r, len(vocabulario)) for r in radical.radicais(texto)]
+            termo_ids.append(np.array(ids, dtype=np.int32))
+            doc_ids.append(np.full(len(ids), doc, dtype=np.int32))
+            posicoes.append(np.arange(len(ids), dtype=np.int32))
+
+        termo_ids = np.concatenate(termo_ids) if termo_ids else np.array([], dtype=np.int32)
+        doc_ids = np.concatenate(doc_ids) if doc_ids else np.array([], dtype=np.int32)
+        posicoes = np.concatenate(posicoes) if posicoes else np.array([], dtype=np.int32)
+
+        # Renumera os termos em ordem alfabética e ordena as ocorrências por (termo, doc, posição)
+        termos = sorted(vocabulario)
+        nova_ordem = np.empty(len(termos), dtype=np.int32)
+        nova_ordem[[vocabulario[t] for t in termos]] = np.arange(len(termos), dtype=np.int32)
+        termo_ids = nova_ordem[termo_ids] if len(termo_ids) else termo_ids
+        ordem = np.lexsort((posicoes, doc_ids, termo_ids))
+        termo_ids, doc_ids, posicoes = termo_ids[ordem], doc_ids[ordem], posicoes[ordem]
+
+        # Uma postagem por par (termo, doc)
+        nova_postagem = np.ones(len(termo_ids), dtype=bool)
+        nova_postagem[1:] = (termo_ids[1:] != termo_ids[:-1]) | (doc_ids[1:] != doc_ids[:-1])
+        inicio_postagem = np.flatnonzero(nova_postagem)
+        pos_ptr = np.append(inicio_postagem, len(posicoes)).astype(np.int64)
+        docs = doc_ids[inicio_postagem]
+        termo_postagem = termo_ids[inicio_postagem]
+        termo_ptr = np.searchsorted(termo_postagem, np.arange(len(termos) + 1)).astype(np.int64)
+
+        def escrever(pasta):
+            for nome, array in zip(ARRAYS, (termo_ptr, docs, pos_ptr, posicoes)):
+                np.save(pasta / f"{nome}.npy", array)
+            (pasta / "termos.json").write_text(json.dumps(termos, ensure_ascii=False), encoding="utf-8")
+            meta = {"versao": VERSAO_INDICE, "n_docs": n_docs, "fonte": fonte}
+            (pasta / "meta.json").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+        return IndiceBusca(publicar(diretorio, escrever))
+
+    @staticmethod
+    def abrir_ou_construir(path_csv, diretorio, carregar_textos):
+        """Abre o índice em disco; reconstrói se não existir ou se o CSV de origem mudou."""
+        fonte = _assinatura_fonte(path_csv)
+        pasta = pasta_atual(diretorio)
+        if pasta is not None:
+            meta = json.loads((pasta / "meta.json").read_text(encoding="utf-8"))
+            if meta.get("versao") == VERSAO_INDICE and meta.get("fonte") == fonte:
+                return IndiceBusca(pasta)
+        return IndiceBusca.construir(carregar_textos(), diretorio, fonte=fonte)
+
+    # --- Consultas ---
+    def _postagens(self, termo):
+        t = self.termos.get(termo)
+        if t is None:
+            return slice(0, 0)
+        return slice(int(self.termo_ptr[t]), int(self.termo_ptr[t + 1]))
+
+    def docs_termo(self, termo):
+        return np.asarray(self.docs[self._postagens(termo)])
+
+    def _ocorrencias(self, termo, candidatos):
+        """(doc, posição) das ocorrências do termo restritas às linhas `candidatos` (ordenadas)."""
+        faixa = self._postagens(termo)
+        docs_termo = np.asarray(self.docs[faixa])
+        postagens = faixa.start + np.searchsorted(docs_termo, candidatos)
+        inicios = np.asarray(self.pos_ptr[postagens], dtype=np.int64)
+        tamanhos = np.asarray(self.pos_ptr[postagens + 1], dtype=np.int64) - inicios
+        deslocamentos = np.arange(tamanhos.sum()) - np.repeat(np.cumsum(tamanhos) - tamanhos, tamanhos)
+        posicoes = np.asarray(self.posicoes[np.repeat(inicios, tamanhos) + deslocamentos], dtype=np.int64)
+        return np.repeat(candidatos.astype(np.int64), tamanhos), posicoes
+
+    def docs_frase(self, termos):
+        """Linhas em que os termos aparecem consecutivos, nessa ordem."""
+        candidatos = self.docs_termo(termos[0])
+        for termo in termos[1:]:
+            candidatos = np.intersect1d(candidatos, self.docs_termo(termo), assume_unique=True)
+        if len(termos) == 1 or not len(candidatos):
+            return candidatos
+
+        # Chave (doc, posição de início da frase) de cada termo; a frase existe onde todas coincidem
+        chaves = None
+        for deslocamento, termo in enumerate(termos):
+            docs, posicoes = self._ocorrencias(termo, candidatos)
+            chave = (docs << 32) + (posicoes - deslocamento)
+            chaves = np.unique(chave) if chaves is None else np.intersect1d(chaves, chave)
+            if not len(chaves):
+                break
+        return np.unique(chaves >> 32).astype(np.int32)
+
+    def buscar(self, consulta):
+        """Linhas que contêm todos os termos da consulta (E); trechos entre aspas são frases."""
+        try:
+            partes = shlex.split(consulta)
+        except ValueError:
+            partes = consulta.replace('"', " ").split()
+
+        resultado = None
+        for parte in partes:
+            termos = self._radical.radicais(parte)
+            if not termos:
+                continue
+            docs = self.docs_frase(termos)
+            resultado = docs if resultado is None else np.intersect1d(resultado, docs, assume_unique=True)
+        if resultado is None:
+            return np.arange(self.n_docs, dtype=np.int32)
+        return resultado
+
+    def mascara(self, consulta):
+        mascara = np.zeros(self.n_docs, dtype=bool)
+        mascara[self.buscar(consulta)] = True
+        return mascara
@@ -0,0 +1,124 @@
+import hashlib
+import pickle
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+# --- Camada de cache em disco, compartilhada entre processos ---
+# O st.cache_data vive na memória de cada processo: réplicas e reinícios recalculavam tudo.
+# Esta camada fica abaixo dele (ver utils/carregamento.py): resultados serializados com pickle em um
+# SQLite no modo WAL, com chave = hash(função, parâmetros, versão dos arquivos de origem).
+# O tamanho total é limitado e as entradas menos usadas recentemente são descartadas primeiro.
+
+DIRETORIO_PADRAO = Path(__file__).resolve().parent.parent / "datasets" / "cache"
+LIMITE_PADRAO = 1024 ** 3  # 1 GB
+ESPERA_BLOQUEIO = 30  # s aguardando outro processo liberar a escrita
+INTERVALO_ACESSO = 60  # s entre atualizações do instante de acesso de uma mesma entrada
+
+
+def chave_cache(nome, args, kwargs, versao):
+    """`versao`: versões dos arquivos de origem e do código (ver utils/manifesto.py)."""
+    h = hashlib.sha256(nome.encode())
+    h.update(pickle.dumps((args, kwargs, versao), protocol=pickle.HIGHEST_PROTOCOL))
+    return h.hexdigest()
+
+
+class CacheDisco:
+    """Armazenamento chave -> objeto em SQLite, seguro para vários processos e threads."""
+
+    def __init__(self, diretorio=DIRETORIO_PADRAO, limite_bytes=LIMITE_PADRAO):
+        self.path = Path(diretorio) / "cache.sqlite"
+        self.limite_bytes = limite_bytes
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self._conexao() as con:
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS entradas ("
+                " chave TEXT PRIMARY KEY, nome TEXT, valor BLOB, tamanho INTEGER, acesso REAL)"
+            )
+            con.execute("CREATE INDEX IF NOT EXISTS entradas_acesso ON entradas (acesso)")
+
+    def _conexao(self):
+        # Uma conexão por thread; WAL permite leituras concorrentes com uma escrita por vez
+        con = getattr(self._local, "con", None)
+        if con is None:
+            con = sqlite3.connect(self.path, timeout=ESPERA_BLOQUEIO, isolation_level=None)
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute("PRAGMA synchronous=NORMAL")
+            self._local.con = con
+        return con
+
+    def obter(self, chave):
+        """Devolve (True, valor) ou (False, None)."""
+        con = self._conexao()
+        linha = con.execute("SELECT valor, acesso FROM entradas WHERE chave = ?", (chave,)).fetchone()
+        if linha is None:
+            return False, None
+        agora = time.time()
+        if agora - linha[1] > INTERVALO_ACESSO:
+            con.execute("UPDATE entradas SET acesso = ? WHERE chave = ?", (agora, chave))
+        return True, pickle.loads(linha[0])
+
+    def gravar(self, chave, nome, valor):
+        dados = pickle.dumps(valor, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(dados) > self.limite_bytes:
+            return
+        con = self._conexao()
+        con.execute("BEGIN IMMEDIATE")
+        try:
+            con.execute(
+                "INSERT OR REPLACE INTO entradas (chave, nome, valor, tamanho, acesso) VALUES (?, ?, ?, ?, ?)",
+                (chave, nome, sqlite3.Binary(dados), len(dados), time.time()),
+            )
+            self._despejar(con)
+            con.execute("COMMIT")
+        except BaseException:
+            con.execute("ROLLBACK")
+            raise
+
+    def _despejar(self, con):
+        # LRU: remove as entradas de acesso mais antigo até caber no limite
+        total = con.execute("SELECT COALESCE(SUM(tamanho), 0) FROM entradas").fetchone()[0]
+        if total <= self.limite_bytes:
+            return
+        excesso = total - self.limite_bytes
+        removidas = []
+        for chave, tamanho in con.execute("SELECT chave, tamanho FROM entradas ORDER BY acesso"):
+            removidas.append((chave,))
+            excesso -= tamanho
+            if excesso <= 0:
+                break
+        con.executemany("DELETE FROM entradas WHERE chave = ?", removidas)
+
+    def remover(self, nome=None):
+        """Remove as entradas de uma função (ou todas)."""
+        con = self._conexao()
+        if nome is None:
+            con.execute("DELETE FROM entradas")
+        else:
+            con.execute("DELETE FROM entradas WHERE nome = ?", (nome,))
+
+    def resumo(self):
+        con = self._conexao()
+        return con.execute(
+            "SELECT nome, COUNT(*), SUM(tamanho) FROM entradas GROUP BY nome ORDER BY SUM(tamanho) DESC"
+        ).fetchall()
+
+
+_cache = None
+_trava_cache = threading.Lock()
+
+
+def cache_padrao():
+    """Instância única por processo (criada na primeira utilização)."""
+    global _cache
+    with _trava_cache:
+        if _cache is None:
+            _cache = CacheDisco()
+        return _cache
+
+
+if __name__ == "__main__":
+    for nome, n, tamanho in cache_padrao().resumo():
+        print(f"{nome:32s} {n:6d} entradas {tamanho / 1024 ** 2:10.2f} MB")
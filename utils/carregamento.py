@@ -0,0 +1,423 @@
+import functools
+import hashlib
+import inspect
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from utils.series_temporais import SerieTemporal
+from utils.esquema import ler_reclamacoes
+from utils.categorias import IndiceCategorias
+from utils.duplicatas import gravar_ids_canonicos, ler_ids_canonicos
+from utils.busca import IndiceBusca
+from utils.ngramas import MatrizFrases
+from utils.contraste import termos_distintivos
+from utils.topicos import carregar_topicos
+from utils.texto import carregar_stopwords, contar_termos
+from utils.anomalias import atualizar_anomalias
+from utils.snapshots import ler_snapshots, tempos_ate_evento, curvas_por_grupo, kaplan_meier, percentis
+from utils.agregados import (arquivo_municipios, ler_denominadores_uf, ler_denominadores_municipios,
+                             taxas_por_uf, taxas_por_municipio, taxas_de_contagem_uf, taxas_de_contagem_municipio)
+from utils.classificacao import classificar
+from utils.cache_disco import cache_padrao, chave_cache
+from utils.manifesto import versao_arquivo, versao_fontes, registrar_linhas
+from utils.empresas import nome_empresa, pasta_artefato, pasta_empresa, ler_agregados
+
+# --- Funções de carga em cache compartilhadas pelo app.py, pages/mapa.py e pelo aquecimento ---
+# Os caminhos abaixo fazem parte da chave do cache: use sempre as mesmas constantes.
+
+PATH_RECLAMACOES = './datasets/RECLAMEAQUI_CARREFUOR_CLS.csv'
+PATH_ESTADOS = './datasets/gdf_estados.csv'
+PATH_POPULACAO_UF = './datasets/populacao_uf.csv'
+PATH_POPULACAO_MUNICIPIOS = './datasets/populacao_municipios.csv'
+# O código das funções de análise também entra na chave do cache em disco
+PASTA_CODIGO = Path(__file__).resolve().parent
+# Backend das agregações do mapa: "pandas" (tabela em memória) ou "duckdb" (SQL sobre o Parquet da
+# empresa, utils/consultas.py), escolhido pela variável de ambiente DASH_BACKEND_AGREGADOS
+BACKEND_AGREGADOS = os.environ.get("DASH_BACKEND_AGREGADOS", "pandas")
+
+# --- Cache com renovação antecipada ---
+# A chave de cada entrada inclui a "geração" (janela de PERIODO_CACHE segundos). Antes da virada
+# da janela, a thread de utils/aquecimento.py recalcula para a geração seguinte as chamadas usadas
+# recentemente; quando a janela vira, as sessões já encontram as entradas novas prontas, em vez de
+# pagar a recarga após a expiração. As entradas antigas saem pelo ttl.
+PERIODO_CACHE = 3600
+ANTECEDENCIA = 300
+
+_FUNCOES = {}  # nome -> (função, fontes, disco)
+_CHAMADAS = {}  # (nome, args, kwargs) -> instante do último uso
+_trava = threading.Lock()
+_local = threading.local()
+logger = logging.getLogger(__name__)
+
+
+def geracao_atual():
+    forcada = getattr(_local, 'geracao', None)
+    return forcada if forcada is not None else int(time.time() // PERIODO_CACHE)
+
+
+def _fontes_padrao(*args, **kwargs):
+    # Por padrão, os arquivos de origem são os argumentos que apontam para arquivos existentes
+    return [a for a in list(args) + list(kwargs.values()) if isinstance(a, str) and os.path.isfile(a)]
+
+
+def _fontes_mapa(path, ano, estado, *args):
+    return [path, PATH_ESTADOS, PATH_POPULACAO_UF, arquivo_municipios(estado), PATH_POPULACAO_MUNICIPIOS]
+
+
+def _fontes_snapshots(path, *args):
+    return [path, pasta_empresa(path) / "snapshots"]
+
+
+@functools.lru_cache(maxsize=1)
+def _versao_codigo():
+    # Lida uma vez por processo: o código não muda sem reiniciar o servidor
+    h = hashlib.sha256()
+    for arquivo in sorted(PASTA_CODIGO.glob("*.py")):
+        h.update(arquivo.read_bytes())
+    return h.hexdigest()
+
+
+@st.cache_data(show_spinner=False, ttl=PERIODO_CACHE + 2 * ANTECEDENCIA)
+def _executar(nome, geracao, versao, args, kwargs):
+    func, fontes, disco = _FUNCOES[nome]
+    kwargs = dict(kwargs)
+    if not disco:
+        return func(*args, **kwargs)
+
+    # Camada em disco (utils/cache_disco.py): outro processo ou um reinício pode já ter calculado o valor
+    cache = cache_padrao()
+    chave = chave_cache(nome, args, kwargs, (versao, _versao_codigo()))
+    encontrado, valor = cache.obter(chave)
+    if not encontrado:
+        valor = func(*args, **kwargs)
+        cache.gravar(chave, nome, valor)
+    return valor
+
+
+def cache_renovavel(func=None, *, fontes=_fontes_padrao, disco=True):
+    """Substitui @st.cache_data(ttl=3600): mesma semântica, com renovação em segundo plano e camada em disco.
+
+    `fontes(*args)` lista os arquivos/pastas dos quais o resultado depende (a versão deles entra na chave);
+    `disco=False` mantém o resultado só na memória do processo.
+    """
+    if func is None:
+        return functools.partial(cache_renovavel, fontes=fontes, disco=disco)
+    assinatura = inspect.signature(func)
+    _FUNCOES[func.__name__] = (func, fontes, disco)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        # Argumentos normalizados (posicionais + padrões) para que chamadas equivalentes usem a mesma chave
+        ligacao = assinatura.bind(*args, **kwargs)
+        ligacao.apply_defaults()
+        chave = (func.__name__, ligacao.args, tuple(sorted(ligacao.kwargs.items())))
+        _registrar(chave)
+        return _chamar(chave[0], geracao_atual(), chave[1], chave[2])
+
+    return wrapper
+
+
+def _chamar(nome, geracao, args, kwargs):
+    # A versão das fontes (manifesto: um os.stat por arquivo) entra na chave: se um arquivo muda,
+    # só as entradas que dependem dele deixam de ser encontradas e são recalculadas
+    fontes = _FUNCOES[nome][1]
+    return _executar(nome, geracao, versao_fontes(fontes(*args, **dict(kwargs))), args, kwargs)
+
+
+def compactar_mascara(mask):
+    """Máscara booleana -> bytes (np.packbits): chave de cache hasheável, renovável como as demais."""
+    return np.packbits(np.asarray(mask, dtype=bool)).tobytes()
+
+
+def expandir_mascara(bits, n):
+    """Inverso de compactar_mascara para uma tabela de `n` linhas."""
+    return np.unpackbits(np.frombuffer(bits, dtype=np.uint8), count=n).astype(bool)
+
+
+def _registrar(chave):
+    try:
+        hash(chave)
+    except TypeError:
+        # Argumentos não hasheáveis (ex.: arrays) não são renovados: máscaras vão como bytes (compactar_mascara)
+        logger.debug("Chamada sem renovação (argumentos não hasheáveis): %s", chave[0])
+        return
+    with _trava:
+        _CHAMADAS[chave] = time.time()
+
+
+def renovar(geracao):
+    """Recalcula para `geracao` as chamadas feitas no último período; devolve quantas foram renovadas.
+
+    Uma chamada que falha é registrada no log e as demais seguem.
+    """
+    limite = time.time() - PERIODO_CACHE
+    with _trava:
+        for chave in [c for c, instante in _CHAMADAS.items() if instante < limite]:
+            del _CHAMADAS[chave]
+        chamadas = list(_CHAMADAS)
+
+    # Chamadas aninhadas (ex.: load_series_temporais dentro de load_serie_temporal) usam a mesma geração
+    _local.geracao = geracao
+    renovadas = 0
+    try:
+        for nome, args, kwargs in chamadas:
+            try:
+                _chamar(nome, geracao, args, kwargs)
+                renovadas += 1
+            except Exception:
+                # Uma entrada com erro não impede a renovação das demais
+                logger.exception("Falha ao renovar %s%r", nome, args)
+    finally:
+        _local.geracao = None
+    return renovadas
+
+
+# --- Carregar o GeoDataFrame das localidades ---
+@cache_renovavel
+def load_localidade_geodf(path):
+    import geopandas as gpd
+    from shapely import wkt
+
+    df = pd.read_csv(path, sep=',')  # ajuste o separador se necessário
+
+    if 'POLYGON' not in df.columns:
+        raise ValueError(f"Coluna 'POLYGON' não encontrada em {path}. Colunas disponíveis: {df.columns.tolist()}")
+
+    # Converte string WKT -> objetos shapely (Polygon ou MultiPolygon); geometrias inválidas ficam vazias
+    def to_geom(s):
+        try:
+            return wkt.loads(s)
+        except Exception as e:
+            logger.warning("Erro convertendo '%s...' em %s: %s", str(s)[:50], path, e)
+            return None
+
+    df['geometry'] = df['POLYGON'].apply(to_geom)
+
+    gdf = gpd.GeoDataFrame(df, geometry='geometry', crs="EPSG:4326")
+    registrar_linhas(path, len(gdf))
+    return gdf
+
+# --- Função para carregar séries temporais ---
+# Erros são registrados no log e propagados (exceções não entram no cache em memória nem em disco);
+# a mensagem ao usuário fica com a página, já que o aquecimento roda fora de uma sessão do Streamlit.
+@cache_renovavel
+def load_series_temporais(path):
+    try:
+        # Otimização: tipos reduzidos e categorias aplicados já na leitura (ver utils/esquema.py)
+        df = ler_reclamacoes(path)
+    except Exception:
+        logger.exception("Falha ao carregar o arquivo de reclamações %s", path)
+        raise
+    registrar_linhas(path, len(df))
+    return df
+
+# --- Índice hierárquico de categorias (CATEGORIA separada uma única vez na carga) ---
+@cache_renovavel
+def load_indice_categorias(path):
+    return IndiceCategorias(load_series_temporais(path))
+
+# --- Motor de séries temporais (contagens diárias acumuladas por UF e status) ---
+@cache_renovavel
+def load_serie_temporal(path, categorias=(), consulta=""):
+    df = load_series_temporais(path)
+    mask = np.ones(len(df), dtype=bool)
+    if categorias:
+        mask &= load_indice_categorias(path).mascara(categorias)
+    if consulta:
+        mask &= load_indice_busca(path).mascara(consulta)
+    return SerieTemporal(df.loc[mask])
+
+# --- ID canônico de cada reclamação (quase duplicatas agrupadas por MinHash/LSH) ---
+# Lido do arquivo gravado na preparação da empresa; se ainda não existe (ou o CSV mudou), o primeiro
+# processo calcula e grava, e os demais passam a ler
+@cache_renovavel
+def load_ids_canonicos(path):
+    df = load_series_temporais(path)
+    canonicos = ler_ids_canonicos(path)
+    if canonicos is None or len(canonicos) != len(df):
+        return gravar_ids_canonicos(path, df)
+    return pd.Series(canonicos.to_numpy(), index=df.index, name='ID_CANONICO')
+
+# --- Anomalias diárias por (UF, STATUS): o detector salvo processa apenas os dias novos ---
+# (e refaz o histórico se a versão do CSV mudou e os dias antigos não conferem)
+@cache_renovavel
+def load_anomalias(path):
+    return atualizar_anomalias(load_serie_temporal(path), pasta_empresa(path) / "anomalias", versao_arquivo(path))
+
+# --- Tempos até resposta/resolução derivados do histórico de coletas (datasets/snapshots) ---
+@cache_renovavel(fontes=_fontes_snapshots)
+def load_tempos_evento(path, evento):
+    log = ler_snapshots(pasta_empresa(path) / "snapshots")
+    if log.empty:
+        return None
+    return tempos_ate_evento(log, load_series_temporais(path), evento)
+
+@cache_renovavel(fontes=_fontes_snapshots)
+def load_curvas_sobrevivencia(path, evento, coluna, estado):
+    tempos = load_tempos_evento(path, evento)
+    if estado != 'Todos':
+        tempos = tempos[tempos['NOME_UF'] == estado]
+    geral = percentis(kaplan_meier(tempos['DIAS'], tempos['EVENTO']))
+    curvas, resumo = curvas_por_grupo(tempos, coluna)
+    return geral, curvas, resumo
+
+# --- Índice invertido das descrições (em disco, reconstruído quando o CSV muda) ---
+def load_indice_busca(path):
+    return _abrir_indice_busca(path, versao_arquivo(path))
+
+# cache_resource: o índice é aberto via mmap e compartilhado entre as sessões, sem cópia;
+# a versão do CSV na chave faz o índice ser reaberto (e reconstruído) quando o arquivo muda
+@st.cache_resource(show_spinner="Preparando o índice de busca...", max_entries=2)
+def _abrir_indice_busca(path, versao):
+    return IndiceBusca.abrir_ou_construir(
+        path,
+        pasta_artefato(path, "indice_busca"),
+        lambda: load_series_temporais(path)['DESCRICAO'].tolist()
+    )
+
+@cache_renovavel
+def load_resultado_busca(path, consulta):
+    return load_indice_busca(path).buscar(consulta)
+
+# --- Frases (bigramas/trigramas) por reclamação, em matriz esparsa no disco (reconstruída quando o CSV muda) ---
+def load_matriz_frases(path):
+    return _abrir_matriz_frases(path, versao_arquivo(path))
+
+@st.cache_resource(show_spinner="Extraindo as frases das descrições...", max_entries=2)
+def _abrir_matriz_frases(path, versao):
+    return MatrizFrases.abrir_ou_construir(
+        path,
+        pasta_artefato(path, "ngramas"),
+        lambda: load_series_temporais(path)['DESCRICAO'].tolist()
+    )
+
+# --- Frases principais para a máscara de filtros (soma esparsa das linhas da máscara) ---
+@cache_renovavel
+def load_frases(path, mask_bits, n=50):
+    matriz = load_matriz_frases(path)
+    return matriz.principais(expandir_mascara(mask_bits, matriz.n_docs), n=n)
+
+# --- Termos que distinguem dois grupos de reclamações (log-odds sobre a matriz de termos em cache) ---
+@cache_renovavel
+def load_contraste(path, bits_a, bits_b, n=15):
+    matriz = load_matriz_frases(path)
+    grupo_a = expandir_mascara(bits_a, matriz.n_docs)
+    grupo_b = expandir_mascara(bits_b, matriz.n_docs)
+    # Prior: frequência de cada termo no corpus inteiro
+    fundo = matriz.contagem_termos(np.ones(matriz.n_docs, dtype=bool))
+    return termos_distintivos(matriz.termos, matriz.contagem_termos(grupo_a), matriz.contagem_termos(grupo_b),
+                              fundo, n=n)
+
+# --- Tabelas de denominadores (área e população), sem geometria ---
+@cache_renovavel(fontes=lambda path: [path, PATH_POPULACAO_UF])
+def load_denominadores_uf(path):
+    return ler_denominadores_uf(path)
+
+@cache_renovavel(fontes=lambda path: [path, PATH_POPULACAO_MUNICIPIOS])
+def load_denominadores_municipios(path):
+    return ler_denominadores_municipios([path])
+
+# --- Tópicos atribuídos offline (python -m utils.topicos ajustar <csv>, gravados em <pasta da empresa>/topicos) ---
+@cache_renovavel(fontes=lambda path: [pasta_empresa(path) / "topicos"])
+def load_topicos(path):
+    return carregar_topicos(pasta_empresa(path) / "topicos")
+
+# --- Contagem por categoria para a máscara de filtros (compactada em bytes para a chave do cache) ---
+@cache_renovavel
+def load_contagem_categorias(path, mask_bits, nivel):
+    indice = load_indice_categorias(path)
+    mask = expandir_mascara(mask_bits, indice.n_linhas)
+    return indice.contagem(mask, nivel=nivel)
+
+# --- Frequências da WordCloud para a máscara de filtros (mesma tokenização e stopwords da nuvem) ---
+@cache_renovavel
+def load_frequencias_wordcloud(path, mask_bits):
+    df = load_series_temporais(path)
+    mask = expandir_mascara(mask_bits, len(df))
+    return contar_termos(df.loc[mask, 'DESCRICAO'].dropna().astype(str), carregar_stopwords(nome_empresa(path)))
+
+# --- Agregados pré-calculados de uma empresa (comparação entre empresas sem carregar as tabelas) ---
+@cache_renovavel
+def load_agregados_empresa(path):
+    return ler_agregados(path, lambda: load_series_temporais(path))
+
+# --- Consultas DuckDB sobre o Parquet da empresa (reconvertido quando a versão do CSV muda) ---
+@st.cache_resource(show_spinner="Convertendo as reclamações para Parquet...", max_entries=4)
+def load_consultas(path, versao):
+    from utils.consultas import abrir_parquet
+
+    return abrir_parquet(path)
+
+# --- Agregados (contagens e taxas) do mapa por ano e estado ---
+@cache_renovavel(fontes=_fontes_mapa)
+def load_agregado_mapa(path, ano, estado):
+    if BACKEND_AGREGADOS == 'duckdb':
+        consultas = load_consultas(path, versao_arquivo(path))
+        filtros = {} if ano == 'Todos' else {'ano': ano}
+        if estado == 'Todos':
+            contagem = consultas.por_uf(**filtros).dropna(subset=['NOME_UF'])
+            return taxas_de_contagem_uf(contagem, load_denominadores_uf(PATH_ESTADOS))
+        contagem = consultas.por_municipio(estado=estado, **filtros).dropna(subset=['MUNICIPIO'])
+        return taxas_de_contagem_municipio(contagem[['MUNICIPIO', 'Qtd_Reclamacoes']], estado,
+                                           load_denominadores_municipios(str(arquivo_municipios(estado))))
+    df = load_series_temporais(path)
+    df = df if ano == 'Todos' else df[df['ANO'] == ano]
+    if estado == 'Todos':
+        return taxas_por_uf(df, load_denominadores_uf(PATH_ESTADOS))
+    return taxas_por_municipio(df, estado, load_denominadores_municipios(str(arquivo_municipios(estado))))
+
+# --- Faixas de cor do mapa, memorizadas por (ano, estado, métrica, esquema) ---
+@cache_renovavel(fontes=_fontes_mapa)
+def load_faixas_mapa(path, ano, estado, coluna_metrica, esquema):
+    agregado = load_agregado_mapa(path, ano, estado)
+    valores = agregado.loc[agregado['Qtd_Reclamacoes'] > 0, coluna_metrica]
+    return classificar(valores, esquema=esquema, k=6)
+
+# --- Matriz de vizinhança dos municípios de um estado (montada uma vez por estado) ---
+@cache_renovavel
+def load_pesos_contiguidade(path, estado):
+    from utils.hotspots import pesos_contiguidade
+
+    gdf = load_localidade_geodf(path)
+    gdf = gdf[gdf['NM_UF'] == estado].reset_index(drop=True)
+    return gdf['NM_MUN'].tolist(), pesos_contiguidade(gdf)
+
+# --- Geometria do mapa em TopoJSON (arcos compartilhados, coordenadas quantizadas), uma vez por estado ---
+@cache_renovavel
+def load_topologia(path, estado):
+    from utils.topologia import topologia
+
+    gdf = load_localidade_geodf(path)
+    if estado != 'Todos':
+        gdf = gdf[gdf['NM_UF'] == estado]
+    return topologia(gdf, 'localidades')
+
+# --- A mesma geometria como GeoJSON (id = nome da UF ou do município), para o modo Plotly do mapa ---
+@cache_renovavel
+def load_geojson_mapa(path, estado):
+    from utils.topologia import para_geojson
+
+    gdf = load_localidade_geodf(path)
+    if estado != 'Todos':
+        gdf = gdf[gdf['NM_UF'] == estado]
+    ids = gdf['NM_UF' if estado == 'Todos' else 'NM_MUN'].tolist()
+    return para_geojson(load_topologia(path, estado), 'localidades', ids)
+
+# --- Hot spots (Gi*) e clusters (LISA) por ano, estado e métrica ---
+@cache_renovavel(fontes=_fontes_mapa)
+def load_hotspots(path, ano, estado, coluna_metrica):
+    from utils.hotspots import estatisticas_locais
+
+    municipios, pesos = load_pesos_contiguidade(str(arquivo_municipios(estado)), estado)
+    agregado = load_agregado_mapa(path, ano, estado).set_index('MUNICIPIO')
+    valores = agregado[coluna_metrica].reindex(municipios).fillna(0).to_numpy()
+    resultado = estatisticas_locais(valores, pesos)
+    resultado.insert(0, 'NM_MUN', municipios)
+    return resultado
@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+from utils.esquema import codificar_categoria
+
+# --- Índice hierárquico de categorias ---
+# CATEGORIA guarda rótulos concatenados por "<->" ("Mau Atendimento<->Carrefour - Loja Física<->...").
+# Os rótulos são separados uma única vez (por valor distinto do dicionário da coluna) e viram
+# um índice muitos-para-muitos com códigos inteiros: reclamação -> ids de categoria (CSR),
+# mais um bitmap compactado por categoria para interseção rápida com as máscaras de filtro.
+SEPARADOR = "<->"
+
+
+class IndiceCategorias:
+    """Índice muitos-para-muitos linha -> categorias, com árvore pai -> filho.
+
+    - `nomes[id]`: nome da categoria; `nivel[id]`: menor posição em que aparece no caminho (0 = raiz)
+    - `indptr`/`indices`: CSR com os ids de categoria de cada linha da tabela
+    - `bitmaps[id]`: linhas que contêm a categoria, compactadas com np.packbits
+    - `arvore`: arestas (PAI, FILHO, QTD) formadas por rótulos consecutivos do caminho
+    """
+
+    def __init__(self, df, coluna="CATEGORIA"):
+        self.n_linhas = len(df)
+        codigos, dicionario = codificar_categoria(df, coluna)
+
+        # 1) Separar cada valor distinto do dicionário (e não cada linha)
+        caminhos = [[p.strip() for p in str(rotulo).split(SEPARADOR) if p.strip()] for rotulo in dicionario]
+        nomes = sorted({p for caminho in caminhos for p in caminho})
+        ids = {nome: i for i, nome in enumerate(nomes)}
+        self.nomes = np.array(nomes, dtype=object)
+
+        nivel = np.full(len(nomes), np.iinfo(np.int16).max, dtype=np.int16)
+        ptr_rotulo = np.zeros(len(caminhos) + 1, dtype=np.int64)
+        ids_rotulo = []
+        for r, caminho in enumerate(caminhos):
+            cids = list(dict.fromkeys(ids[p] for p in caminho))
+            ids_rotulo.extend(cids)
+            ptr_rotulo[r + 1] = ptr_rotulo[r] + len(cids)
+            for pos, c in enumerate(cids):
+                nivel[c] = min(nivel[c], pos)
+        ids_rotulo = np.array(ids_rotulo, dtype=np.int32)
+        self.nivel = nivel
+
+        # 2) Expandir para as linhas via códigos do dicionário (vetorizado)
+        validos = codigos >= 0
+        tamanhos = np.where(validos, np.diff(ptr_rotulo)[np.where(validos, codigos, 0)], 0)
+        self.indptr = np.zeros(self.n_linhas + 1, dtype=np.int64)
+        np.cumsum(tamanhos, out=self.indptr[1:])
+        inicio_rotulo = np.repeat(ptr_rotulo[np.where(validos, codigos, 0)], tamanhos)
+        deslocamento = np.arange(self.indptr[-1]) - np.repeat(self.indptr[:-1], tamanhos)
+        self.indices = ids_rotulo[inicio_rotulo + deslocamento]
+
+        # 3) Bitmaps por categoria (mesma ordem de bits de np.packbits), sem matriz densa intermediária
+        linhas = np.repeat(np.arange(self.n_linhas), tamanhos)
+        self.bitmaps = np.zeros((len(nomes), (self.n_linhas + 7) // 8), dtype=np.uint8)
+        np.bitwise_or.at(self.bitmaps, (self.indices, linhas >> 3), (128 >> (linhas & 7)).astype(np.uint8))
+
+        # Arestas ponderadas pelo número de linhas em que aparecem
+        freq_rotulo = np.bincount(codigos[validos], minlength=len(caminhos))
+        contagem_arestas = {}
+        for r, caminho in enumerate(caminhos):
+            cids = list(dict.fromkeys(ids[p] for p in caminho))
+            for aresta in zip(cids, cids[1:]):
+                contagem_arestas[aresta] = contagem_arestas.get(aresta, 0) + int(freq_rotulo[r])
+        self.arvore = pd.DataFrame(
+            [(self.nomes[p], self.nomes[f], q) for (p, f), q in contagem_arestas.items()],
+            columns=["PAI", "FILHO", "QTD"],
+        ).sort_values("QTD", ascending=False, ignore_index=True)
+
+        self.frequencia = np.bincount(self.indices, minlength=len(nomes))
+
+    # --- Consultas ---
+    def ids(self, nomes):
+        posicoes = {nome: i for i, nome in enumerate(self.nomes)}
+        return [posicoes[n] for n in nomes if n in posicoes]
+
+    def opcoes(self):
+        """Nomes das categorias ordenados pela frequência (mais comuns primeiro)."""
+        return self.nomes[np.argsort(-self.frequencia, kind="stable")].tolist()
+
+    def filhos(self, nome):
+        return self.arvore.loc[self.arvore["PAI"] == nome, ["FILHO", "QTD"]]
+
+    def bitmap(self, nomes):
+        """União (OU) dos bitmaps das categorias, ainda compactada."""
+        ids = self.ids(nomes)
+        if not ids:
+            return np.zeros(self.bitmaps.shape[1], dtype=np.uint8)
+        return np.bitwise_or.reduce(self.bitmaps[ids], axis=0)
+
+    def mascara(self, nomes, mascara=None):
+        """Máscara booleana das linhas com alguma das categorias, intersectada com `mascara`."""
+        bits = self.bitmap(nomes)
+        if mascara is not None:
+            bits &= np.packbits(np.asarray(mascara, dtype=bool))
+        return np.unpackbits(bits, count=self.n_linhas).astype(bool)
+
+    def contagem(self, mascara=None, nivel=None):
+        """Nº de reclamações por categoria entre as linhas da máscara."""
+        if mascara is None:
+            contagem = self.frequencia
+        else:
+            selecionadas = np.repeat(np.asarray(mascara, dtype=bool), np.diff(self.indptr))
+            contagem = np.bincount(self.indices[selecionadas], minlength=len(self.nomes))
+        df = pd.DataFrame({"CATEGORIA": self.nomes, "NIVEL": self.nivel, "Qtd_Reclamacoes": contagem})
+        if nivel is not None:
+            df = df[df["NIVEL"] == nivel]
+        df = df[df["Qtd_Reclamacoes"] > 0]
+        return df.sort_values("Qtd_Reclamacoes", ascending=False, ignore_index=True)
@@ -0,0 +1,88 @@
+import numpy as np
+
+# --- Classificação de valores em faixas para mapas coropléticos ---
+# Retorna limites crescentes [mínimo, ..., máximo] que cobrem todos os valores, como o
+# parâmetro `bins` do folium.Choropleth espera, para qualquer volume de dados.
+
+ESQUEMAS = {
+    "Quantis": "quantis",
+    "Quebras naturais (Jenks)": "jenks",
+    "Logarítmica": "log",
+}
+
+MINIMO_LIMITES = 4
+
+
+def _valores_validos(valores):
+    valores = np.asarray(valores, dtype=float)
+    return valores[np.isfinite(valores)]
+
+
+def quebras_quantis(valores, k):
+    return np.quantile(valores, np.linspace(0, 1, k + 1))
+
+
+def quebras_log(valores, k):
+    positivos = valores[valores > 0]
+    if not len(positivos):
+        return np.linspace(valores.min(), valores.max(), k + 1)
+    limites = np.geomspace(positivos.min(), valores.max(), k + 1)
+    limites[0] = valores.min()
+    return limites
+
+
+def quebras_jenks(valores, k):
+    """Quebras naturais de Fisher-Jenks (ótimas), sobre os valores distintos ponderados pela frequência.
+
+    Programação dinâmica O(k · n²) com o laço interno vetorizado por somas de prefixo.
+    """
+    distintos, pesos = np.unique(valores, return_counts=True)
+    n = len(distintos)
+    k = min(k, n)
+    if k <= 1:
+        return np.array([distintos[0], distintos[-1]])
+
+    w = np.concatenate([[0], np.cumsum(pesos)])
+    s = np.concatenate([[0], np.cumsum(pesos * distintos)])
+    s2 = np.concatenate([[0], np.cumsum(pesos * distintos ** 2)])
+
+    def custo(inicio, fim):
+        # Soma dos desvios quadráticos dos valores distintos[inicio:fim] (vetorizado em `inicio`)
+        soma, peso = s[fim] - s[inicio], w[fim] - w[inicio]
+        return (s2[fim] - s2[inicio]) - soma ** 2 / peso
+
+    # erro[j, i]: menor custo para dividir distintos[:i] em j + 1 classes
+    erro = np.full((k, n + 1), np.inf)
+    origem = np.zeros((k, n + 1), dtype=np.int64)
+    fins = np.arange(1, n + 1)
+    erro[0, 1:] = custo(np.zeros(n, dtype=np.int64), fins)
+    for j in range(1, k):
+        for i in range(j + 1, n + 1):
+            inicios = np.arange(j, i)
+            total = erro[j - 1, inicios] + custo(inicios, i)
+            melhor = int(np.argmin(total))
+            erro[j, i], origem[j, i] = total[melhor], inicios[melhor]
+
+    cortes, i = [], n
+    for j in range(k - 1, 0, -1):
+        i = origem[j, i]
+        cortes.append(distintos[i - 1])
+    return np.array([distintos[0]] + cortes[::-1] + [distintos[-1]])
+
+
+def classificar(valores, esquema="quantis", k=6):
+    """Limites das faixas (lista crescente, sem repetições) para os valores informados.
+
+    Valores ausentes são ignorados. Os limites sempre contêm o mínimo e o máximo dos dados
+    e são ao menos quatro (três cores, o mínimo de uma paleta ColorBrewer no folium).
+    """
+    valores = _valores_validos(valores)
+    if not len(valores):
+        return np.linspace(0, 1, MINIMO_LIMITES).tolist()
+
+    funcoes = {"quantis": quebras_quantis, "jenks": quebras_jenks, "log": quebras_log}
+    limites = np.unique(funcoes[esquema](valores, k))
+    limites[0], limites[-1] = min(limites[0], valores.min()), max(limites[-1], valores.max())
+    if len(limites) < MINIMO_LIMITES:
+        limites = np.linspace(limites[0], max(limites[-1], limites[0] + 1), MINIMO_LIMITES)
+    return limites.tolist()
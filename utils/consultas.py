@@ -0,0 +1,218 @@
+import argparse
+import json
+import threading
+from pathlib import Path
+
+import pandas as pd
+
+from utils.artefatos import pasta_atual, publicar
+from utils.empresas import pasta_artefato
+from utils.esquema import ESQUEMA_RECLAMACOES
+from utils.manifesto import versao_arquivo
+
+# --- Backend DuckDB (opcional) para filtros e agregações ---
+# As agregações do dashboard (contagens por status, série diária, UF/município, tamanho dos textos)
+# viram SQL executado pelo DuckDB embarcado direto sobre arquivos Parquet particionados por ANO:
+# só as colunas usadas são lidas (projeção) e os filtros de período/estado/status são empurrados
+# para a leitura (predicados e poda de partições), sem carregar a tabela inteira em memória.
+# O Parquet de cada CSV fica em <pasta da empresa>/parquet/<nome do CSV>/, publicado numa versão nova
+# a cada conversão (utils/artefatos.py: nada de partições antigas misturadas às novas) junto com a
+# versão do CSV no manifesto; abrir_parquet reconverte quando o CSV mudou.
+#
+#   python -m utils.consultas converter ./datasets/RECLAMEAQUI_CARREFUOR_CLS.csv   # -> datasets/parquet/<CSV>/
+#   python -m benchmarks.bench_consultas                                          # pandas vs. DuckDB
+
+# Tipos DuckDB equivalentes ao esquema pandas (utils/esquema.py)
+TIPOS_DUCKDB = {
+    "uint32": "UINTEGER", "uint16": "USMALLINT", "uint8": "UTINYINT",
+    "category": "VARCHAR", "string": "VARCHAR",
+}
+
+
+def _duckdb():
+    try:
+        import duckdb
+    except ImportError as e:
+        raise ImportError("O backend DuckDB é opcional: instale com `pip install duckdb`.") from e
+    return duckdb
+
+
+def _literal(path):
+    # Caminhos entram como literal SQL (COPY/VIEW não aceitam parâmetros preparados)
+    return "'" + Path(path).as_posix().replace("'", "''") + "'"
+
+
+def pasta_parquet(path_csv):
+    """Pasta (com as versões publicadas) do Parquet de um CSV de reclamações."""
+    return pasta_artefato(path_csv, "parquet")
+
+
+def converter_para_parquet(path_csv, destino=None):
+    """Converte o CSV de reclamações em Parquet particionado por ANO (sem passar pelo pandas).
+
+    Cada conversão vai para uma pasta vazia publicada de uma vez; devolve a pasta da versão nova.
+    """
+    duckdb = _duckdb()
+    colunas = []
+    for coluna, tipo in ESQUEMA_RECLAMACOES.items():
+        if coluna == "TEMPO":
+            colunas.append("CAST(TRY_STRPTIME(TEMPO, '%d-%m-%Y') AS DATE) AS TEMPO")
+        else:
+            colunas.append(f"TRY_CAST({coluna} AS {TIPOS_DUCKDB[tipo]}) AS {coluna}")
+    fonte = {"arquivo": str(path_csv), "sha256": versao_arquivo(path_csv)}
+
+    def escrever(pasta):
+        con = duckdb.connect()
+        try:
+            con.execute(
+                f"COPY (SELECT {', '.join(colunas)} FROM read_csv(?, header = true, all_varchar = true)) "
+                f"TO {_literal(pasta)} (FORMAT parquet, PARTITION_BY (ANO))",
+                [str(path_csv)],
+            )
+        finally:
+            con.close()
+        (pasta / "fonte.json").write_text(json.dumps(fonte, ensure_ascii=False), encoding="utf-8")
+
+    return publicar(destino or pasta_parquet(path_csv), escrever)
+
+
+def parquet_atualizado(path_csv, destino=None):
+    """Pasta da versão publicada se ela foi convertida da versão atual do CSV (manifesto); senão None."""
+    pasta = pasta_atual(destino or pasta_parquet(path_csv))
+    if pasta is None:
+        return None
+    try:
+        fonte = json.loads((pasta / "fonte.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    return pasta if fonte.get("sha256") == versao_arquivo(path_csv) else None
+
+
+def abrir_parquet(path_csv, destino=None):
+    """ConsultasDuckDB sobre o Parquet do CSV, reconvertido antes se o CSV mudou desde a conversão."""
+    pasta = parquet_atualizado(path_csv, destino) or converter_para_parquet(path_csv, destino)
+    return ConsultasDuckDB(pasta)
+
+
+class ConsultasDuckDB:
+    """Consultas do dashboard sobre o Parquet particionado; os resultados saem como DataFrames pequenos."""
+
+    def __init__(self, fonte):
+        """`fonte`: pasta com partições ANO=... ou a pasta de um Parquet publicado (versão atual)."""
+        duckdb = _duckdb()
+        self.fonte = pasta_atual(fonte) or Path(fonte)
+        self._con = duckdb.connect()
+        self._con.execute(
+            f"CREATE VIEW reclamacoes AS SELECT * FROM read_parquet({_literal(self.fonte / '**' / '*.parquet')}, "
+            "hive_partitioning = true)"
+        )
+        self._local = threading.local()
+
+    def _cursor(self):
+        # Conexões DuckDB não são compartilháveis entre threads: um cursor por thread
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            cursor = self._local.cursor = self._con.cursor()
+        return cursor
+
+    def consultar(self, sql, parametros=()):
+        return self._cursor().execute(sql, list(parametros)).df()
+
+    @staticmethod
+    def filtro(inicio=None, fim=None, estado="Todos", status=(), ano=None):
+        """Cláusula WHERE (com parâmetros) equivalente à máscara da barra lateral do app.py
+        (e ao seletor de ano do pages/mapa.py)."""
+        condicoes, parametros = ["TRUE"], []
+        if ano is not None:
+            condicoes.append("ANO = ?")
+            parametros.append(int(ano))
+        if inicio is not None:
+            # ANO também é filtrado para que o DuckDB descarte partições inteiras
+            inicio = pd.Timestamp(inicio)
+            condicoes += ["ANO >= ?", "TEMPO >= ?"]
+            parametros += [inicio.year, inicio.date()]
+        if fim is not None:
+            fim = pd.Timestamp(fim)
+            condicoes += ["ANO <= ?", "TEMPO <= ?"]
+            parametros += [fim.year, fim.date()]
+        if estado != "Todos":
+            condicoes.append("NOME_UF = ?")
+            parametros.append(estado)
+        if status:
+            condicoes.append(f"STATUS IN ({', '.join('?' * len(status))})")
+            parametros += list(status)
+        return " AND ".join(condicoes), parametros
+
+    def anos(self):
+        return self.valores("ANO")
+
+    def valores(self, coluna):
+        """Valores distintos de uma coluna (como as categorias do DataFrame do pandas)."""
+        return self.consultar(
+            f"SELECT DISTINCT {coluna} FROM reclamacoes WHERE {coluna} IS NOT NULL ORDER BY {coluna}")[coluna].tolist()
+
+    def contagem_status(self, **filtros):
+        where, parametros = self.filtro(**filtros)
+        return self.consultar(
+            f"SELECT STATUS, COUNT(*) AS Qtd_Reclamacoes FROM reclamacoes WHERE {where} "
+            "GROUP BY STATUS ORDER BY Qtd_Reclamacoes DESC", parametros)
+
+    def serie_diaria(self, **filtros):
+        """Contagem por (DATA, STATUS), no formato longo."""
+        where, parametros = self.filtro(**filtros)
+        df = self.consultar(
+            f"SELECT TEMPO AS DATA, STATUS, COUNT(*) AS Qtd_Reclamacoes FROM reclamacoes "
+            f"WHERE {where} AND TEMPO IS NOT NULL GROUP BY ALL ORDER BY DATA, STATUS", parametros)
+        df["DATA"] = pd.to_datetime(df["DATA"])
+        return df
+
+    def por_uf(self, **filtros):
+        where, parametros = self.filtro(**filtros)
+        return self.consultar(
+            f"SELECT NOME_UF, COUNT(*) AS Qtd_Reclamacoes FROM reclamacoes WHERE {where} "
+            "GROUP BY NOME_UF ORDER BY NOME_UF", parametros)
+
+    def por_municipio(self, **filtros):
+        where, parametros = self.filtro(**filtros)
+        return self.consultar(
+            f"SELECT NOME_UF, MUNICIPIO, COUNT(*) AS Qtd_Reclamacoes FROM reclamacoes WHERE {where} "
+            "GROUP BY NOME_UF, MUNICIPIO ORDER BY NOME_UF, MUNICIPIO", parametros)
+
+    def por_ano(self, nivel="UF", **filtros):
+        """Contagens por ano e UF (ou município), para o seletor de ano do mapa."""
+        where, parametros = self.filtro(**filtros)
+        chaves = "NOME_UF" if nivel == "UF" else "NOME_UF, MUNICIPIO"
+        return self.consultar(
+            f"SELECT ANO, {chaves}, COUNT(*) AS Qtd_Reclamacoes FROM reclamacoes WHERE {where} "
+            f"GROUP BY ANO, {chaves} ORDER BY ANO, {chaves}", parametros)
+
+    def estatisticas_tamanho(self, **filtros):
+        """Estatísticas do número de caracteres das descrições (como a coluna Tamanho_Texto do app.py)."""
+        where, parametros = self.filtro(**filtros)
+        return self.consultar(
+            "SELECT COUNT(*) AS n, AVG(t) AS media, MIN(t) AS minimo, "
+            "QUANTILE_CONT(t, 0.25) AS p25, MEDIAN(t) AS mediana, QUANTILE_CONT(t, 0.75) AS p75, MAX(t) AS maximo "
+            f"FROM (SELECT LENGTH(COALESCE(DESCRICAO, '')) AS t FROM reclamacoes WHERE {where})",
+            parametros)
+
+    def linhas(self, colunas, limite=None, **filtros):
+        """Somente as colunas pedidas das linhas filtradas (ex.: DESCRICAO para a frequência de termos)."""
+        where, parametros = self.filtro(**filtros)
+        sql = f"SELECT {', '.join(colunas)} FROM reclamacoes WHERE {where}"
+        if limite is not None:
+            sql += f" LIMIT {int(limite)}"
+        return self.consultar(sql, parametros)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Backend DuckDB das reclamações.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p = sub.add_parser("converter", help="Converte o CSV em Parquet particionado por ANO")
+    p.add_argument("csv")
+    p.add_argument("--destino", help="Padrão: <pasta da empresa do CSV>/parquet/<nome do CSV>")
+    args = parser.parse_args()
+
+    destino = converter_para_parquet(args.csv, args.destino)
+    consultas = ConsultasDuckDB(destino)
+    total = consultas.consultar("SELECT COUNT(*) AS n FROM reclamacoes")["n"].iloc[0]
+    print(f"{total} reclamações em {destino} (anos: {', '.join(map(str, consultas.anos()))})")
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+
+# --- Termos que distinguem dois grupos de reclamações (log-odds com prior de Dirichlet informativo) ---
+# Monroe, Colaresi & Quinn (2008), "Fightin' Words": para cada termo w, com contagens y_a, y_b nos
+# grupos (totais n_a, n_b) e prior alfa_w proporcional à frequência do termo no corpus inteiro,
+#
+#   delta_w = log((y_a + alfa_w) / (n_a + alfa_0 - y_a - alfa_w)) - log((y_b + alfa_w) / (n_b + alfa_0 - y_b - alfa_w))
+#   z_w     = delta_w / sqrt(1 / (y_a + alfa_w) + 1 / (y_b + alfa_w))
+#
+# O prior encolhe os termos raros (que teriam razões de chance extremas por acaso) e o z-score
+# ordena pela evidência, não só pelo tamanho do efeito. Tudo vetorizado sobre as contagens da
+# matriz de termos (utils/ngramas.py): nenhuma comparação relê as descrições.
+
+ALFA_0 = 1000.0  # força total do prior (em "ocorrências")
+
+
+def log_odds(contagem_a, contagem_b, contagem_fundo, alfa_0=ALFA_0):
+    """(delta, z) de cada termo: positivo = característico do grupo A, negativo = do grupo B."""
+    y_a = np.asarray(contagem_a, dtype=float)
+    y_b = np.asarray(contagem_b, dtype=float)
+    fundo = np.asarray(contagem_fundo, dtype=float)
+    alfa = alfa_0 * fundo / max(fundo.sum(), 1.0)
+    n_a, n_b = y_a.sum(), y_b.sum()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        delta = (np.log((y_a + alfa) / (n_a + alfa_0 - y_a - alfa))
+                 - np.log((y_b + alfa) / (n_b + alfa_0 - y_b - alfa)))
+        z = delta / np.sqrt(1 / (y_a + alfa) + 1 / (y_b + alfa))
+    validos = (fundo > 0) & np.isfinite(z)
+    return np.where(validos, delta, 0.0), np.where(validos, z, 0.0)
+
+
+def termos_distintivos(termos, contagem_a, contagem_b, contagem_fundo, n=15, alfa_0=ALFA_0):
+    """Os `n` termos mais característicos de cada grupo (DataFrame TERMO, Z, DELTA, QTD_A, QTD_B, GRUPO)."""
+    delta, z = log_odds(contagem_a, contagem_b, contagem_fundo, alfa_0)
+    contagem_a, contagem_b = np.asarray(contagem_a), np.asarray(contagem_b)
+    presentes = (contagem_a + contagem_b) > 0
+    ordem = np.argsort(z, kind="stable")
+    ordem = ordem[presentes[ordem]]
+    escolhidos = np.concatenate([ordem[::-1][:n], ordem[:n]])
+    escolhidos = np.unique(escolhidos[z[escolhidos] != 0])
+    df = pd.DataFrame({
+        "TERMO": [termos[i] for i in escolhidos],
+        "Z": z[escolhidos].round(2),
+        "DELTA": delta[escolhidos].round(3),
+        "QTD_A": contagem_a[escolhidos],
+        "QTD_B": contagem_b[escolhidos],
+        "GRUPO": np.where(z[escolhidos] > 0, "A", "B"),
+    })
+    return df.sort_values("Z", ignore_index=True)
@@ -0,0 +1,51 @@
+import numpy as np
+import pandas as pd
+
+# --- Detalhamento das reclamações (paginado) ---
+# As reclamações por trás de um gráfico são recortadas pela máscara de filtros (a mesma, compactada
+# em bits, que indexa os caches) combinada com a entidade clicada, e só viram DataFrame uma página
+# por vez: ID, data, situação e o início da descrição. O texto completo é buscado apenas para a
+# reclamação que o usuário abre, pelo número da linha; nada das demais descrições vai ao navegador.
+
+TAMANHO_RESUMO = 120  # caracteres da descrição mostrados na tabela
+
+
+def linhas_detalhe(df, mask, filtros=None, ids=None):
+    """Posições (iloc) das reclamações da máscara que atendem a `filtros` ({coluna: valor}) e a `ids`,
+    das mais recentes para as mais antigas (sem data por último)."""
+    selecao = np.asarray(mask, dtype=bool).copy()
+    for coluna, valor in (filtros or {}).items():
+        selecao &= (df[coluna] == valor).to_numpy()
+    if ids is not None:
+        selecao &= df["ID"].isin(ids).to_numpy()
+    linhas = np.flatnonzero(selecao)
+    tempos = pd.Series(df["TEMPO"].to_numpy()[linhas])
+    return linhas[tempos.sort_values(ascending=False, na_position="last", kind="stable").index.to_numpy()]
+
+
+def resumir(textos, limite=TAMANHO_RESUMO):
+    """Descrições cortadas em `limite` caracteres (no último espaço), com reticências quando cortadas."""
+    textos = pd.Series(textos, dtype="string").fillna("").str.replace(r"\s+", " ", regex=True).str.strip()
+    cortados = textos.str.len() > limite
+    resumos = textos.str.slice(0, limite).str.replace(r"\s+\S*$", "", regex=True) + "…"
+    return textos.where(~cortados, resumos)
+
+
+def pagina_reclamacoes(df, linhas, pagina, tamanho=20, limite=TAMANHO_RESUMO):
+    """Página `pagina` (a partir de 1) das reclamações em `linhas`: LINHA, ID, DATA, STATUS e RESUMO."""
+    inicio = (pagina - 1) * tamanho
+    linhas = np.asarray(linhas)[inicio:inicio + tamanho]
+    bloco = df.iloc[linhas]
+    return pd.DataFrame({
+        "LINHA": linhas,
+        "ID": bloco["ID"].to_numpy(),
+        "DATA": bloco["TEMPO"].dt.strftime("%d-%m-%Y").to_numpy(),
+        "STATUS": bloco["STATUS"].astype(str).to_numpy(),
+        "RESUMO": resumir(bloco["DESCRICAO"].to_numpy(), limite).to_numpy(),
+    })
+
+
+def texto_completo(df, linha):
+    """Descrição integral da reclamação na posição `linha`."""
+    texto = df["DESCRICAO"].iat[linha]
+    return "" if pd.isna(texto) else str(texto)
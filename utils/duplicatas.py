@@ -0,0 +1,216 @@
+import argparse
+import json
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from utils.artefatos import pasta_atual, publicar
+
+# --- Detecção de reclamações quase duplicadas (MinHash + LSH) ---
+# Cada DESCRICAO vira um conjunto de shingles de palavras; a assinatura MinHash estima a
+# similaridade de Jaccard entre descrições e o LSH por bandas encontra os pares candidatos
+# sem comparar todas as reclamações entre si.
+# O ID canônico é calculado na preparação da empresa (python -m utils.empresas preparar, ou este
+# módulo pela linha de comando) e gravado em <pasta da empresa>/duplicatas/<nome do CSV>/ com a
+# versão do CSV no manifesto; o app só lê a coluna ID_CANONICO (ver ler_ids_canonicos).
+
+PRIMO = np.uint64((1 << 61) - 1)
+MASCARA_32 = np.uint64(0xFFFFFFFF)
+
+
+class MinHashLSH:
+    """Assinaturas MinHash em lote e agrupamento de quase duplicatas por LSH.
+
+    Com `bandas` x `linhas` = `n_permutacoes`, pares com similaridade acima de
+    aproximadamente (1 / bandas) ** (1 / linhas) tendem a cair no mesmo balde.
+    """
+
+    def __init__(self, n_permutacoes=64, bandas=8, k_shingle=3, limiar=0.8, semente=42):
+        if n_permutacoes % bandas:
+            raise ValueError("n_permutacoes deve ser múltiplo de bandas")
+        self.n_permutacoes = n_permutacoes
+        self.bandas = bandas
+        self.linhas = n_permutacoes // bandas
+        self.k_shingle = k_shingle
+        self.limiar = limiar
+
+        rng = np.random.default_rng(semente)
+        self._a = rng.integers(1, 1 << 32, size=n_permutacoes, dtype=np.uint64)
+        self._b = rng.integers(0, 1 << 32, size=n_permutacoes, dtype=np.uint64)
+        self._hash_palavra = {}
+
+    # --- Shingles ---
+    def _palavras(self, textos):
+        """(hash de cada palavra, em sequência; número de palavras por texto), com todos os textos
+        tokenizados de uma vez pelo pyarrow (mesma regra de utils/texto.tokenizar)."""
+        import pyarrow as pa
+        import pyarrow.compute as pc
+
+        textos = pa.array(pd.Series(list(textos), dtype="string"), type=pa.large_string())
+        textos = pc.replace_substring_regex(pc.utf8_normalize(textos, "NFKD"), r"\p{Mn}", "")
+        listas = pc.split_pattern_regex(pc.utf8_lower(textos), r"[^a-z0-9]+")
+        palavras = pc.list_flatten(listas)
+        texto_da_palavra = pc.list_parent_indices(listas).to_numpy()
+        validas = pc.greater(pc.utf8_length(palavras), 0)
+        palavras = pc.filter(palavras, validas)
+        texto_da_palavra = texto_da_palavra[validas.to_numpy(zero_copy_only=False)]
+
+        # crc32 só das palavras distintas; as demais ocorrências reaproveitam o código do dicionário
+        codificadas = pc.dictionary_encode(palavras).combine_chunks() if isinstance(palavras, pa.ChunkedArray) \
+            else pc.dictionary_encode(palavras)
+        memo = self._hash_palavra
+        hashes = np.array([memo.setdefault(p, zlib.crc32(p.encode())) for p in codificadas.dictionary.to_pylist()],
+                          dtype=np.uint64)
+        ids = hashes[codificadas.indices.to_numpy(zero_copy_only=False)] if len(hashes) else np.array([], np.uint64)
+        return ids, np.bincount(texto_da_palavra, minlength=len(textos))
+
+    def _shingles(self, ids, contagens):
+        """(shingles, texto de cada shingle): hashes de `k_shingle` palavras consecutivas do mesmo texto
+        (vetorizado sobre todos os textos); textos com menos de k palavras usam as próprias palavras."""
+        k = self.k_shingle
+        texto = np.repeat(np.arange(len(contagens)), contagens)
+        posicao = np.arange(len(ids)) - np.repeat(np.cumsum(contagens) - contagens, contagens)
+        h = np.zeros(len(ids), dtype=np.uint64)
+        m = len(ids) - k + 1
+        if m > 0:
+            for i in range(k):
+                h[:m] = (h[:m] * np.uint64(1000003) + ids[i:m + i]) & MASCARA_32
+        curto = contagens[texto] < k
+        manter = curto | (posicao <= contagens[texto] - k)
+        return np.where(curto, ids, h)[manter], texto[manter]
+
+    # --- Assinaturas ---
+    def assinaturas(self, textos, shingles_por_lote=100_000):
+        """Matriz (n_textos, n_permutacoes) uint32; textos vazios ficam com a assinatura máxima.
+
+        O mínimo de cada permutação é tirado por texto com np.minimum.reduceat, em lotes de
+        textos com até `shingles_por_lote` shingles (memória: n_permutacoes x lote x 8 bytes).
+        """
+        ids, contagens = self._palavras(textos)
+        shingles, texto = self._shingles(ids, contagens)
+        saida = np.full((len(contagens), self.n_permutacoes), np.iinfo(np.uint32).max, dtype=np.uint32)
+        por_texto = np.bincount(texto, minlength=len(contagens))
+        com_shingles = np.flatnonzero(por_texto)
+        fins = np.cumsum(por_texto[com_shingles])
+        inicio = 0
+        while inicio < len(com_shingles):
+            # Lote: textos seguintes até somar shingles_por_lote (ao menos um texto)
+            base = fins[inicio - 1] if inicio else 0
+            fim = max(int(np.searchsorted(fins, base + shingles_por_lote, side="right")), inicio + 1)
+            bloco = shingles[base:fins[fim - 1]]
+            valores = (self._a[:, None] * bloco[None, :] + self._b[:, None]) % PRIMO
+            inicios = np.concatenate(([0], fins[inicio:fim - 1] - base))
+            minimos = np.minimum.reduceat(valores, inicios, axis=1)
+            saida[com_shingles[inicio:fim]] = (minimos.T & MASCARA_32).astype(np.uint32)
+            inicio = fim
+        return saida
+
+    # --- Agrupamento ---
+    def agrupar(self, assinaturas):
+        """Rótulo de grupo por linha: o menor índice de linha do grupo de quase duplicatas."""
+        n = len(assinaturas)
+        vazias = (assinaturas == np.iinfo(np.uint32).max).all(axis=1)
+        origens, destinos = [], []
+        for banda in range(self.bandas):
+            fatia = np.ascontiguousarray(assinaturas[:, banda * self.linhas:(banda + 1) * self.linhas])
+            chaves = fatia.view(np.dtype((np.void, fatia.dtype.itemsize * self.linhas))).ravel()
+            _, grupo = np.unique(chaves, return_inverse=True)
+            grupo = grupo.ravel()
+            # Liga cada linha ao primeiro membro do seu balde (linear, sem enumerar pares)
+            primeiro = np.full(grupo.max() + 1 if n else 0, n, dtype=np.int64)
+            np.minimum.at(primeiro, grupo, np.arange(n))
+            representante = primeiro[grupo]
+            candidatas = (representante != np.arange(n)) & ~vazias
+            origens.append(np.flatnonzero(candidatas))
+            destinos.append(representante[candidatas])
+
+        origens = np.concatenate(origens) if origens else np.array([], dtype=np.int64)
+        destinos = np.concatenate(destinos) if destinos else np.array([], dtype=np.int64)
+
+        # Confirma os candidatos pela similaridade estimada das assinaturas
+        similares = (assinaturas[origens] == assinaturas[destinos]).mean(axis=1) >= self.limiar
+        origens, destinos = origens[similares], destinos[similares]
+
+        # Componentes conexas por propagação do menor rótulo + compressão de caminhos
+        rotulos = np.arange(n)
+        while True:
+            anteriores = rotulos.copy()
+            np.minimum.at(rotulos, origens, rotulos[destinos])
+            np.minimum.at(rotulos, destinos, rotulos[origens])
+            rotulos = rotulos[rotulos]
+            if np.array_equal(rotulos, anteriores):
+                return rotulos
+
+
+def ids_canonicos(df, coluna_texto="DESCRICAO", coluna_id="ID", coluna_data="TEMPO", **parametros):
+    """ID canônico por reclamação: a reclamação mais antiga (e de menor ID) do grupo de duplicatas."""
+    if df.empty:
+        return pd.Series([], index=df.index, name="ID_CANONICO", dtype=df[coluna_id].dtype)
+
+    lsh = MinHashLSH(**parametros)
+    grupos = lsh.agrupar(lsh.assinaturas(df[coluna_texto].tolist()))
+
+    ordem = pd.DataFrame({
+        "grupo": grupos,
+        "data": df[coluna_data].to_numpy(),
+        "id": df[coluna_id].to_numpy(),
+    }).sort_values(["grupo", "data", "id"])
+    canonico = ordem.groupby("grupo")["id"].first()
+    return pd.Series(canonico.loc[grupos].to_numpy(), index=df.index, name="ID_CANONICO")
+
+
+# --- ID canônico gravado por CSV (uma linha por linha do CSV, na mesma ordem) ---
+def _pasta(path_csv):
+    from utils.empresas import pasta_artefato
+
+    return pasta_artefato(path_csv, "duplicatas")
+
+
+def gravar_ids_canonicos(path_csv, df, **parametros):
+    """Calcula o ID canônico das reclamações `df` (lidas de `path_csv`) e publica ID, ID_CANONICO."""
+    from utils.manifesto import versao_arquivo
+
+    canonicos = ids_canonicos(df, **parametros)
+    fonte = {"arquivo": str(path_csv), "sha256": versao_arquivo(path_csv), "linhas": len(df)}
+
+    def escrever(pasta):
+        pd.DataFrame({"ID": df["ID"].to_numpy(), "ID_CANONICO": canonicos.to_numpy()}).to_parquet(
+            pasta / "ids_canonicos.parquet", index=False)
+        (pasta / "fonte.json").write_text(json.dumps(fonte, ensure_ascii=False), encoding="utf-8")
+
+    publicar(_pasta(path_csv), escrever)
+    return canonicos
+
+
+def ler_ids_canonicos(path_csv):
+    """Coluna ID_CANONICO gravada para a versão atual do CSV, na ordem das linhas (None se falta ou mudou)."""
+    from utils.manifesto import versao_arquivo
+
+    pasta = pasta_atual(_pasta(path_csv))
+    if pasta is None:
+        return None
+    try:
+        fonte = json.loads((pasta / "fonte.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if fonte.get("sha256") != versao_arquivo(path_csv):
+        return None
+    return pd.read_parquet(pasta / "ids_canonicos.parquet", columns=["ID_CANONICO"])["ID_CANONICO"]
+
+
+if __name__ == "__main__":
+    from utils.esquema import ler_reclamacoes
+
+    parser = argparse.ArgumentParser(description="Gera o ID canônico (quase duplicatas) de cada reclamação.")
+    parser.add_argument("entrada", help="CSV de reclamações (ex.: datasets/RECLAMEAQUI_CARREFUOR_CLS.csv)")
+    parser.add_argument("saida", nargs="?",
+                        help="CSV extra com as colunas ID e ID_CANONICO (o app lê o gravado ao lado do CSV)")
+    parser.add_argument("--limiar", type=float, default=0.8, help="Similaridade mínima estimada (Jaccard)")
+    args = parser.parse_args()
+
+    df = ler_reclamacoes(args.entrada)
+    canonicos = gravar_ids_canonicos(args.entrada, df, limiar=args.limiar)
+    if args.saida:
+        pd.DataFrame({"ID": df["ID"], "ID_CANONICO": canonicos}).to_csv(args.saida, index=False)
+    print(f"{len(df)} reclamações, {canonicos.nunique()} únicas ({_pasta(args.entrada)})")
@@ -0,0 +1,165 @@
+import argparse
+import json
+import shutil
+from pathlib import Path
+
+import pandas as pd
+
+from utils.agregados import PASTA_DATASETS
+
+# --- Várias empresas, uma pasta por empresa ---
+# Cada empresa tem o próprio CSV e, ao lado dele, os artefatos derivados (índice de busca, tópicos,
+# anomalias, coletas e agregados pré-calculados):
+#
+#   datasets/RECLAMEAQUI_CARREFUOR_CLS.csv            (empresa original, derivados em datasets/)
+#   datasets/empresas/<slug>/RECLAMEAQUI_<X>_CLS.csv
+#   datasets/empresas/<slug>/{topicos,anomalias,snapshots,agregados}/
+#   datasets/empresas/<slug>/{indice_busca,ngramas,duplicatas,parquet}/<nome do CSV>/   (ver pasta_artefato)
+#   datasets/empresas/<slug>/empresa.json             {"nome": "..."} (opcional)
+#
+# O app carrega só a empresa selecionada; a comparação entre empresas lê apenas os agregados.
+#
+#   python -m utils.empresas adicionar <csv> --nome "Nome da Empresa"
+#   python -m utils.empresas preparar [--empresa "Nome"]      # agregados, índice de busca, frases, duplicatas
+
+PASTA_EMPRESAS = PASTA_DATASETS / "empresas"
+PADRAO_CSV = "RECLAMEAQUI_*_CLS.csv"
+PASTA_AGREGADOS = "agregados"
+
+# Agregados pré-calculados por empresa (subconjunto de utils/exportar.AGREGADOS)
+AGREGADOS_EMPRESA = ("status", "serie_diaria", "por_uf")
+
+
+def _caminho(path):
+    # Mesmo formato de utils/carregamento.PATH_RECLAMACOES ('./datasets/...'), que faz parte da chave do cache
+    path = Path(path)
+    return path.as_posix() if path.is_absolute() else f"./{path.as_posix()}"
+
+
+def nome_empresa(path):
+    """Nome de exibição: empresa.json da pasta ou, na falta dele, o trecho <X> de RECLAMEAQUI_<X>_CLS.csv."""
+    path = Path(path)
+    pasta = path if path.is_dir() else path.parent
+    config = pasta / "empresa.json"
+    if config.exists():
+        return json.loads(config.read_text(encoding="utf-8"))["nome"]
+    if path.is_file() and path.name.startswith("RECLAMEAQUI_") and path.name.endswith("_CLS.csv"):
+        return path.name[len("RECLAMEAQUI_"):-len("_CLS.csv")].replace("_", " ").title()
+    return None
+
+
+def listar_empresas(pasta=PASTA_DATASETS):
+    """{nome: caminho do CSV}, na ordem: empresa da pasta raiz, depois as de datasets/empresas/."""
+    pasta = Path(pasta)
+    arquivos = sorted(pasta.glob(PADRAO_CSV)) + sorted((pasta / "empresas").glob(f"*/{PADRAO_CSV}"))
+    return {nome_empresa(arquivo): _caminho(arquivo) for arquivo in arquivos}
+
+
+def pasta_empresa(path_csv):
+    """Pasta dos artefatos derivados da empresa (a mesma do CSV)."""
+    return Path(path_csv).parent
+
+
+def pasta_artefato(path_csv, nome):
+    """Pasta de um artefato derivado de um CSV específico: dois CSVs na mesma pasta não se sobrescrevem."""
+    return pasta_empresa(path_csv) / nome / Path(path_csv).stem
+
+
+def slug(nome):
+    from utils.texto import remover_acentos
+
+    return "".join(c if c.isalnum() else "_" for c in remover_acentos(nome).lower()).strip("_")
+
+
+def adicionar_empresa(path_csv, nome, pasta=PASTA_EMPRESAS):
+    """Copia o CSV para datasets/empresas/<slug>/ e registra o nome de exibição."""
+    destino = Path(pasta) / slug(nome)
+    destino.mkdir(parents=True, exist_ok=True)
+    arquivo = destino / f"RECLAMEAQUI_{slug(nome).upper()}_CLS.csv"
+    shutil.copyfile(path_csv, arquivo)
+    (destino / "empresa.json").write_text(json.dumps({"nome": nome}, ensure_ascii=False), encoding="utf-8")
+    return arquivo
+
+
+def agregados_atualizados(path_csv):
+    """True se os agregados foram calculados a partir da versão atual do CSV (ver utils/manifesto.py)."""
+    from utils.manifesto import versao_arquivo
+
+    pasta = pasta_empresa(path_csv) / PASTA_AGREGADOS
+    try:
+        fonte = json.loads((pasta / "fonte.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return False
+    arquivos = [pasta / f"{nome}.parquet" for nome in AGREGADOS_EMPRESA]
+    return fonte.get("sha256") == versao_arquivo(path_csv) and all(a.exists() for a in arquivos)
+
+
+def preparar_agregados(path_csv, df=None):
+    """Pré-calcula os agregados da empresa (a tabela é carregada só durante o cálculo, a menos que
+    `df` já traga a tabela lida com utils/esquema.ler_reclamacoes)."""
+    from utils.exportar import DadosExportacao, calcular
+    from utils.manifesto import versao_arquivo
+
+    pasta = pasta_empresa(path_csv) / PASTA_AGREGADOS
+    pasta.mkdir(parents=True, exist_ok=True)
+    dados = DadosExportacao(path_csv, PASTA_DATASETS, df=df)
+    for nome in AGREGADOS_EMPRESA:
+        df = calcular(dados, nome)
+        df = df.astype({c: str for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+        df.to_parquet(pasta / f"{nome}.parquet", index=False)
+    # Gravado por último: agregados incompletos não passam por atualizados
+    fonte = {"arquivo": str(path_csv), "sha256": versao_arquivo(path_csv)}
+    (pasta / "fonte.json").write_text(json.dumps(fonte), encoding="utf-8")
+    return pasta
+
+
+def ler_agregados(path_csv, carregar=None):
+    """{nome: DataFrame} dos agregados da empresa, recalculados se o CSV mudou desde o cálculo.
+
+    `carregar()`: devolve a tabela já em memória (ex.: do cache do app) para o recálculo, em vez de reler o CSV.
+    """
+    if not agregados_atualizados(path_csv):
+        preparar_agregados(path_csv, carregar() if carregar else None)
+    pasta = pasta_empresa(path_csv) / PASTA_AGREGADOS
+    return {nome: pd.read_parquet(pasta / f"{nome}.parquet") for nome in AGREGADOS_EMPRESA}
+
+
+def preparar_empresa(path_csv):
+    """Agregados, índice de busca, frases e IDs canônicos da empresa, para que a primeira seleção no app
+    não pague a carga."""
+    from utils.busca import IndiceBusca
+    from utils.duplicatas import gravar_ids_canonicos, ler_ids_canonicos
+    from utils.esquema import ler_reclamacoes
+    from utils.ngramas import MatrizFrases
+
+    preparar_agregados(path_csv)
+    textos = lambda: ler_reclamacoes(path_csv)["DESCRICAO"].tolist()
+    IndiceBusca.abrir_ou_construir(path_csv, pasta_artefato(path_csv, "indice_busca"), textos)
+    MatrizFrases.abrir_ou_construir(path_csv, pasta_artefato(path_csv, "ngramas"), textos)
+    if ler_ids_canonicos(path_csv) is None:
+        gravar_ids_canonicos(path_csv, ler_reclamacoes(path_csv))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Empresas disponíveis no dashboard.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    p = sub.add_parser("adicionar", help="Adiciona o CSV de uma empresa em datasets/empresas/<slug>/")
+    p.add_argument("csv")
+    p.add_argument("--nome", required=True)
+    p = sub.add_parser("preparar", help="Pré-calcula agregados, índice de busca e frases")
+    p.add_argument("--empresa", help="Nome da empresa (padrão: todas)")
+    sub.add_parser("listar")
+    args = parser.parse_args()
+
+    if args.comando == "adicionar":
+        arquivo = adicionar_empresa(args.csv, args.nome)
+        preparar_empresa(arquivo)
+        print(arquivo)
+    elif args.comando == "preparar":
+        for nome, path in listar_empresas().items():
+            if args.empresa in (None, nome):
+                preparar_empresa(path)
+                print(f"{nome}: {pasta_empresa(path)}")
+    else:
+        for nome, path in listar_empresas().items():
+            print(f"{nome:30s} {path}")
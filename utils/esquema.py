@@ -0,0 +1,57 @@
+import pandas as pd
+
+# --- Esquema de tipos da tabela de reclamações ---
+# Inteiros reduzidos ao menor tipo que comporta os valores, categorias para as colunas
+# de baixa cardinalidade e CATEGORIA codificada por dicionário (cada rótulo distinto
+# é guardado uma única vez e as linhas guardam apenas o código).
+ESQUEMA_RECLAMACOES = {
+    "ID": "uint32",
+    "TEMPO": "string",
+    "NOME_UF": "category",
+    "SIGLA_UF": "category",
+    "MUNICIPIO": "category",
+    "STATUS": "category",
+    "TEMA": "string",
+    "CATEGORIA": "category",
+    "DESCRICAO": "string",
+    "DIA": "uint8",
+    "MES": "uint8",
+    "ANO": "uint16",
+    "TRIMESTRE": "uint8",
+}
+
+# Colunas lidas do CSV (a coluna de índice sem nome é descartada na leitura)
+COLUNAS_RECLAMACOES = list(ESQUEMA_RECLAMACOES)
+
+# TEMPO é convertido para datetime depois da leitura, com formato explícito
+DTYPES_LEITURA = {col: tipo for col, tipo in ESQUEMA_RECLAMACOES.items() if col != "TEMPO"}
+
+
+def ler_reclamacoes(path):
+    """Lê o CSV de reclamações já com os tipos do esquema."""
+    df = pd.read_csv(path, sep=',', usecols=COLUNAS_RECLAMACOES, dtype=DTYPES_LEITURA)
+    df["TEMPO"] = pd.to_datetime(df["TEMPO"], format='%d-%m-%Y', errors='coerce')
+    return df
+
+
+def codificar_categoria(df, coluna="CATEGORIA"):
+    """Retorna (códigos, dicionário) da coluna codificada por dicionário.
+
+    `dicionario[codigos[i]]` é o rótulo da linha `i`; código -1 indica valor ausente.
+    """
+    serie = df[coluna]
+    if not isinstance(serie.dtype, pd.CategoricalDtype):
+        serie = serie.astype("category")
+    return serie.cat.codes.to_numpy(), serie.cat.categories.to_numpy(dtype=object)
+
+
+def relatorio_memoria(df):
+    """Memória ocupada por coluna (bytes reais, incluindo strings e dicionários)."""
+    uso = df.memory_usage(deep=True, index=True)
+    relatorio = pd.DataFrame({
+        "tipo": [str(df.index.dtype)] + [str(t) for t in df.dtypes],
+        "bytes": uso.to_numpy(),
+    }, index=["(índice)"] + df.columns.tolist())
+    relatorio["MB"] = (relatorio["bytes"] / 1024 ** 2).round(3)
+    relatorio["%"] = (100 * relatorio["bytes"] / max(relatorio["bytes"].sum(), 1)).round(1)
+    return relatorio.sort_values("bytes", ascending=False)
@@ -0,0 +1,329 @@
+import argparse
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import BytesIO
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from utils.agregados import (PASTA_DATASETS, REGIOES, contagem_por_uf, ler_denominadores_municipios,
+                             ler_denominadores_uf, taxas_de_contagem_municipio, taxas_de_contagem_uf)
+from utils.consultas import abrir_parquet
+from utils.empresas import nome_empresa
+from utils.esquema import ler_reclamacoes
+from utils.series_temporais import SerieTemporal
+from utils.texto import carregar_stopwords, frequencia_termos
+
+# --- Exportação dos agregados do dashboard sem abrir o Streamlit ---
+# Gera em lote as mesmas tabelas que alimentam as métricas, gráficos e mapa do app.py e do
+# pages/mapa.py, em Parquet e/ou JSON, para consumo por rotinas de BI.
+#
+#   python -m utils.exportar --saida ./exportacao --formato ambos
+#   python -m utils.exportar --servir --porta 8765      # GET /agregados/<nome>?estado=...&inicio=...
+#   python -m utils.exportar --backend duckdb           # agregados em SQL sobre o Parquet do CSV (utils/consultas.py)
+
+CSV_PADRAO = PASTA_DATASETS / "RECLAMEAQUI_CARREFUOR_CLS.csv"
+
+
+# Esquema fixo das tabelas por UF e por município: sem denominadores, as colunas de taxa vêm vazias (NaN)
+COLUNAS_UF = ["NOME_UF", "AREA_KM2", "POPULACAO", "Qtd_Reclamacoes", "Reclamacoes_km2", "Reclamacoes_100k"]
+COLUNAS_MUNICIPIO = ["NOME_UF", "MUNICIPIO", "Qtd_Reclamacoes", "AREA_KM2", "POPULACAO",
+                     "Reclamacoes_km2", "Reclamacoes_100k"]
+DENOMINADORES_VAZIOS_UF = pd.DataFrame({"NM_UF": pd.Series(dtype=object), "AREA_KM2": pd.Series(dtype=float),
+                                        "POPULACAO": pd.Series(dtype=float)})
+
+
+class DadosExportacao:
+    """Tabela de reclamações, motor de séries temporais e denominadores, carregados uma única vez.
+
+    `df`: tabela já lida com utils/esquema.ler_reclamacoes (ex.: a do cache do app), para não reler o CSV.
+    """
+
+    def __init__(self, path_csv=CSV_PADRAO, pasta=PASTA_DATASETS, df=None):
+        self.df = ler_reclamacoes(path_csv) if df is None else df
+        self.serie = SerieTemporal(self.df)
+        self.empresa = nome_empresa(path_csv)
+        self._carregar_denominadores(pasta)
+
+    def _carregar_denominadores(self, pasta):
+        pasta = Path(pasta)
+        estados = pasta / "gdf_estados.csv"
+        self.denominadores_uf = ler_denominadores_uf(estados, pasta / "populacao_uf.csv") if estados.exists() else None
+        self.denominadores_municipios = ler_denominadores_municipios(
+            [pasta / f"gdf_municipios_{regiao}.csv" for regiao in REGIOES], pasta / "populacao_municipios.csv"
+        )
+        self._stopwords = None
+
+    @property
+    def stopwords(self):
+        if self._stopwords is None:
+            self._stopwords = carregar_stopwords(self.empresa)
+        return self._stopwords
+
+    def filtrar(self, inicio=None, fim=None, estado="Todos", status=()):
+        """Mesma máscara da barra lateral do app.py."""
+        df = self.df
+        mascara = np.ones(len(df), dtype=bool)
+        if inicio is not None:
+            mascara &= (df["TEMPO"] >= pd.Timestamp(inicio)).to_numpy()
+        if fim is not None:
+            mascara &= (df["TEMPO"] <= pd.Timestamp(fim)).to_numpy()
+        if estado != "Todos":
+            mascara &= (df["NOME_UF"] == estado).to_numpy()
+        if status:
+            mascara &= df["STATUS"].isin(status).to_numpy()
+        return df.loc[mascara]
+
+
+# --- Agregados (cada função retorna um DataFrame) ---
+def agregado_status(dados, df, **filtros):
+    contagem = df["STATUS"].value_counts().rename_axis("STATUS").reset_index(name="Qtd_Reclamacoes")
+    total = pd.DataFrame({"STATUS": ["Total"], "Qtd_Reclamacoes": [len(df)]})
+    return pd.concat([contagem, total], ignore_index=True)
+
+
+def agregado_serie_diaria(dados, df, inicio=None, fim=None, estado="Todos", status=()):
+    inicio = inicio or dados.serie.inicio
+    fim = fim or dados.serie.inicio + pd.Timedelta(days=max(dados.serie.n_dias - 1, 0))
+    serie = dados.serie.serie(inicio, fim, uf=estado, status=list(status), granularidade="Dia")
+    return serie.reset_index().melt(id_vars="DATA", var_name="STATUS", value_name="Qtd_Reclamacoes")
+
+
+def agregado_por_uf(dados, df, **filtros):
+    return _uf_de_contagem(dados, contagem_por_uf(df))
+
+
+def agregado_por_municipio(dados, df, **filtros):
+    contagem = df.groupby(["NOME_UF", "MUNICIPIO"], observed=True).size().reset_index(name="Qtd_Reclamacoes")
+    return _municipios_de_contagem(dados, contagem)
+
+
+# Contagens (de qualquer backend) -> tabelas exportadas, com as taxas quando há denominadores
+def _uf_de_contagem(dados, contagem):
+    denominadores = DENOMINADORES_VAZIOS_UF if dados.denominadores_uf is None else dados.denominadores_uf
+    agregado = taxas_de_contagem_uf(contagem, denominadores)
+    return agregado[COLUNAS_UF].astype({"NOME_UF": str, "AREA_KM2": float, "POPULACAO": float})
+
+
+def _municipios_de_contagem(dados, contagem):
+    partes = []
+    for estado in contagem["NOME_UF"].dropna().unique():
+        do_estado = contagem.loc[contagem["NOME_UF"] == estado, ["MUNICIPIO", "Qtd_Reclamacoes"]]
+        # Municípios sem denominador (sem geometria ou grafia diferente) ficam com taxas NaN
+        agregado = taxas_de_contagem_municipio(do_estado, estado, dados.denominadores_municipios)
+        agregado.insert(0, "NOME_UF", estado)
+        partes.append(agregado[agregado["Qtd_Reclamacoes"] > 0])
+    if not partes:
+        return pd.DataFrame({coluna: pd.Series(dtype=str if coluna in ("NOME_UF", "MUNICIPIO") else float)
+                             for coluna in COLUNAS_MUNICIPIO}).astype({"Qtd_Reclamacoes": "int64"})
+    return pd.concat(partes, ignore_index=True)[COLUNAS_MUNICIPIO].astype(
+        {"NOME_UF": str, "MUNICIPIO": str, "AREA_KM2": float, "POPULACAO": float})
+
+
+def agregado_termos(dados, df, **filtros):
+    return frequencia_termos(df["DESCRICAO"].dropna(), dados.stopwords)
+
+
+def agregado_mapa(dados, df, **filtros):
+    """Dados do mapa por ano (como no seletor de ano do pages/mapa.py), por UF e por município."""
+    partes = []
+    for ano in sorted(df["ANO"].unique()):
+        do_ano = df[df["ANO"] == ano]
+        uf = agregado_por_uf(dados, do_ano).assign(NIVEL="UF")
+        municipio = agregado_por_municipio(dados, do_ano).assign(NIVEL="MUNICIPIO")
+        partes.append(pd.concat([uf, municipio], ignore_index=True).assign(ANO=int(ano)))
+    return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+
+
+AGREGADOS = {
+    "status": agregado_status,
+    "serie_diaria": agregado_serie_diaria,
+    "por_uf": agregado_por_uf,
+    "por_municipio": agregado_por_municipio,
+    "termos": agregado_termos,
+    "mapa": agregado_mapa,
+}
+
+
+# --- Mesmos agregados pelo backend DuckDB (SQL sobre o Parquet, sem carregar a tabela) ---
+class DadosDuckDB(DadosExportacao):
+    """Denominadores como em DadosExportacao; as reclamações ficam no Parquet (utils/consultas.py),
+    reconvertido se o CSV mudou desde a última conversão."""
+
+    def __init__(self, path_csv=CSV_PADRAO, pasta=PASTA_DATASETS, parquet=None):
+        self.consultas = abrir_parquet(path_csv, parquet)
+        self.empresa = nome_empresa(path_csv)
+        self._carregar_denominadores(pasta)
+
+
+def duckdb_status(dados, **filtros):
+    # Status sem reclamação no filtro aparecem com zero, como no value_counts das categorias
+    contagem = (dados.consultas.contagem_status(**filtros).set_index("STATUS")["Qtd_Reclamacoes"]
+                .reindex(dados.consultas.valores("STATUS"), fill_value=0)
+                .sort_values(ascending=False, kind="stable").rename_axis("STATUS").reset_index())
+    total = pd.DataFrame({"STATUS": ["Total"], "Qtd_Reclamacoes": [int(contagem["Qtd_Reclamacoes"].sum())]})
+    return pd.concat([contagem, total], ignore_index=True)
+
+
+def duckdb_serie_diaria(dados, **filtros):
+    # Completa a grade (dia x status) com zeros, como o motor de séries temporais
+    serie = dados.consultas.serie_diaria(**filtros)
+    if serie.empty:
+        return serie
+    status = list(filtros.get("status") or sorted(serie["STATUS"].unique()))
+    dias = pd.date_range(pd.Timestamp(filtros.get("inicio") or serie["DATA"].min()),
+                         pd.Timestamp(filtros.get("fim") or serie["DATA"].max()), freq="D", name="DATA")
+    grade = (serie.pivot_table(index="DATA", columns="STATUS", values="Qtd_Reclamacoes", aggfunc="sum")
+             .reindex(index=dias, columns=status).fillna(0).astype(int))
+    return grade.reset_index().melt(id_vars="DATA", var_name="STATUS", value_name="Qtd_Reclamacoes")
+
+
+def duckdb_por_uf(dados, **filtros):
+    return _uf_de_contagem(dados, dados.consultas.por_uf(**filtros))
+
+
+def duckdb_por_municipio(dados, **filtros):
+    return _municipios_de_contagem(dados, dados.consultas.por_municipio(**filtros))
+
+
+def duckdb_termos(dados, **filtros):
+    return frequencia_termos(dados.consultas.linhas(["DESCRICAO"], **filtros)["DESCRICAO"].dropna(), dados.stopwords)
+
+
+def duckdb_mapa(dados, **filtros):
+    uf = dados.consultas.por_ano("UF", **filtros)
+    municipio = dados.consultas.por_ano("MUNICIPIO", **filtros)
+    partes = []
+    for ano in sorted(uf["ANO"].unique()):
+        partes.append(pd.concat([
+            _uf_de_contagem(dados, uf.loc[uf["ANO"] == ano].drop(columns="ANO")).assign(NIVEL="UF"),
+            _municipios_de_contagem(dados, municipio.loc[municipio["ANO"] == ano].drop(columns="ANO"))
+            .assign(NIVEL="MUNICIPIO"),
+        ], ignore_index=True).assign(ANO=int(ano)))
+    return pd.concat(partes, ignore_index=True) if partes else pd.DataFrame()
+
+
+AGREGADOS_DUCKDB = {
+    "status": duckdb_status,
+    "serie_diaria": duckdb_serie_diaria,
+    "por_uf": duckdb_por_uf,
+    "por_municipio": duckdb_por_municipio,
+    "termos": duckdb_termos,
+    "mapa": duckdb_mapa,
+}
+
+
+def calcular(dados, nome, inicio=None, fim=None, estado="Todos", status=()):
+    if isinstance(dados, DadosDuckDB):
+        return AGREGADOS_DUCKDB[nome](dados, inicio=inicio, fim=fim, estado=estado, status=status)
+    df = dados.filtrar(inicio, fim, estado, status)
+    return AGREGADOS[nome](dados, df, inicio=inicio, fim=fim, estado=estado, status=status)
+
+
+def _para_json(df):
+    return df.to_json(orient="records", date_format="iso", force_ascii=False)
+
+
+def exportar(dados, saida, formato="parquet", **filtros):
+    saida = Path(saida)
+    saida.mkdir(parents=True, exist_ok=True)
+    arquivos = []
+    for nome in AGREGADOS:
+        df = calcular(dados, nome, **filtros)
+        # Categorias viram texto para que os arquivos sejam legíveis por qualquer consumidor
+        df = df.astype({c: str for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+        if formato in ("parquet", "ambos"):
+            df.to_parquet(saida / f"{nome}.parquet", index=False)
+            arquivos.append(saida / f"{nome}.parquet")
+        if formato in ("json", "ambos"):
+            (saida / f"{nome}.json").write_text(_para_json(df), encoding="utf-8")
+            arquivos.append(saida / f"{nome}.json")
+    return arquivos
+
+
+# --- Endpoint HTTP local (somente leitura) ---
+FORMATOS_HTTP = ("json", "parquet")
+ESTADOS = frozenset(uf for estados in REGIOES.values() for uf in estados)
+
+
+def filtros_da_consulta(parametros):
+    """Filtros de `calcular` a partir da query string; ValueError se algum parâmetro é inválido."""
+    filtros = {"estado": parametros.get("estado", "Todos"),
+               "status": tuple(s for s in parametros.get("status", "").split(",") if s)}
+    for chave in ("inicio", "fim"):
+        valor = parametros.get(chave)
+        data = pd.Timestamp(valor) if valor else None  # ValueError para datas malformadas
+        if valor and pd.isna(data):
+            raise ValueError(f"{chave}: data inválida {valor!r}")
+        filtros[chave] = None if data is None else data.strftime("%Y-%m-%d")
+    if filtros["estado"] != "Todos" and filtros["estado"] not in ESTADOS:
+        raise ValueError(f"estado desconhecido: {filtros['estado']!r}")
+    if parametros.get("formato", "json") not in FORMATOS_HTTP:
+        raise ValueError(f"formato deve ser um de {FORMATOS_HTTP}")
+    return filtros
+
+
+def servir(dados, porta=8765, host="127.0.0.1"):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            url = urlparse(self.path)
+            partes = url.path.strip("/").split("/")
+            if len(partes) != 2 or partes[0] != "agregados" or partes[1] not in AGREGADOS:
+                self._responder(404, "application/json", json.dumps({"erro": "use /agregados/<nome>",
+                                                                    "nomes": list(AGREGADOS)}).encode())
+                return
+            parametros = {k: v[-1] for k, v in parse_qs(url.query).items()}
+            try:
+                df = calcular(dados, partes[1], **filtros_da_consulta(parametros))
+            except (ValueError, KeyError) as erro:
+                self.send_error(400, "Parametro invalido", str(erro))
+                return
+            df = df.astype({c: str for c in df.columns if isinstance(df[c].dtype, pd.CategoricalDtype)})
+            if parametros.get("formato") == "parquet":
+                buffer = BytesIO()
+                df.to_parquet(buffer, index=False)
+                self._responder(200, "application/vnd.apache.parquet", buffer.getvalue())
+            else:
+                self._responder(200, "application/json; charset=utf-8", _para_json(df).encode("utf-8"))
+
+        def _responder(self, codigo, tipo, corpo):
+            self.send_response(codigo)
+            self.send_header("Content-Type", tipo)
+            self.send_header("Content-Length", str(len(corpo)))
+            self.end_headers()
+            self.wfile.write(corpo)
+
+    servidor = ThreadingHTTPServer((host, porta), Handler)
+    print(f"Servindo agregados em http://{host}:{porta}/agregados/<{'|'.join(AGREGADOS)}>")
+    servidor.serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Exporta os agregados do dashboard em Parquet/JSON.")
+    parser.add_argument("--csv", default=str(CSV_PADRAO))
+    parser.add_argument("--pasta", default=str(PASTA_DATASETS), help="Pasta das geometrias e populações")
+    parser.add_argument("--saida", default="./exportacao")
+    parser.add_argument("--formato", choices=["parquet", "json", "ambos"], default="parquet")
+    parser.add_argument("--inicio", help="Data inicial (AAAA-MM-DD)")
+    parser.add_argument("--fim", help="Data final (AAAA-MM-DD)")
+    parser.add_argument("--estado", default="Todos")
+    parser.add_argument("--status", action="append", default=[], help="Pode ser repetido")
+    parser.add_argument("--servir", action="store_true", help="Em vez de gravar arquivos, sobe o endpoint HTTP local")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--backend", choices=["pandas", "duckdb"], default="pandas",
+                        help="duckdb: consulta o Parquet do CSV sem carregar a tabela")
+    parser.add_argument("--parquet", help="Pasta do Parquet (padrão: <pasta da empresa do CSV>/parquet/<nome do CSV>)")
+    args = parser.parse_args()
+
+    if args.backend == "duckdb":
+        dados = DadosDuckDB(args.csv, args.pasta, args.parquet)
+    else:
+        dados = DadosExportacao(args.csv, args.pasta)
+    if args.servir:
+        servir(dados, args.porta)
+    else:
+        for arquivo in exportar(dados, args.saida, args.formato, inicio=args.inicio, fim=args.fim,
+                                estado=args.estado, status=tuple(args.status)):
+            print(arquivo)
@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.stats import norm
+
+# --- Estatísticas espaciais locais (Getis-Ord Gi* e Moran Local / LISA) ---
+# A matriz de vizinhança (contiguidade "queen": municípios que se tocam) é montada uma vez
+# por estado a partir das geometrias; as estatísticas são vetorizadas sobre qualquer vetor
+# de contagens e a significância vem de permutações condicionais. Tudo roda no processo do app:
+# mesmo com 999 permutações os estados brasileiros (até ~850 municípios) levam frações de segundo,
+# e abrir processos (fork) de dentro do servidor do Streamlit não é seguro.
+
+CLASSES_GI = ["Hot spot", "Cold spot", "Não significativo"]
+CLASSES_LISA = ["Alto-Alto", "Baixo-Baixo", "Alto-Baixo", "Baixo-Alto", "Não significativo"]
+
+
+def pesos_contiguidade(gdf):
+    """Matriz esparsa binária (CSR) n x n: 1 onde as geometrias se tocam ou se sobrepõem."""
+    esquerda, direita = gdf.sindex.query(gdf.geometry, predicate="intersects")
+    fora_diagonal = esquerda != direita
+    esquerda, direita = esquerda[fora_diagonal], direita[fora_diagonal]
+    n = len(gdf)
+    w = sparse.csr_matrix((np.ones(len(esquerda)), (esquerda, direita)), shape=(n, n))
+    w.data[:] = 1.0
+    return w
+
+
+def _somas_permutadas(z, k, n_permutacoes, semente):
+    """Para cada permutação, soma de k_i valores sorteados sem reposição entre os outros n-1.
+
+    Como no esda (crand), cada permutação sorteia uma única sequência de k_max posições distintas
+    em 0..n-2, compartilhada por todos os municípios; para o município i as posições >= i são
+    deslocadas em 1, o que exclui o próprio i sem repetir nenhum vizinho sorteado.
+    """
+    rng = np.random.default_rng(semente)
+    n, k_max = len(z), int(k.max()) if len(k) else 0
+    somas = np.zeros((n_permutacoes, n))
+    if k_max == 0:
+        return somas
+    colunas_validas = np.arange(k_max)[None, :] < k[:, None]
+    proprio = np.arange(n)[:, None]
+    for p in range(n_permutacoes):
+        sorteio = rng.permutation(n - 1)[:k_max]
+        indices = sorteio[None, :] + (sorteio[None, :] >= proprio)  # pula o próprio município
+        somas[p] = np.where(colunas_validas, z[indices], 0.0).sum(axis=1)
+    return somas
+
+
+def _pseudo_p(simulados, observado):
+    maiores = (simulados >= observado).sum(axis=0)
+    menores = (simulados <= observado).sum(axis=0)
+    return (np.minimum(maiores, menores) + 1) / (len(simulados) + 1)
+
+
+def estatisticas_locais(valores, w, n_permutacoes=999, alfa=0.05, semente=12345):
+    """Gi* e Moran Local para `valores` alinhados às linhas de `w`.
+
+    Retorna um DataFrame com GI_Z, GI_P (normal), GI_P_SIM, CLASSE_GI, LISA_I, LISA_P_SIM e
+    CLASSE_LISA. Municípios sem vizinhos (ilhas) ficam com NaN e "Não significativo".
+    """
+    x = np.nan_to_num(np.asarray(valores, dtype=float))
+    n = len(x)
+    k = np.asarray(w.sum(axis=1)).ravel()
+    resultado = pd.DataFrame(index=np.arange(n))
+    desvio = x.std()
+    if n < 3 or desvio == 0:
+        for coluna in ["GI_Z", "GI_P", "GI_P_SIM", "LISA_I", "LISA_P_SIM"]:
+            resultado[coluna] = np.nan
+        resultado["CLASSE_GI"] = CLASSES_GI[-1]
+        resultado["CLASSE_LISA"] = CLASSES_LISA[-1]
+        return resultado
+
+    z = (x - x.mean()) / desvio
+    ilhas = k == 0
+    soma_vizinhos = w @ z
+
+    # Gi* (binário, incluindo o próprio município): z-score analítico
+    w_estrela = k + 1
+    media, s = x.mean(), np.sqrt((x ** 2).mean() - x.mean() ** 2)
+    numerador = (w @ x + x) - media * w_estrela
+    denominador = s * np.sqrt((n * w_estrela - w_estrela ** 2) / (n - 1))
+    gi_z = numerador / denominador
+
+    # Moran Local com pesos padronizados por linha
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lag = np.where(ilhas, 0.0, soma_vizinhos / k)
+    lisa_i = z * lag
+
+    # Permutações condicionais: mantém o valor do município e sorteia os vizinhos
+    k_int = k.astype(np.int64)
+    simulados = _somas_permutadas(z, k_int, n_permutacoes, semente)
+    gi_p_sim = _pseudo_p(z + simulados, z + soma_vizinhos)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        lisa_simulado = z * np.where(ilhas, 0.0, simulados / np.where(ilhas, 1, k))
+    lisa_p_sim = _pseudo_p(lisa_simulado, lisa_i)
+
+    significativo_gi = (gi_p_sim < alfa) & ~ilhas
+    classe_gi = np.where(significativo_gi & (gi_z > 0), CLASSES_GI[0],
+                         np.where(significativo_gi & (gi_z < 0), CLASSES_GI[1], CLASSES_GI[2]))
+    significativo_lisa = (lisa_p_sim < alfa) & ~ilhas
+    quadrante = np.select(
+        [(z > 0) & (lag > 0), (z < 0) & (lag < 0), (z > 0) & (lag <= 0)],
+        CLASSES_LISA[:3],
+        default=CLASSES_LISA[3],
+    )
+    classe_lisa = np.where(significativo_lisa, quadrante, CLASSES_LISA[-1])
+
+    resultado["GI_Z"] = np.where(ilhas, np.nan, gi_z)
+    resultado["GI_P"] = np.where(ilhas, np.nan, 2 * norm.sf(np.abs(gi_z)))
+    resultado["GI_P_SIM"] = np.where(ilhas, np.nan, gi_p_sim)
+    resultado["CLASSE_GI"] = classe_gi
+    resultado["LISA_I"] = np.where(ilhas, np.nan, lisa_i)
+    resultado["LISA_P_SIM"] = np.where(ilhas, np.nan, lisa_p_sim)
+    resultado["CLASSE_LISA"] = classe_lisa
+    return resultado
@@ -0,0 +1,92 @@
+import argparse
+import hashlib
+import unicodedata
+from pathlib import Path
+
+# --- Léxico compilado (stopwords em português + stopwords do domínio) ---
+# As stopwords do NLTK (nltk_data/corpora/stopwords/portuguese) e as NOVAS_STOPWORDS de utils/texto.py
+# são unidas, normalizadas (minúsculas, sem acentos) e gravadas como um frozenset literal em
+# utils/lexico_pt.py, junto com os radicais (Snowball) das stopwords do domínio, usados na contagem de
+# termos por radical. Os radicais das stopwords do NLTK não entram: palavras funcionais colidem com
+# termos de conteúdo ("para" e "parou", "com" e "comer"), então elas só valem pela grafia. Em tempo de
+# execução basta importar esse módulo: nada de NLTK, corpus reader ou download. VERSAO (hash das
+# stopwords e dos radicais) vai para os metadados dos índices que usam as stopwords, que assim
+# detectam a troca da lista e são reconstruídos.
+#
+#   python -m utils.lexico              # recompila utils/lexico_pt.py depois de editar as fontes
+#   python -m utils.lexico --verificar  # falha se o módulo compilado estiver desatualizado
+
+RAIZ = Path(__file__).resolve().parent.parent
+ARQUIVO_NLTK = RAIZ / "nltk_data" / "corpora" / "stopwords" / "portuguese"
+MODULO_COMPILADO = Path(__file__).resolve().parent / "lexico_pt.py"
+
+
+def normalizar(palavra):
+    """Forma usada no léxico: minúsculas e sem acentos ('Não' -> 'nao')."""
+    decomposto = unicodedata.normalize("NFKD", palavra.lower())
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def versao(palavras, radicais):
+    conteudo = "\n".join(sorted(palavras)) + "\n--\n" + "\n".join(sorted(radicais))
+    return hashlib.sha256(conteudo.encode("utf-8")).hexdigest()[:16]
+
+
+def _palavras_das_fontes():
+    from utils.texto import NOVAS_STOPWORDS
+
+    palavras = ARQUIVO_NLTK.read_text(encoding="utf-8").split() + list(NOVAS_STOPWORDS)
+    return [p.lower() for p in palavras if normalizar(p).isalnum()]
+
+
+def stopwords_das_fontes():
+    return frozenset(normalizar(p) for p in _palavras_das_fontes())
+
+
+def radicais_das_fontes():
+    """Radicais das stopwords do domínio, da grafia original e da sem acentos (o radical de 'não' é 'na',
+    o de 'nao' é 'nao'), menos os que também são radicais de termos de conteúdo (RADICAIS_DE_CONTEUDO)."""
+    from utils.texto import NOVAS_STOPWORDS, RADICAIS_DE_CONTEUDO, Radicalizador
+
+    radical = Radicalizador()
+    palavras = [p.lower() for p in NOVAS_STOPWORDS if normalizar(p).isalnum()]
+    radicais = {radical(p) for palavra in palavras for p in (palavra, normalizar(palavra))}
+    return frozenset(radicais - set(RADICAIS_DE_CONTEUDO))
+
+
+def _frozenset_literal(nome, palavras):
+    return f"{nome} = frozenset({{\n" + "\n".join(f"    {p!r}," for p in sorted(palavras)) + "\n})\n"
+
+
+def gerar_modulo(palavras, radicais):
+    return (
+        "# Gerado por `python -m utils.lexico` a partir de nltk_data/corpora/stopwords/portuguese\n"
+        "# e de utils/texto.NOVAS_STOPWORDS. Não editar à mão.\n"
+        f"VERSAO = {versao(palavras, radicais)!r}\n\n"
+        + _frozenset_literal("STOPWORDS", palavras) + "\n"
+        + _frozenset_literal("RADICAIS_STOPWORDS", radicais)
+    )
+
+
+def compilar(destino=MODULO_COMPILADO):
+    palavras, radicais = stopwords_das_fontes(), radicais_das_fontes()
+    Path(destino).write_text(gerar_modulo(palavras, radicais), encoding="utf-8")
+    return palavras, radicais
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compila as stopwords em utils/lexico_pt.py.")
+    parser.add_argument("--verificar", action="store_true", help="Só confere se o módulo compilado está em dia")
+    args = parser.parse_args()
+
+    if args.verificar:
+        from utils.lexico_pt import VERSAO
+
+        atual = versao(stopwords_das_fontes(), radicais_das_fontes())
+        if atual != VERSAO:
+            raise SystemExit(f"utils/lexico_pt.py desatualizado ({VERSAO} != {atual}): rode python -m utils.lexico")
+        print(f"Léxico em dia (versão {VERSAO})")
+    else:
+        palavras, radicais = compilar()
+        print(f"{len(palavras)} stopwords e {len(radicais)} radicais em {MODULO_COMPILADO} "
+              f"(versão {versao(palavras, radicais)})")
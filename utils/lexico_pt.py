@@ -0,0 +1,453 @@
+# Gerado por `python -m utils.lexico` a partir de nltk_data/corpora/stopwords/portuguese
+# e de utils/texto.NOVAS_STOPWORDS. Não editar à mão.
+VERSAO = 'fba68be384b11b73'
+
+STOPWORDS = frozenset({
+    'a',
+    'absurdo',
+    'agora',
+    'ai',
+    'ainda',
+    'alem',
+    'algum',
+    'alguma',
+    'algumas',
+    'alguns',
+    'amanha',
+    'ano',
+    'ao',
+    'aos',
+    'apenas',
+    'apos',
+    'aquela',
+    'aquelas',
+    'aquele',
+    'aqueles',
+    'aqui',
+    'aquilo',
+    'as',
+    'assim',
+    'ate',
+    'bem',
+    'bom',
+    'cada',
+    'casa',
+    'caso',
+    'chegar',
+    'chegou',
+    'cliente',
+    'clientes',
+    'coisa',
+    'coisas',
+    'colocar',
+    'coloquei',
+    'com',
+    'como',
+    'compra',
+    'comprar',
+    'comprei',
+    'da',
+    'das',
+    'data',
+    'de',
+    'dela',
+    'delas',
+    'dele',
+    'deles',
+    'dentro',
+    'depois',
+    'deram',
+    'deu',
+    'dia',
+    'dias',
+    'disse',
+    'disseram',
+    'dizem',
+    'dizendo',
+    'dizer',
+    'do',
+    'dos',
+    'e',
+    'editado',
+    'editar',
+    'ela',
+    'elas',
+    'ele',
+    'eles',
+    'em',
+    'empresa',
+    'entao',
+    'entre',
+    'era',
+    'eram',
+    'eramos',
+    'essa',
+    'essas',
+    'esse',
+    'esses',
+    'esta',
+    'estamos',
+    'estao',
+    'estar',
+    'estas',
+    'estava',
+    'estavam',
+    'estavamos',
+    'este',
+    'esteja',
+    'estejam',
+    'estejamos',
+    'estes',
+    'esteve',
+    'estive',
+    'estivemos',
+    'estiver',
+    'estivera',
+    'estiveram',
+    'estiveramos',
+    'estiverem',
+    'estivermos',
+    'estivesse',
+    'estivessem',
+    'estivessemos',
+    'estou',
+    'eu',
+    'falar',
+    'falaram',
+    'falei',
+    'falou',
+    'falta',
+    'faltar',
+    'favor',
+    'fazendo',
+    'fazer',
+    'ficou',
+    'fiquei',
+    'fiz',
+    'foi',
+    'fomos',
+    'for',
+    'fora',
+    'foram',
+    'foramos',
+    'forem',
+    'forma',
+    'formos',
+    'fosse',
+    'fossem',
+    'fossemos',
+    'fui',
+    'ha',
+    'haja',
+    'hajam',
+    'hajamos',
+    'hao',
+    'havemos',
+    'haver',
+    'havia',
+    'hei',
+    'hoje',
+    'hora',
+    'houve',
+    'houvemos',
+    'houver',
+    'houvera',
+    'houveram',
+    'houveramos',
+    'houverao',
+    'houverei',
+    'houverem',
+    'houveremos',
+    'houveria',
+    'houveriam',
+    'houveriamos',
+    'houvermos',
+    'houvesse',
+    'houvessem',
+    'houvessemos',
+    'informar',
+    'informe',
+    'informou',
+    'ir',
+    'iria',
+    'isso',
+    'isto',
+    'ja',
+    'la',
+    'levar',
+    'lhe',
+    'lhes',
+    'loja',
+    'mais',
+    'mal',
+    'mas',
+    'mau',
+    'me',
+    'menos',
+    'mesma',
+    'mesmo',
+    'meu',
+    'meus',
+    'mim',
+    'minha',
+    'minhas',
+    'momento',
+    'muito',
+    'na',
+    'nada',
+    'nao',
+    'nas',
+    'nem',
+    'nenhum',
+    'nenhuma',
+    'no',
+    'nos',
+    'nossa',
+    'nossas',
+    'nosso',
+    'nossos',
+    'nota',
+    'novamente',
+    'num',
+    'numa',
+    'nunca',
+    'o',
+    'ocorreram',
+    'ocorrido',
+    'onde',
+    'ontem',
+    'os',
+    'ou',
+    'outra',
+    'outro',
+    'pagar',
+    'para',
+    'passar',
+    'pedi',
+    'pela',
+    'pelas',
+    'pelo',
+    'pelos',
+    'pessoa',
+    'poder',
+    'poderia',
+    'pois',
+    'por',
+    'porem',
+    'porque',
+    'pouco',
+    'pq',
+    'pra',
+    'problema',
+    'problemas',
+    'produto',
+    'produtos',
+    'q',
+    'quaisquer',
+    'qual',
+    'qualquer',
+    'quando',
+    'que',
+    'quem',
+    'querer',
+    'queria',
+    'quero',
+    'r',
+    'reais',
+    'recebeu',
+    'recebi',
+    'reclamacao',
+    'reclamacoes',
+    'reclame',
+    'sao',
+    'se',
+    'seja',
+    'sejam',
+    'sejamos',
+    'sem',
+    'sempre',
+    'sendo',
+    'ser',
+    'sera',
+    'serao',
+    'serei',
+    'seremos',
+    'seria',
+    'seriam',
+    'seriamos',
+    'servico',
+    'servicos',
+    'seu',
+    'seus',
+    'simples',
+    'simplesmente',
+    'so',
+    'sobre',
+    'somos',
+    'sou',
+    'sua',
+    'suas',
+    'tambem',
+    'te',
+    'tem',
+    'temos',
+    'tempo',
+    'tenha',
+    'tenham',
+    'tenhamos',
+    'tenho',
+    'ter',
+    'tera',
+    'terao',
+    'terei',
+    'teremos',
+    'teria',
+    'teriam',
+    'teriamos',
+    'teu',
+    'teus',
+    'teve',
+    'tinha',
+    'tinham',
+    'tinhamos',
+    'tive',
+    'tivemos',
+    'tiver',
+    'tivera',
+    'tiveram',
+    'tiveramos',
+    'tiverem',
+    'tivermos',
+    'tivesse',
+    'tivessem',
+    'tivessemos',
+    'toda',
+    'todas',
+    'todo',
+    'todos',
+    'total',
+    'tu',
+    'tua',
+    'tuas',
+    'tudo',
+    'um',
+    'uma',
+    'ver',
+    'vez',
+    'vir',
+    'voce',
+    'voces',
+    'volta',
+    'voltar',
+    'vos',
+    'vou',
+})
+
+RADICAIS_STOPWORDS = frozenset({
+    'absurd',
+    'agor',
+    'ai',
+    'aind',
+    'alem',
+    'algum',
+    'alguns',
+    'amanh',
+    'amanha',
+    'ano',
+    'apen',
+    'apos',
+    'aqu',
+    'assim',
+    'bem',
+    'bom',
+    'cad',
+    'cheg',
+    'client',
+    'cois',
+    'coloc',
+    'coloqu',
+    'dat',
+    'dentr',
+    'der',
+    'deu',
+    'dia',
+    'dias',
+    'diss',
+    'diz',
+    'edit',
+    'empres',
+    'enta',
+    'fal',
+    'falt',
+    'favor',
+    'faz',
+    'fic',
+    'fiqu',
+    'fiz',
+    'form',
+    'hav',
+    'hoj',
+    'ir',
+    'iri',
+    'ja',
+    'la',
+    'lev',
+    'loj',
+    'mais',
+    'mau',
+    'men',
+    'mesm',
+    'mim',
+    'minh',
+    'moment',
+    'muit',
+    'na',
+    'nad',
+    'nao',
+    'nenhum',
+    'nov',
+    'nunc',
+    'ocorr',
+    'onde',
+    'ontem',
+    'outr',
+    'pass',
+    'pesso',
+    'pod',
+    'pois',
+    'por',
+    'porem',
+    'porqu',
+    'pouc',
+    'pq',
+    'problem',
+    'produt',
+    'q',
+    'quaisqu',
+    'qualqu',
+    'quand',
+    'quem',
+    'quer',
+    'r',
+    'rea',
+    'receb',
+    'reclam',
+    'reclamaca',
+    'reclamaco',
+    'sempr',
+    'send',
+    'ser',
+    'servic',
+    'simpl',
+    'simples',
+    'sobr',
+    'ter',
+    'tiv',
+    'tod',
+    'total',
+    'tud',
+    'vez',
+    'vir',
+    'volt',
+    'vou',
+})
@@ -0,0 +1,101 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+# --- Manifesto dos arquivos de dados (datasets/manifesto.json) ---
+# Para cada arquivo de origem: mtime, tamanho, hash do conteúdo e número de linhas. A verificação
+# a cada rerun é só um os.stat; o hash é recalculado apenas quando tamanho ou mtime mudam.
+# A versão (hash) de cada fonte entra na chave do cache das funções que dependem dela
+# (ver utils/carregamento.py), de modo que trocar um CSV invalida somente os seus derivados.
+# Os artefatos em disco também guardam a versão da fonte de que derivam e são refeitos quando ela
+# muda: índice de busca (utils/busca.py), frases (utils/ngramas.py), agregados por empresa
+# (utils/empresas.py) e o estado do detector de anomalias (utils/anomalias.py).
+
+ARQUIVO_PADRAO = Path(__file__).resolve().parent.parent / "datasets" / "manifesto.json"
+
+_entradas = None  # path absoluto -> {"mtime_ns", "tamanho", "sha256", "linhas"}
+_alteradas = set()  # chaves atualizadas por este processo desde a última gravação
+_trava = threading.Lock()
+
+
+def _carregar():
+    global _entradas
+    if _entradas is None:
+        try:
+            _entradas = json.loads(ARQUIVO_PADRAO.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            _entradas = {}
+    return _entradas
+
+
+def _salvar(chave):
+    # Escrita atômica: outro processo nunca lê um manifesto pela metade
+    _alteradas.add(chave)
+    ARQUIVO_PADRAO.parent.mkdir(parents=True, exist_ok=True)
+    try:
+        # Parte do que está em disco (entradas gravadas por outros processos desde a nossa leitura)
+        # e aplica por cima só as entradas que este processo atualizou: as nossas são as mais novas
+        no_disco = json.loads(ARQUIVO_PADRAO.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        no_disco = {}
+    no_disco.update({c: _entradas[c] for c in _alteradas if c in _entradas})
+    _entradas.clear()
+    _entradas.update(no_disco)
+    tmp = ARQUIVO_PADRAO.with_name(f".{ARQUIVO_PADRAO.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_text(json.dumps(_entradas, indent=1, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, ARQUIVO_PADRAO)
+    _alteradas.clear()
+
+
+def versao_arquivo(path):
+    """SHA-256 do conteúdo do arquivo (None se não existe), consultando o manifesto antes de ler."""
+    try:
+        info = os.stat(path)
+    except OSError:
+        return None
+    chave = os.path.abspath(path)
+    with _trava:
+        entrada = _carregar().get(chave)
+    if entrada and entrada["tamanho"] == info.st_size and entrada["mtime_ns"] == info.st_mtime_ns:
+        return entrada["sha256"]
+
+    with open(path, "rb") as f:
+        digest = hashlib.file_digest(f, "sha256").hexdigest()
+    with _trava:
+        entradas = _carregar()
+        linhas = entradas.get(chave, {}).get("linhas") if entrada and entrada["sha256"] == digest else None
+        entradas[chave] = {"mtime_ns": info.st_mtime_ns, "tamanho": info.st_size, "sha256": digest, "linhas": linhas}
+        _salvar(chave)
+    return digest
+
+
+def versao_fontes(fontes):
+    """Versões de arquivos e pastas (pastas: todos os arquivos, recursivamente), como tupla ordenada."""
+    versoes = []
+    for fonte in sorted(str(f) for f in fontes if f is not None):
+        p = Path(fonte)
+        if p.is_dir():
+            arquivos = sorted(a for a in p.rglob("*") if a.is_file() and "__pycache__" not in a.parts)
+        else:
+            arquivos = [p]
+        versoes.extend((arquivo.as_posix(), versao_arquivo(arquivo)) for arquivo in arquivos)
+    return tuple(versoes)
+
+
+def registrar_linhas(path, linhas):
+    """Anota o número de linhas lido pela função de carga (sem custo extra de leitura)."""
+    versao_arquivo(path)
+    chave = os.path.abspath(path)
+    with _trava:
+        entrada = _carregar().get(chave)
+        if entrada is not None and entrada.get("linhas") != linhas:
+            entrada["linhas"] = int(linhas)
+            _salvar(chave)
+
+
+def manifesto():
+    """Cópia das entradas atuais (path, tamanho, mtime, hash, linhas)."""
+    with _trava:
+        return {path: dict(entrada) for path, entrada in _carregar().items()}
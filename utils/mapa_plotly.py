@@ -0,0 +1,80 @@
+import numpy as np
+import plotly.graph_objects as go
+from plotly.colors import sample_colorscale
+
+# --- Mapa coroplético em Plotly (alternativa leve ao folium) ---
+# A geometria (GeoJSON em cache por estado, ver utils/carregamento.load_geojson_mapa) não é recalculada
+# a cada rerun; o que muda com os filtros é só o vetor z (faixa de cor de cada localidade) e o texto
+# do hover. Não há árvore de objetos do folium nem HTML do Leaflet montado no servidor, mas a figura
+# é refeita a cada rerun e o st.plotly_chart envia a especificação inteira (GeoJSON incluído).
+# Requer plotly >= 5.24 (go.Choroplethmap).
+
+COR_SEM_DADOS = "#bdbdbd"
+ESTILO_MAPA = "carto-positron"
+
+
+def escala_discreta(cores):
+    """Escala de cores em degraus para z inteiro em 0..len(cores)-1."""
+    n = len(cores)
+    escala = []
+    for i, cor in enumerate(cores):
+        escala += [[i / n, cor], [(i + 1) / n, cor]]
+    return escala
+
+
+def faixas_para_classes(valores, faixas):
+    """Índice da faixa de cada valor (NaN para quem não tem valor), com os mesmos limites do folium."""
+    valores = np.asarray(valores, dtype=float)
+    classes = np.clip(np.searchsorted(faixas, valores, side="right") - 1, 0, len(faixas) - 2).astype(float)
+    classes[np.isnan(valores)] = np.nan
+    return classes
+
+
+def rotulos_faixas(faixas):
+    return [f"{a:,.2f} – {b:,.2f}" for a, b in zip(faixas[:-1], faixas[1:])]
+
+
+def figura_mapa(geojson, ids, classes, cores, rotulos, hover, centro, zoom, titulo=None):
+    """Figura do mapa: um único traço (o GeoJSON vai uma vez só), com as localidades sem dados na
+    primeira cor da escala, em cinza.
+
+    classes: índice da cor de cada id (NaN = sem dados); rotulos: legenda de cada cor;
+    hover: DataFrame (na ordem de ids) cujas colunas aparecem ao passar o mouse.
+    """
+    classes = np.asarray(classes, dtype=float)
+    sem_dados = np.isnan(classes)
+    if sem_dados.any():
+        cores, rotulos = [COR_SEM_DADOS] + list(cores), ["Sem dados"] + list(rotulos)
+        z = np.where(sem_dados, 0, classes + 1)
+    else:
+        z = classes
+    linhas_hover = "<br>".join(f"{coluna}: %{{customdata[{i}]}}" for i, coluna in enumerate(hover.columns))
+
+    fig = go.Figure(go.Choroplethmap(
+        geojson=geojson, locations=np.asarray(ids, dtype=object), z=z,
+        colorscale=escala_discreta(cores), zmin=-0.5, zmax=len(cores) - 0.5,
+        marker_opacity=0.7, marker_line_width=0.3, customdata=hover.to_numpy(dtype=object),
+        hovertemplate=f"<b>%{{location}}</b><br>{linhas_hover}<extra></extra>",
+        colorbar=dict(title=titulo, tickvals=list(range(len(cores))), ticktext=rotulos),
+    ))
+    fig.update_layout(
+        map=dict(style=ESTILO_MAPA, center=dict(lat=centro[0], lon=centro[1]), zoom=zoom),
+        margin=dict(l=0, r=0, t=0, b=0), height=800,
+    )
+    return fig
+
+
+def figura_metrica(geojson, ids, valores, faixas, hover, centro, zoom, titulo=None):
+    """Mapa de uma métrica contínua, nas faixas de utils/classificacao (escala YlOrRd, como no folium)."""
+    cores = sample_colorscale("YlOrRd", np.linspace(0, 1, len(faixas) - 1))
+    return figura_mapa(geojson, ids, faixas_para_classes(valores, faixas), cores, rotulos_faixas(faixas),
+                       hover, centro, zoom, titulo)
+
+
+def figura_categorias(geojson, ids, categorias, cores_por_categoria, hover, centro, zoom, titulo=None):
+    """Mapa de classes categóricas (ex.: hot spots), uma cor por categoria presente."""
+    presentes = [c for c in cores_por_categoria if c in set(categorias)]
+    indice = {c: i for i, c in enumerate(presentes)}
+    classes = np.array([indice.get(c, np.nan) for c in categorias], dtype=float)
+    return figura_mapa(geojson, ids, classes, [cores_por_categoria[c] for c in presentes], presentes,
+                       hover, centro, zoom, titulo)
@@ -0,0 +1,231 @@
+import json
+import re
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.artefatos import pasta_atual, publicar
+from utils.manifesto import versao_arquivo
+from utils.texto import carregar_stopwords, radicalizador, remover_acentos, tokenizar
+
+# --- Frases frequentes (bigramas e trigramas) por reclamação, em matriz esparsa no disco ---
+# O texto é lido uma única vez na construção: cada reclamação vira uma linha de uma matriz CSR
+# (reclamação x frase) com a contagem de cada frase. A contagem de um recorte qualquer dos filtros
+# é então uma soma esparsa (máscara @ matriz), sem reler as descrições a cada rerun.
+# Cada frase guarda também o PMI normalizado (NPMI) calculado no corpus inteiro, que separa
+# colocações ("cartão de crédito", "não recebi") de sequências casuais de palavras comuns.
+# Na mesma passagem é montada a matriz de termos (radicais, sem as stopwords da WordCloud, ver
+# utils/texto.Stopwords), usada na comparação entre grupos de reclamações (utils/contraste.py).
+#
+#   data[indptr[i]:indptr[i+1]], indices[...]              -> contagens das frases da reclamação i
+#   termo_data[termo_indptr[i]:termo_indptr[i+1]], ...     -> contagens dos termos da reclamação i
+#
+# As frases não atravessam pontuação: "demorou, pedido atrasado" não gera "demorou pedido".
+# Cada construção é publicada numa subpasta nova (utils/artefatos.py), sem regravar arrays abertos via mmap.
+VERSAO_NGRAMAS = 4
+ARRAYS = ("indptr", "indices", "data", "npmi", "termo_indptr", "termo_indices", "termo_data")
+
+# Palavras de ligação: uma frase não começa nem termina nelas ("estorno no cartão" vale, "no cartão" não)
+CONECTIVOS = frozenset("""
+a o as os um uma uns umas de da do das dos em no na nos nas num numa e ou que para pra pro por pelo pela
+pelos pelas com sem se me te lhe lhes ao aos eu ele ela eles elas voce voces meu minha meus minhas seu sua
+seus suas mas como mais muito ja foi era ser sao estava esta este esse essa isso isto aquele aquela la
+""".split())
+
+
+# Fim de oração ou de enumeração: as janelas de n-gramas recomeçam depois de cada um
+_FRONTEIRA = re.compile(r"[.,;:!?()\[\]{}\"“”…\n\r\t]+|\s[-–—]+\s")
+
+
+def _segmentos(texto):
+    """Trechos do texto entre sinais de pontuação (só os que têm algum caractere)."""
+    if not isinstance(texto, str):
+        return []
+    return [trecho for trecho in _FRONTEIRA.split(texto) if trecho.strip()]
+
+
+def _assinatura_fonte(path):
+    # Versão do conteúdo (manifesto): tocar o CSV sem mudá-lo não refaz o artefato
+    return {"arquivo": str(path), "sha256": versao_arquivo(path)}
+
+
+def _valido(chaves):
+    return (chaves[0] not in CONECTIVOS and chaves[-1] not in CONECTIVOS
+            and not any(c.isdigit() or len(c) < 2 for c in chaves))
+
+
+def _ngramas(chaves, n_max):
+    for n in range(2, n_max + 1):
+        for i in range(len(chaves) - n + 1):
+            gram = tuple(chaves[i:i + n])
+            if _valido(gram):
+                yield i, gram
+
+
+def _csr(linhas):
+    """Arrays CSR de uma lista de {coluna: contagem}; mesmo tipo nos índices e contagens em float32,
+    para que o scipy use os mmaps sem convertê-los."""
+    indptr, indices, data = [0], [], []
+    for contagem in linhas:
+        colunas = sorted(contagem)
+        indices.extend(colunas)
+        data.extend(contagem[c] for c in colunas)
+        indptr.append(len(indices))
+    tipo_indice = np.int32 if len(indices) < np.iinfo(np.int32).max else np.int64
+    return (np.asarray(indptr, dtype=tipo_indice), np.asarray(indices, dtype=tipo_indice),
+            np.asarray(data, dtype=np.float32))
+
+
+class MatrizFrases:
+    """Contagens de frases (com o NPMI de cada uma no corpus) e de termos por reclamação, em CSR."""
+
+    def __init__(self, diretorio):
+        self.diretorio = Path(diretorio)
+        self.meta = json.loads((self.diretorio / "meta.json").read_text(encoding="utf-8"))
+        self.frases = json.loads((self.diretorio / "frases.json").read_text(encoding="utf-8"))
+        self.termos = json.loads((self.diretorio / "termos.json").read_text(encoding="utf-8"))
+        for nome in ARRAYS:
+            setattr(self, nome, np.load(self.diretorio / f"{nome}.npy", mmap_mode="r"))
+        self.n_docs = self.meta["n_docs"]
+        self._matriz = None
+        self._matriz_termos = None
+
+    # --- Construção ---
+    @staticmethod
+    def construir(textos, diretorio, fonte=None, n_max=3, min_docs=5):
+        """Duas passagens pelo texto: contagem global (para o corte por `min_docs` e o NPMI) e matrizes."""
+        from utils.lexico_pt import VERSAO as VERSAO_LEXICO
+
+        normalizar = {}
+        radical = radicalizador()
+        stopwords = carregar_stopwords()
+
+        def chaves_do_texto(texto):
+            """[(tokens, chaves sem acentos)] de cada trecho entre pontuações."""
+            trechos = []
+            for trecho in _segmentos(texto):
+                tokens = tokenizar(trecho, acentos=True)
+                trechos.append((tokens, [normalizar.setdefault(t, remover_acentos(t)) for t in tokens]))
+            return trechos
+
+        textos = list(textos)
+        unigramas, ngramas, docs_com, posicoes = Counter(), Counter(), Counter(), Counter()
+        for texto in textos:
+            grams = []
+            for _, chaves in chaves_do_texto(texto):
+                unigramas.update(chaves)
+                for n in range(2, n_max + 1):
+                    posicoes[n] += max(len(chaves) - n + 1, 0)
+                grams += [gram for _, gram in _ngramas(chaves, n_max)]
+            ngramas.update(grams)
+            docs_com.update(set(grams))
+
+        mantidos = sorted(gram for gram, n in docs_com.items() if n >= min_docs)
+        indice = {gram: i for i, gram in enumerate(mantidos)}
+
+        # NPMI = log(p(frase) / prod p(palavra)) / ((n - 1) * -log p(frase)), em [-1, 1]; p(frase) sobre
+        # todas as posições de n-grama do corpus
+        total_uni = sum(unigramas.values())
+        npmi = np.empty(len(mantidos), dtype=np.float32)
+        for i, gram in enumerate(mantidos):
+            p_frase = ngramas[gram] / posicoes[len(gram)]
+            p_palavras = np.prod([unigramas[c] / total_uni for c in gram])
+            npmi[i] = np.log(p_frase / p_palavras) / ((len(gram) - 1) * -np.log(p_frase)) if p_frase < 1 else 1.0
+        npmi = np.clip(npmi, -1, 1)
+
+        # Matrizes de frases e de termos, com a grafia mais frequente de cada frase e de cada radical
+        linhas_frases, linhas_termos = [], []
+        grafias = [Counter() for _ in mantidos]
+        indice_termos, grafias_termos = {}, []
+        for texto in textos:
+            trechos = chaves_do_texto(texto)
+            contagem = Counter()
+            for tokens, chaves in trechos:
+                for inicio, gram in _ngramas(chaves, n_max):
+                    i = indice.get(gram)
+                    if i is not None:
+                        contagem[i] += 1
+                        grafias[i][" ".join(tokens[inicio:inicio + len(gram)])] += 1
+            linhas_frases.append(contagem)
+
+            contagem = Counter()
+            for token in (token for tokens, _ in trechos for token in tokens):
+                chave = radical(token)
+                if len(token) < 2 or token.isdigit() or stopwords.descarta(token, chave):
+                    continue
+                i = indice_termos.setdefault(chave, len(indice_termos))
+                if i == len(grafias_termos):
+                    grafias_termos.append(Counter())
+                contagem[i] += 1
+                grafias_termos[i][token] += 1
+            linhas_termos.append(contagem)
+
+        arrays = _csr(linhas_frases) + (npmi,) + _csr(linhas_termos)
+        frases = [g.most_common(1)[0][0] for g in grafias]
+        termos = [g.most_common(1)[0][0] for g in grafias_termos]
+        meta = {"versao": VERSAO_NGRAMAS, "n_docs": len(textos), "n_max": n_max, "min_docs": min_docs,
+                "lexico": VERSAO_LEXICO, "fonte": fonte}
+
+        def escrever(pasta):
+            for nome, array in zip(ARRAYS, arrays):
+                np.save(pasta / f"{nome}.npy", array)
+            (pasta / "frases.json").write_text(json.dumps(frases, ensure_ascii=False), encoding="utf-8")
+            (pasta / "termos.json").write_text(json.dumps(termos, ensure_ascii=False), encoding="utf-8")
+            (pasta / "meta.json").write_text(json.dumps(meta, ensure_ascii=False), encoding="utf-8")
+
+        return MatrizFrases(publicar(diretorio, escrever))
+
+    @staticmethod
+    def abrir_ou_construir(path_csv, diretorio, carregar_textos):
+        """Abre a matriz em disco; reconstrói se não existir, se o CSV de origem mudou ou se as stopwords mudaram."""
+        from utils.lexico_pt import VERSAO as VERSAO_LEXICO
+
+        fonte = _assinatura_fonte(path_csv)
+        pasta = pasta_atual(diretorio)
+        if pasta is not None:
+            meta = json.loads((pasta / "meta.json").read_text(encoding="utf-8"))
+            if (meta.get("versao") == VERSAO_NGRAMAS and meta.get("fonte") == fonte
+                    and meta.get("lexico") == VERSAO_LEXICO):
+                return MatrizFrases(pasta)
+        return MatrizFrases.construir(carregar_textos(), diretorio, fonte=fonte)
+
+    # --- Consultas ---
+    def matriz(self):
+        if self._matriz is None:
+            from scipy import sparse
+
+            self._matriz = sparse.csr_matrix((self.data, self.indices, self.indptr),
+                                             shape=(self.n_docs, len(self.frases)))
+        return self._matriz
+
+    def matriz_termos(self):
+        if self._matriz_termos is None:
+            from scipy import sparse
+
+            self._matriz_termos = sparse.csr_matrix((self.termo_data, self.termo_indices, self.termo_indptr),
+                                                    shape=(self.n_docs, len(self.termos)))
+        return self._matriz_termos
+
+    def contagem_termos(self, mask):
+        """Ocorrências de cada termo (radical) nas reclamações da máscara."""
+        return np.asarray(self.matriz_termos().T @ np.asarray(mask, dtype=np.float32)).astype(np.int64)
+
+    def contagem(self, mask):
+        """Ocorrências de cada frase nas reclamações da máscara (soma esparsa das linhas)."""
+        pesos = np.asarray(mask, dtype=np.float32)
+        return np.asarray(self.matriz().T @ pesos).astype(np.int64)
+
+    def principais(self, mask, n=50, npmi_min=0.0):
+        """As `n` frases mais relevantes do recorte: contagem no recorte x NPMI, só colocações (NPMI > npmi_min)."""
+        contagem = self.contagem(mask)
+        npmi = np.asarray(self.npmi)
+        pontuacao = np.where((contagem > 0) & (npmi > npmi_min), contagem * npmi, 0)
+        melhores = np.argsort(-pontuacao, kind="stable")[:n]
+        melhores = melhores[pontuacao[melhores] > 0]
+        return pd.DataFrame({
+            "FRASE": [self.frases[i] for i in melhores],
+            "FREQUENCIA": contagem[melhores],
+            "NPMI": npmi[melhores].round(3),
+        })
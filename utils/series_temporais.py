@@ -0,0 +1,118 @@
+import numpy as np
+import pandas as pd
+
+# --- Motor de séries temporais ---
+# Guarda as contagens diárias acumuladas por (UF, STATUS) em um array denso,
+# de forma que qualquer intervalo de datas é respondido em O(1) por somas de prefixo.
+
+# Granularidades suportadas: (rótulo, frequência do pandas, formato do eixo X)
+GRANULARIDADES = {
+    "Dia": ("D", "%d/%m"),
+    "Semana": ("W", "%d/%m"),
+    "Mês": ("M", "%m/%Y"),
+    "Trimestre": ("Q", "%m/%Y"),
+}
+
+
+def escolher_granularidade(data_inicio, data_fim):
+    """Escolhe a granularidade do gráfico pelo tamanho do intervalo."""
+    dias = (pd.Timestamp(data_fim) - pd.Timestamp(data_inicio)).days + 1
+    if dias <= 92:
+        return "Dia"
+    if dias <= 366:
+        return "Semana"
+    if dias <= 3 * 366:
+        return "Mês"
+    return "Trimestre"
+
+
+class SerieTemporal:
+    """Contagens diárias acumuladas por UF e STATUS.
+
+    `acumulado[d, u, s]` é o total de reclamações da UF `u` com status `s`
+    nos dias anteriores ao dia `d` (contado a partir de `inicio`).
+    """
+
+    def __init__(self, df, col_data="TEMPO", col_uf="NOME_UF", col_status="STATUS"):
+        datas = pd.to_datetime(df[col_data]).dt.normalize()
+        validos = datas.notna().to_numpy()
+        datas = datas[validos]
+
+        self.ufs = sorted(df[col_uf].dropna().unique().tolist())
+        self.status = sorted(df[col_status].dropna().unique().tolist())
+
+        if datas.empty:
+            self.inicio = pd.Timestamp("1970-01-01")
+            self.n_dias = 0
+            self.acumulado = np.zeros((1, len(self.ufs), len(self.status)), dtype=np.int64)
+            return
+
+        self.inicio = datas.min()
+        self.n_dias = (datas.max() - self.inicio).days + 1
+
+        dia = (datas - self.inicio).dt.days.to_numpy()
+        uf = pd.Categorical(df.loc[validos, col_uf], categories=self.ufs).codes
+        status = pd.Categorical(df.loc[validos, col_status], categories=self.status).codes
+        ok = (uf >= 0) & (status >= 0)
+
+        n_uf, n_status = len(self.ufs), len(self.status)
+        chave = (dia[ok] * n_uf + uf[ok]) * n_status + status[ok]
+        diario = np.bincount(chave, minlength=self.n_dias * n_uf * n_status)
+        diario = diario.reshape(self.n_dias, n_uf, n_status)
+
+        # Linha extra de zeros no início para que acumulado[fim + 1] - acumulado[inicio] funcione
+        self.acumulado = np.zeros((self.n_dias + 1, n_uf, n_status), dtype=np.int64)
+        np.cumsum(diario, axis=0, out=self.acumulado[1:])
+
+    # --- Conversão de datas em índices do array ---
+    def _indice(self, data):
+        dia = (pd.Timestamp(data).normalize() - self.inicio).days
+        return int(np.clip(dia, 0, self.n_dias))
+
+    def _fatia_uf(self, linhas, uf):
+        # linhas: array (..., n_uf, n_status) -> (..., n_status)
+        if uf is None or uf == "Todos":
+            return linhas.sum(axis=-2)
+        if uf not in self.ufs:
+            return np.zeros(linhas.shape[:-2] + (len(self.status),), dtype=np.int64)
+        return linhas[..., self.ufs.index(uf), :]
+
+    def _colunas_status(self, status):
+        if not status:
+            return list(range(len(self.status))), self.status
+        selecionados = [s for s in self.status if s in set(status)]
+        return [self.status.index(s) for s in selecionados], selecionados
+
+    # --- Consultas ---
+    def totais(self, data_inicio, data_fim, uf=None, status=None):
+        """Total por status no intervalo [data_inicio, data_fim] em O(1)."""
+        i, j = self._indice(data_inicio), self._indice(pd.Timestamp(data_fim) + pd.Timedelta(days=1))
+        contagem = self._fatia_uf(self.acumulado[j] - self.acumulado[i], uf)
+        idx, nomes = self._colunas_status(status)
+        return pd.Series(contagem[idx], index=nomes, dtype="int64")
+
+    def serie(self, data_inicio, data_fim, uf=None, status=None, granularidade=None):
+        """Série reamostrada (linhas = início de cada período, colunas = status).
+
+        Se `granularidade` for None, ela é escolhida pelo tamanho do intervalo.
+        """
+        if granularidade is None:
+            granularidade = escolher_granularidade(data_inicio, data_fim)
+        freq = GRANULARIDADES[granularidade][0]
+
+        inicio = max(pd.Timestamp(data_inicio).normalize(), self.inicio)
+        fim = min(pd.Timestamp(data_fim).normalize(), self.inicio + pd.Timedelta(days=self.n_dias - 1))
+        idx, nomes = self._colunas_status(status)
+        if self.n_dias == 0 or fim < inicio:
+            return pd.DataFrame(columns=nomes, dtype="int64")
+
+        # Limites de cada período (início de cada balde), recortados ao intervalo pedido
+        rotulos = pd.period_range(inicio, fim, freq=freq).to_timestamp(how="start")
+        limites = np.append((rotulos.where(rotulos > inicio, inicio) - self.inicio).days, (fim - self.inicio).days + 1)
+
+        linhas = self.acumulado[limites]
+        contagem = self._fatia_uf(np.diff(linhas, axis=0), uf)[:, idx]
+
+        df = pd.DataFrame(contagem, index=pd.DatetimeIndex(rotulos, name="DATA"), columns=nomes)
+        df.columns.name = "STATUS"
+        return df
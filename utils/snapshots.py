@@ -0,0 +1,147 @@
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# --- Histórico de status por coleta (snapshots) ---
+# Cada coleta do Reclame Aqui grava um arquivo Parquet próprio (log colunar somente-acréscimo)
+# com ID, DATA_COLETA e STATUS. Transições e tempos até resposta/resolução são derivados com
+# uma única ordenação por (ID, DATA_COLETA) e operações deslocadas, sem junções quadráticas.
+
+DIRETORIO_PADRAO = Path(__file__).resolve().parent.parent / "datasets" / "snapshots"
+
+EVENTOS = {
+    "Resolução": ["Resolvido"],
+    "Primeira resposta": ["Respondida", "Em réplica", "Resolvido", "Não resolvido"],
+}
+
+
+def ingerir_snapshot(df, data_coleta, diretorio=DIRETORIO_PADRAO):
+    """Acrescenta uma coleta ao log. Uma coleta já gravada para a mesma data não é sobrescrita."""
+    data_coleta = pd.Timestamp(data_coleta).normalize()
+    diretorio = Path(diretorio)
+    diretorio.mkdir(parents=True, exist_ok=True)
+    caminho = diretorio / f"coleta={data_coleta:%Y-%m-%d}.parquet"
+    if caminho.exists():
+        raise FileExistsError(f"Já existe uma coleta para {data_coleta:%Y-%m-%d}: {caminho}")
+
+    snapshot = pd.DataFrame({
+        "ID": df["ID"].to_numpy(dtype=np.uint32),
+        "DATA_COLETA": np.full(len(df), data_coleta.to_datetime64()),
+        "STATUS": df["STATUS"].astype("category"),
+    })
+    # Grava em arquivo temporário e renomeia: leitores nunca veem uma coleta pela metade
+    temporario = caminho.with_suffix(".tmp")
+    snapshot.to_parquet(temporario, index=False)
+    temporario.replace(caminho)
+    return caminho
+
+
+def ler_snapshots(diretorio=DIRETORIO_PADRAO):
+    """Todas as coletas, ordenadas por (ID, DATA_COLETA)."""
+    arquivos = sorted(Path(diretorio).glob("coleta=*.parquet"))
+    if not arquivos:
+        return pd.DataFrame({"ID": pd.Series(dtype="uint32"), "DATA_COLETA": pd.Series(dtype="datetime64[ns]"),
+                             "STATUS": pd.Series(dtype="category")})
+    log = pd.concat([pd.read_parquet(a) for a in arquivos], ignore_index=True)
+    log["STATUS"] = log["STATUS"].astype("category")
+    return log.sort_values(["ID", "DATA_COLETA"], kind="stable", ignore_index=True)
+
+
+def transicoes(log):
+    """Mudanças de status entre coletas consecutivas de uma mesma reclamação (ID, DATA, DE, PARA)."""
+    mesma = log["ID"].to_numpy()[1:] == log["ID"].to_numpy()[:-1]
+    status = log["STATUS"].astype(str).to_numpy()
+    mudou = np.concatenate([[False], mesma & (status[1:] != status[:-1])])
+    anterior = np.concatenate([[None], status[:-1]])
+    return pd.DataFrame({
+        "ID": log["ID"].to_numpy()[mudou],
+        "DATA_COLETA": log["DATA_COLETA"].to_numpy()[mudou],
+        "DE": anterior[mudou],
+        "PARA": status[mudou],
+    })
+
+
+def tempos_ate_evento(log, reclamacoes, evento="Resolução"):
+    """Tempo (dias) entre a abertura (TEMPO) e o evento, por reclamação.
+
+    O evento ocorre no intervalo (coleta anterior, primeira coleta com o status do evento];
+    usa-se o ponto médio do intervalo (a abertura, se não houver coleta anterior). Reclamações
+    sem o evento são censuradas na última coleta (EVENTO = 0).
+    """
+    alvo = log["STATUS"].isin(EVENTOS[evento]).to_numpy()
+    ids = log["ID"].to_numpy()
+    datas = log["DATA_COLETA"].to_numpy()
+    inicio_grupo = np.concatenate([[True], ids[1:] != ids[:-1]])
+    fim_grupo = np.concatenate([ids[1:] != ids[:-1], [True]])
+    coleta_anterior = np.concatenate([[np.datetime64("NaT")], datas[:-1]]).astype(datas.dtype)
+    coleta_anterior[inicio_grupo] = np.datetime64("NaT")
+
+    # Primeira ocorrência do evento por ID (log já ordenado) e última coleta por ID
+    primeiro = pd.DataFrame({"ID": ids[alvo], "LIMITE_SUP": datas[alvo], "LIMITE_INF": coleta_anterior[alvo]})
+    primeiro = primeiro.drop_duplicates("ID")
+    ultima = pd.DataFrame({"ID": ids[fim_grupo], "ULTIMA_COLETA": datas[fim_grupo]})
+
+    base = reclamacoes[["ID", "TEMPO", "NOME_UF"]].merge(ultima, on="ID", how="inner")
+    base = base.merge(primeiro, on="ID", how="left")
+    base["EVENTO"] = base["LIMITE_SUP"].notna().astype(np.int8)
+    limite_inf = base["LIMITE_INF"].fillna(base["TEMPO"]).where(base["LIMITE_INF"] > base["TEMPO"], base["TEMPO"])
+    momento = limite_inf + (base["LIMITE_SUP"] - limite_inf) / 2
+    momento = momento.where(base["EVENTO"] == 1, base["ULTIMA_COLETA"])
+    base["DIAS"] = ((momento - base["TEMPO"]).dt.total_seconds() / 86400).clip(lower=0)
+    base["PERIODO"] = base["TEMPO"].dt.to_period("Q").astype(str)
+    return base[["ID", "NOME_UF", "PERIODO", "TEMPO", "DIAS", "EVENTO"]]
+
+
+def kaplan_meier(dias, evento):
+    """Curva de sobrevivência (proporção ainda sem o evento) em cada tempo com evento."""
+    dias = np.asarray(dias, dtype=float)
+    evento = np.asarray(evento, dtype=bool)
+    tempos, inverso = np.unique(dias, return_inverse=True)
+    eventos = np.bincount(inverso, weights=evento, minlength=len(tempos))
+    saidas = np.bincount(inverso, minlength=len(tempos))
+    em_risco = len(dias) - np.concatenate([[0], np.cumsum(saidas)[:-1]])
+    sobrevivencia = np.cumprod(1 - eventos / np.maximum(em_risco, 1))
+    com_evento = eventos > 0
+    return pd.DataFrame({"DIAS": np.concatenate([[0.0], tempos[com_evento]]),
+                         "SOBREVIVENCIA": np.concatenate([[1.0], sobrevivencia[com_evento]])})
+
+
+def percentis(curva, quantis=(0.5, 0.75, 0.9)):
+    """Dias até que a fração `q` das reclamações tenha o evento (NaN se a curva não chega lá)."""
+    resultado = {}
+    for q in quantis:
+        atingiu = curva["SOBREVIVENCIA"].to_numpy() <= 1 - q
+        resultado[f"P{int(q * 100)}"] = float(curva["DIAS"].to_numpy()[atingiu][0]) if atingiu.any() else np.nan
+    return resultado
+
+
+def curvas_por_grupo(tempos, coluna):
+    """Curvas de Kaplan-Meier e percentis para cada valor de `coluna` (ex.: NOME_UF, PERIODO)."""
+    curvas, resumo = [], []
+    for grupo, dados in tempos.groupby(coluna, observed=True):
+        curva = kaplan_meier(dados["DIAS"], dados["EVENTO"])
+        curva[coluna] = grupo
+        curvas.append(curva)
+        resumo.append({coluna: grupo, "RECLAMACOES": len(dados), "COM_EVENTO": int(dados["EVENTO"].sum()),
+                       **percentis(curva)})
+    if not curvas:
+        return pd.DataFrame(columns=["DIAS", "SOBREVIVENCIA", coluna]), pd.DataFrame(columns=[coluna])
+    return pd.concat(curvas, ignore_index=True), pd.DataFrame(resumo)
+
+
+if __name__ == "__main__":
+    from utils.esquema import ler_reclamacoes
+
+    parser = argparse.ArgumentParser(description="Acrescenta uma coleta (status atual de cada reclamação) ao histórico.")
+    parser.add_argument("csv", help="CSV de reclamações da coleta")
+    parser.add_argument("--data", required=True, help="Data da coleta (AAAA-MM-DD)")
+    parser.add_argument("--diretorio", help="Padrão: <pasta da empresa do CSV>/snapshots, onde o app procura")
+    args = parser.parse_args()
+    if args.diretorio is None:
+        from utils.empresas import pasta_empresa
+
+        args.diretorio = str(pasta_empresa(args.csv) / "snapshots")
+
+    print(ingerir_snapshot(ler_reclamacoes(args.csv), args.data, args.diretorio))
@@ -0,0 +1,137 @@
+import functools
+import re
+import unicodedata
+from collections import Counter
+
+import pandas as pd
+
+# --- Stopwords do domínio (complementam as stopwords do NLTK na nuvem de palavras) ---
+# Fonte do léxico compilado: depois de editar esta lista, rode `python -m utils.lexico` (ver utils/lexico.py)
+NOVAS_STOPWORDS = ["empresa", "comprei", "loja", "não", "pra", "tive", "minha", "nao", "apenas"
+                   , "ter", "bem", "bom", "muito", "pouco", "mais", "menos", "ainda", "já", "agora", "hoje"
+                   , "ontem", "amanhã", "sempre", "nunca", "todo", "toda", "todos", "todas", "algum", "alguma"
+                   , "alguns", "algumas", "cada", "qualquer", "quaisquer", "quem", "onde", "quando", "como", "porque"
+                   , "dia", "dias", "reclame", "aqui", "problema", "já", "pois", "outro", "outra"
+                   , "lá", "dentro", "toda", "fiz", "R", "vez", "vou", "tudo", "porém", "então", "assim", "havia", "disse"
+                   , "compra", "produto", "produtos", "serviço", "serviços", "cliente", "clientes", "deu", "falou", "sobre"
+                   , "aí", "q", "após", "aí", "ir", "mesma", "passar", "forma", "levar", "comprar", "pedi", "nenhum", "volta"
+                   , "voltar", "fazer", "Além", "fazendo", "favor", "deram", "chegou", "chegar", "ir", "vir", "iria", "quero"
+                   , "queria", "querer", "ser", "caso", "casa", "informar", "informou", "informe", "ano", "reais", "pagar"
+                   , "sendo", "nota", "falta", "faltar", "data", "novamente", "poder", "poderia", "pessoa", "absurdo"
+                   , "momento", "Editado", "Editar", "hora", "falar", "pq", "mal", "colocar", "coloquei", "mal", "mau", "bem"
+                   , "bom", "ficou", "fiquei", "total", "recebi", "recebeu", "nada", "nenhuma", "nenhum", "nada", "tudo"
+                   , "falei", "falaram", "dizer", "dizendo", "dizem", "disseram", "tempo", "coisa", "coisas", "ocorrido"
+                   , "ocorreram", "simples", "simplesmente", "problemas", "problema", "reclamação", "reclamações", "ver"
+                   , "mim", ".", ","]
+
+# Radicais das NOVAS_STOPWORDS que também são radicais de termos de conteúdo ("compra" -> "compr" levaria
+# "compras", "nota" -> "not" levaria "notas", "pedi" -> "ped" levaria "pedido"). Para eles vale só a grafia
+# listada; os demais radicais do domínio descartam todas as flexões.
+RADICAIS_DE_CONTEUDO = ["compr", "ped", "inform", "hor", "not", "com", "pag", "cas", "mal", "temp", "pra", "ver"]
+
+# --- Normalização de texto compartilhada pelos índices de texto ---
+_PALAVRA = re.compile(r"[a-z0-9]+")
+_PALAVRA_ACENTUADA = re.compile(r"[^\W_]+")
+
+
+def remover_acentos(texto):
+    """'Não recebi' -> 'Nao recebi'."""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    return "".join(c for c in decomposto if not unicodedata.combining(c))
+
+
+def tokenizar(texto, acentos=False):
+    """Minúsculas e apenas sequências alfanuméricas; sem acentos, a menos que `acentos=True`."""
+    if not isinstance(texto, str):
+        return []
+    if acentos:
+        return _PALAVRA_ACENTUADA.findall(texto.lower())
+    return _PALAVRA.findall(remover_acentos(texto).lower())
+
+
+class Radicalizador:
+    """Stemmer Snowball (português) com memória: cada token distinto é processado uma única vez.
+
+    O radical é calculado sobre o token acentuado e depois tem os acentos removidos. O stemmer
+    (e o NLTK, de importação lenta) só é carregado no primeiro token que não está na memória.
+    """
+
+    def __init__(self):
+        self._stemmer = None
+        self._memo = {}
+
+    def __call__(self, token):
+        radical = self._memo.get(token)
+        if radical is None:
+            if self._stemmer is None:
+                from nltk.stem.snowball import PortugueseStemmer
+
+                self._stemmer = PortugueseStemmer()
+            radical = self._memo[token] = remover_acentos(self._stemmer.stem(token))
+        return radical
+
+    def radicais(self, texto):
+        return [self(token) for token in tokenizar(texto, acentos=True)]
+
+
+@functools.lru_cache(maxsize=1)
+def radicalizador():
+    """Radicalizador compartilhado pelo processo: a memória de tokens já vistos vale para todas as contagens."""
+    return Radicalizador()
+
+
+class Stopwords:
+    """Stopwords do léxico compilado: palavras comparadas pela grafia sem acentos, radicais pelo radical.
+
+    As stopwords do NLTK (palavras funcionais) só descartam a própria grafia, já que os radicais
+    delas colidem com termos de conteúdo ("pedido" -> "ped", "compras" -> "compr"). Os radicais
+    vêm apenas das stopwords do domínio e do nome da empresa, e descartam todas as flexões.
+    """
+
+    def __init__(self, palavras, radicais):
+        self.palavras = frozenset(palavras)
+        self.radicais = frozenset(radicais)
+
+    def descarta(self, palavra, radical):
+        """True se a `palavra` (minúscula, com ou sem acentos) de radical `radical` é stopword."""
+        return radical in self.radicais or remover_acentos(palavra) in self.palavras
+
+
+def carregar_stopwords(empresa=None):
+    """Stopwords do léxico compilado (utils/lexico_pt.py) somadas ao nome da empresa (ver `Stopwords`).
+
+    O nome da empresa (se informado) também vira stopword, já que aparece em quase toda reclamação.
+    """
+    from utils.lexico_pt import RADICAIS_STOPWORDS, STOPWORDS
+
+    if not empresa:
+        return Stopwords(STOPWORDS, RADICAIS_STOPWORDS)
+    return Stopwords(STOPWORDS | set(tokenizar(empresa)), RADICAIS_STOPWORDS | set(radicalizador().radicais(empresa)))
+
+
+def contar_termos(textos, stopwords):
+    """{palavra: frequência} para a WordCloud, somando as flexões de cada radical.
+
+    `stopwords` vem de `carregar_stopwords`. O radical é calculado uma vez por palavra
+    distinta, e cada radical é exibido na sua grafia mais frequente.
+    """
+    contagem = Counter()
+    for texto in textos:
+        contagem.update(tokenizar(texto, acentos=True))
+    radical = radicalizador()
+    por_chave, grafias = Counter(), {}
+    for palavra, n in contagem.items():
+        chave = radical(palavra)
+        if len(palavra) < 2 or palavra.isdigit() or stopwords.descarta(palavra, chave):
+            continue
+        por_chave[chave] += n
+        if n > grafias.get(chave, ("", 0))[1]:
+            grafias[chave] = (palavra, n)
+    return {grafias[chave][0]: n for chave, n in por_chave.items()}
+
+
+def frequencia_termos(textos, stopwords, max_termos=200):
+    """Frequência das palavras com a mesma contagem da WordCloud (DataFrame TERMO, FREQUENCIA)."""
+    frequencias = contar_termos(textos, stopwords)
+    df = pd.DataFrame(list(frequencias.items()), columns=["TERMO", "FREQUENCIA"])
+    return df.sort_values("FREQUENCIA", ascending=False, ignore_index=True).head(max_termos)
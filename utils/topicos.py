@@ -0,0 +1,171 @@
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from utils.lexico_pt import STOPWORDS, VERSAO as VERSAO_LEXICO
+from utils.texto import tokenizar
+
+# --- Tópicos das reclamações (TF-IDF + NMF, offline e em CPU) ---
+# O modelo é ajustado uma vez (em uma amostra), salvo em disco e depois usado para atribuir
+# tópicos em lotes, inclusive a reclamações novas, sem reajuste. O dashboard lê apenas a
+# tabela pequena ID -> TOPICO e os termos de cada tópico.
+DIRETORIO_PADRAO = Path(__file__).resolve().parent.parent / "datasets" / "topicos"
+
+
+def tokens_topicos(texto):
+    """Tokens sem acentos, descartando números e palavras de uma letra."""
+    return [t for t in tokenizar(texto) if len(t) > 1 and not t.isdigit()]
+
+
+def stopwords_locais():
+    """Stopwords do léxico compilado (utils/lexico_pt.py), já sem acentos."""
+    return sorted(STOPWORDS)
+
+
+class ModeloTopicos:
+    """TF-IDF + NMF. Termos presentes em mais de `max_df` das reclamações são descartados,
+    o que remove o vocabulário comum a todas as queixas ("loja", "carrefour", ...) sem lista manual."""
+
+    def __init__(self, n_topicos=12, n_termos=10, max_features=20_000, min_df=3, max_df=0.5, semente=42):
+        self.n_topicos = n_topicos
+        self.n_termos = n_termos
+        self.parametros_tfidf = dict(max_features=max_features, min_df=min_df, max_df=max_df)
+        self.semente = semente
+        self.vetorizador = None
+        self.nmf = None
+        self.termos = None
+        self.versao_lexico = None
+
+    def ajustar(self, textos, amostra_max=50_000):
+        from sklearn.decomposition import NMF
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        textos = pd.Series(list(textos), dtype=object).fillna("")
+        if len(textos) > amostra_max:
+            textos = textos.sample(amostra_max, random_state=self.semente)
+
+        self.vetorizador = TfidfVectorizer(
+            tokenizer=tokens_topicos,
+            lowercase=False,
+            token_pattern=None,
+            stop_words=stopwords_locais(),
+            sublinear_tf=True,
+            **self.parametros_tfidf,
+        )
+        matriz = self.vetorizador.fit_transform(textos)
+        n_topicos = min(self.n_topicos, matriz.shape[1], matriz.shape[0])
+        self.nmf = NMF(n_components=n_topicos, init="nndsvda", random_state=self.semente, max_iter=400)
+        self.nmf.fit(matriz)
+        self.versao_lexico = VERSAO_LEXICO
+
+        vocabulario = self.vetorizador.get_feature_names_out()
+        principais = np.argsort(-self.nmf.components_, axis=1)[:, :self.n_termos]
+        self.termos = pd.DataFrame({
+            "TOPICO": np.arange(n_topicos),
+            "TERMOS": [", ".join(vocabulario[i]) for i in principais],
+        })
+        return self
+
+    def atribuir(self, textos, tamanho_lote=10_000):
+        """Tópico dominante e seu peso para cada texto (-1 quando nenhum termo conhecido aparece)."""
+        textos = pd.Series(list(textos), dtype=object).fillna("")
+        topicos = np.full(len(textos), -1, dtype=np.int16)
+        pesos = np.zeros(len(textos), dtype=np.float32)
+        for inicio in range(0, len(textos), tamanho_lote):
+            lote = self.nmf.transform(self.vetorizador.transform(textos.iloc[inicio:inicio + tamanho_lote]))
+            fim = inicio + len(lote)
+            pesos[inicio:fim] = lote.max(axis=1)
+            topicos[inicio:fim] = np.where(pesos[inicio:fim] > 0, lote.argmax(axis=1), -1)
+        return topicos, pesos
+
+    # --- Persistência ---
+    def salvar(self, diretorio=DIRETORIO_PADRAO):
+        import joblib
+
+        diretorio = Path(diretorio)
+        diretorio.mkdir(parents=True, exist_ok=True)
+        joblib.dump({"vetorizador": self.vetorizador, "nmf": self.nmf}, diretorio / "modelo.joblib")
+        self.termos.to_csv(diretorio / "termos_topicos.csv", index=False)
+        meta = {"n_topicos": int(len(self.termos)), "lexico": self.versao_lexico}
+        (diretorio / "meta.json").write_text(json.dumps(meta), encoding="utf-8")
+
+    @classmethod
+    def carregar(cls, diretorio=DIRETORIO_PADRAO):
+        import joblib
+
+        diretorio = Path(diretorio)
+        modelo = cls()
+        partes = joblib.load(diretorio / "modelo.joblib")
+        modelo.vetorizador, modelo.nmf = partes["vetorizador"], partes["nmf"]
+        modelo.termos = pd.read_csv(diretorio / "termos_topicos.csv")
+        modelo.n_topicos = len(modelo.termos)
+        modelo.versao_lexico = _meta(diretorio).get("lexico")
+        return modelo
+
+
+def _meta(diretorio):
+    try:
+        return json.loads((Path(diretorio) / "meta.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+
+
+def topicos_desatualizados(diretorio=DIRETORIO_PADRAO):
+    """True se o modelo salvo foi ajustado com outra versão das stopwords (ver utils/lexico.py)."""
+    return (Path(diretorio) / "meta.json").exists() and _meta(diretorio).get("lexico") != VERSAO_LEXICO
+
+
+def salvar_atribuicoes(df, topicos, pesos, diretorio=DIRETORIO_PADRAO, acrescentar=False):
+    """Grava (ou acrescenta) a tabela ID -> TOPICO, PESO_TOPICO usada pelo dashboard."""
+    caminho = Path(diretorio) / "topicos.csv"
+    novas = pd.DataFrame({"ID": df["ID"].to_numpy(), "TOPICO": topicos, "PESO_TOPICO": pesos.astype(float).round(4)})
+    if acrescentar and caminho.exists():
+        anteriores = pd.read_csv(caminho)
+        novas = pd.concat([anteriores[~anteriores["ID"].isin(novas["ID"])], novas], ignore_index=True)
+    novas.to_csv(caminho, index=False)
+    return novas
+
+
+def carregar_topicos(diretorio=DIRETORIO_PADRAO):
+    """(tabela ID -> TOPICO, termos por tópico) ou (None, None) se o pipeline ainda não rodou."""
+    diretorio = Path(diretorio)
+    if not (diretorio / "topicos.csv").exists():
+        return None, None
+    topicos = pd.read_csv(diretorio / "topicos.csv", dtype={"ID": "uint32", "TOPICO": "int16", "PESO_TOPICO": "float32"})
+    return topicos, pd.read_csv(diretorio / "termos_topicos.csv")
+
+
+if __name__ == "__main__":
+    from utils.esquema import ler_reclamacoes
+
+    parser = argparse.ArgumentParser(description="Pipeline offline de tópicos das reclamações.")
+    sub = parser.add_subparsers(dest="comando", required=True)
+    ajustar = sub.add_parser("ajustar", help="Ajusta o modelo e atribui tópicos a todas as reclamações")
+    ajustar.add_argument("csv", help="CSV de reclamações")
+    ajustar.add_argument("--topicos", type=int, default=12)
+    ajustar.add_argument("--amostra", type=int, default=50_000, help="Máximo de reclamações usadas no ajuste")
+    atribuir = sub.add_parser("atribuir", help="Atribui tópicos a reclamações novas com o modelo salvo")
+    atribuir.add_argument("csv", help="CSV com as reclamações novas")
+    for p in (ajustar, atribuir):
+        p.add_argument("--diretorio", help="Padrão: <pasta da empresa do CSV>/topicos, onde o app procura")
+    args = parser.parse_args()
+    if args.diretorio is None:
+        from utils.empresas import pasta_empresa
+
+        args.diretorio = str(pasta_empresa(args.csv) / "topicos")
+
+    df = ler_reclamacoes(args.csv)
+    if args.comando == "ajustar":
+        modelo = ModeloTopicos(n_topicos=args.topicos).ajustar(df["DESCRICAO"], amostra_max=args.amostra)
+        modelo.salvar(args.diretorio)
+    else:
+        if topicos_desatualizados(args.diretorio):
+            # O vocabulário do modelo salvo usa outra lista de stopwords: os tópicos precisam ser reajustados
+            raise SystemExit(f"As stopwords mudaram desde o ajuste do modelo: rode `python -m utils.topicos ajustar {args.csv}`.")
+        modelo = ModeloTopicos.carregar(args.diretorio)
+    topicos, pesos = modelo.atribuir(df["DESCRICAO"])
+    salvar_atribuicoes(df, topicos, pesos, args.diretorio, acrescentar=args.comando == "atribuir")
+    print(modelo.termos.to_string(index=False))
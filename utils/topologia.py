@@ -0,0 +1,159 @@
+import numpy as np
+from shapely.geometry import LineString
+
+# --- TopoJSON compacto para os mapas do folium ---
+# O GeoJSON enviado ao st_folium repete cada divisa entre municípios (uma vez por polígono) em
+# coordenadas float de precisão total. Aqui as geometrias viram TopoJSON: coordenadas quantizadas
+# numa grade inteira, divisas compartilhadas guardadas uma única vez (arcos) e codificadas por
+# diferença. A simplificação é feita por arco, de modo que vizinhos continuam encaixados.
+
+QUANTIZACAO = 10_000  # células da grade em cada eixo
+TOLERANCIA = 0.01  # graus; mesma tolerância do simplify() usado antes nos mapas
+
+
+def _aneis(geometria):
+    """Polígonos da geometria como listas de anéis (exterior primeiro)."""
+    if geometria is None or geometria.is_empty:
+        return []
+    poligonos = geometria.geoms if geometria.geom_type == "MultiPolygon" else [geometria]
+    return [[np.asarray(p.exterior.coords)] + [np.asarray(i.coords) for i in p.interiors] for p in poligonos]
+
+
+def _quantizar(coords, origem, escala):
+    pontos = np.round((coords[:, :2] - origem) / escala).astype(np.int64)
+    # Pontos repetidos após a quantização são descartados
+    manter = np.ones(len(pontos), dtype=bool)
+    manter[1:] = np.any(pontos[1:] != pontos[:-1], axis=1)
+    pontos = pontos[manter]
+    if len(pontos) and tuple(pontos[0]) != tuple(pontos[-1]):
+        pontos = np.vstack([pontos, pontos[:1]])
+    return [tuple(p) for p in pontos.tolist()]
+
+
+def topologia(gdf, nome_objeto, quantizacao=QUANTIZACAO, tolerancia=TOLERANCIA):
+    """TopoJSON (dict) das geometrias do GeoDataFrame, um objeto `nome_objeto` com as feições na ordem de `gdf`.
+
+    As propriedades ficam vazias: são preenchidas por quem desenha o mapa (ver `com_propriedades`).
+    """
+    xmin, ymin, xmax, ymax = gdf.total_bounds
+    escala = np.array([max(xmax - xmin, 1e-9), max(ymax - ymin, 1e-9)]) / (quantizacao - 1)
+    origem = np.array([xmin, ymin])
+
+    feicoes = [[[_quantizar(anel, origem, escala) for anel in poligono] for poligono in _aneis(g)]
+               for g in gdf.geometry]
+
+    # Quais anéis usam cada aresta (sem direção): divisas são as arestas usadas por mais de um anel
+    uso = {}
+    id_anel = 0
+    for poligonos in feicoes:
+        for poligono in poligonos:
+            for anel in poligono:
+                for a, b in zip(anel[:-1], anel[1:]):
+                    uso.setdefault((a, b) if a < b else (b, a), []).append(id_anel)
+                id_anel += 1
+
+    arcos, indice = [], {}
+
+    def registrar(pontos):
+        chave = tuple(pontos)
+        if chave in indice:
+            return indice[chave]
+        reverso = chave[::-1]
+        if reverso in indice:
+            return ~indice[reverso]
+        indice[chave] = len(arcos)
+        arcos.append(pontos)
+        return indice[chave]
+
+    def arcos_do_anel(anel):
+        if len(anel) < 4:
+            return []
+        arestas = [tuple(uso[(a, b) if a < b else (b, a)]) for a, b in zip(anel[:-1], anel[1:])]
+        n = len(arestas)
+        # Cortes onde muda o conjunto de anéis que compartilham a aresta
+        cortes = [i for i in range(n) if arestas[i] != arestas[i - 1]]
+        pontos = anel[:-1]
+        if not cortes:
+            # Anel inteiro com a mesma vizinhança: começa no menor ponto para casar com o anel vizinho
+            inicio = min(range(n), key=lambda i: pontos[i])
+            girado = pontos[inicio:] + pontos[:inicio]
+            return [registrar(girado + girado[:1])]
+        resultado = []
+        for k, inicio in enumerate(cortes):
+            fim = cortes[(k + 1) % len(cortes)]
+            trecho = pontos[inicio:fim + 1] if fim > inicio else pontos[inicio:] + pontos[:fim + 1]
+            resultado.append(registrar(trecho))
+        return resultado
+
+    geometrias = []
+    for i, poligonos in enumerate(feicoes):
+        partes = [[arcos_do_anel(anel) for anel in poligono] for poligono in poligonos]
+        partes = [[anel for anel in poligono if anel] for poligono in partes]
+        partes = [poligono for poligono in partes if poligono]
+        if not partes:
+            geometrias.append({"type": None, "id": i, "properties": {}})
+        elif len(partes) == 1:
+            geometrias.append({"type": "Polygon", "arcs": partes[0], "id": i, "properties": {}})
+        else:
+            geometrias.append({"type": "MultiPolygon", "arcs": partes, "id": i, "properties": {}})
+
+    # Simplificação por arco (extremidades preservadas) e codificação por diferença
+    tolerancia_grade = tolerancia / escala.min()
+    codificados = []
+    for arco in arcos:
+        pontos = np.asarray(arco)
+        if tolerancia_grade > 0 and len(pontos) > 2:
+            simplificado = np.asarray(LineString(pontos).simplify(tolerancia_grade, preserve_topology=False).coords)
+            # Anéis fechados em um único arco precisam de ao menos 4 pontos
+            fechado = tuple(arco[0]) == tuple(arco[-1])
+            if not fechado or len(simplificado) >= 4:
+                pontos = np.round(simplificado).astype(np.int64)
+        deltas = np.diff(pontos, axis=0, prepend=np.zeros((1, 2), dtype=np.int64))
+        codificados.append(deltas.tolist())
+
+    return {
+        "type": "Topology",
+        "transform": {"scale": escala.tolist(), "translate": origem.tolist()},
+        "objects": {nome_objeto: {"type": "GeometryCollection", "geometries": geometrias}},
+        "arcs": codificados,
+    }
+
+
+def com_propriedades(topo, nome_objeto, propriedades):
+    """Cópia rasa da topologia com `propriedades` (lista de dicts, na ordem das feições) em cada geometria.
+
+    Os arcos (a parte pesada) são compartilhados com a topologia em cache; só as geometrias são copiadas.
+    """
+    geometrias = [dict(g, properties=dict(p)) for g, p in zip(topo["objects"][nome_objeto]["geometries"], propriedades)]
+    return dict(topo, objects={nome_objeto: {"type": "GeometryCollection", "geometries": geometrias}})
+
+
+def para_geojson(topo, nome_objeto, ids):
+    """GeoJSON (dict) das feições da topologia, com `ids` (na ordem das feições) como id de cada uma.
+
+    Para quem não lê TopoJSON (ex.: Plotly): as divisas continuam idênticas entre vizinhos e as
+    coordenadas são arredondadas na resolução da grade de quantização.
+    """
+    escala = np.asarray(topo["transform"]["scale"])
+    origem = np.asarray(topo["transform"]["translate"])
+    casas = int(np.ceil(-np.log10(escala.min()))) + 1
+    arcos = [np.round(np.cumsum(arco, axis=0) * escala + origem, casas).tolist() for arco in topo["arcs"]]
+
+    def anel(indices):
+        pontos = []
+        for k, i in enumerate(indices):
+            arco = arcos[i] if i >= 0 else arcos[~i][::-1]
+            pontos.extend(arco if k == 0 else arco[1:])
+        return pontos
+
+    feicoes = []
+    for geometria, id_ in zip(topo["objects"][nome_objeto]["geometries"], ids):
+        if geometria["type"] == "Polygon":
+            geometria_geojson = {"type": "Polygon", "coordinates": [anel(a) for a in geometria["arcs"]]}
+        elif geometria["type"] == "MultiPolygon":
+            geometria_geojson = {"type": "MultiPolygon",
+                                 "coordinates": [[anel(a) for a in poligono] for poligono in geometria["arcs"]]}
+        else:
+            geometria_geojson = None
+        feicoes.append({"type": "Feature", "id": id_, "properties": {}, "geometry": geometria_geojson})
+    return {"type": "FeatureCollection", "features": feicoes}